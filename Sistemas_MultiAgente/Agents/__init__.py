@@ -2,8 +2,12 @@ from .greedy_farol import GreedyFarolAgent
 from .qlearning_base import QLearningAgentBase
 from .qlearning_farol import QLearningFarolAgent
 from .qlearning_labirinto import QLearningLabirintoAgent
+from .qlearning_offline import Transicoes, iteracao_q_ajustada
 from .genetic_agent import GeneticAgent
 from .genetic_farol_agent import GeneticFarolAgent
+from .policy_agent import PolicyAgent, PoliticaCompilada
+from .politica_partilhada import PoliticaPartilhada, PublicadorPolitica
+from .qlearning_partilhado import QLearningPartilhadoAgent, TabelaQPartilhada
 
 __all__ = [
     "GreedyFarolAgent",
@@ -11,5 +15,13 @@ __all__ = [
     "QLearningFarolAgent",
     "QLearningLabirintoAgent",
     "GeneticAgent",
-    "GeneticFarolAgent"
+    "GeneticFarolAgent",
+    "PolicyAgent",
+    "PoliticaCompilada",
+    "PoliticaPartilhada",
+    "PublicadorPolitica",
+    "QLearningPartilhadoAgent",
+    "TabelaQPartilhada",
+    "Transicoes",
+    "iteracao_q_ajustada",
 ]
\ No newline at end of file
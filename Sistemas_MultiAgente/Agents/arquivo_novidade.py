@@ -0,0 +1,139 @@
+"""
+Novelty Search: arquivo de comportamentos com pesquisa k-NN indexada.
+
+A novidade de um indivíduo é a distância média aos seus k vizinhos mais
+próximos no espaço de comportamentos (arquivo + população atual). O arquivo
+usa uma árvore k-d (`Core.indice_espacial`, reconstruída de forma
+amortizada) mais um pequeno buffer de inserções recentes, mantendo as
+consultas sublineares mesmo com dezenas de milhares de entradas.
+"""
+from __future__ import annotations
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from Core.indice_espacial import ArvoreKD
+
+
+# CARACTERIZAÇÃO DE COMPORTAMENTO
+
+def bc_posicao_final(x: int, y: int) -> np.ndarray:
+    """Comportamento = posição final do agente (2 dimensões)."""
+    return np.array([x, y], dtype=np.float64)
+
+
+def bc_histograma_visitas(caminho: Iterable[Tuple[int, int]], largura: int, altura: int) -> np.ndarray:
+    """
+    Comportamento = histograma normalizado das células visitadas
+    (largura x altura dimensões, soma 1).
+    """
+    hist = np.zeros((altura, largura), dtype=np.float64)
+    xs, ys = zip(*caminho)
+    np.add.at(hist, (np.asarray(ys), np.asarray(xs)), 1.0)
+    return (hist / hist.sum()).ravel()
+
+
+def _k_menores(distancias: np.ndarray, k: int) -> np.ndarray:
+    """k menores valores por linha (ordem não garantida)."""
+    if distancias.shape[1] <= k:
+        return distancias
+    return np.partition(distancias, k - 1, axis=1)[:, :k]
+
+
+# ARQUIVO DE NOVIDADE
+
+class ArquivoNovidade:
+    """
+    Arquivo de comportamentos para Novelty Search.
+
+    Args:
+        k (int): Número de vizinhos usados no cálculo da novidade.
+        limiar (float): Novidade mínima para um comportamento entrar no arquivo.
+        adicoes_alvo (int): Se numa geração entrarem mais do que isto, o limiar sobe;
+                            se não entrar nenhum, desce (limiar adaptativo).
+        tamanho_buffer (int): Inserções mantidas fora da árvore antes de a reconstruir.
+    """
+
+    def __init__(
+        self,
+        k: int = 15,
+        limiar: float = 1.0,
+        adicoes_alvo: int = 6,
+        tamanho_folha: int = 16,
+        tamanho_buffer: int = 256,
+    ) -> None:
+        self.k = k
+        self.limiar = limiar
+        self.adicoes_alvo = adicoes_alvo
+        self.tamanho_buffer = tamanho_buffer
+
+        self._tamanho_folha = tamanho_folha
+        self._arvore: Optional[ArvoreKD] = None
+        self._buffer: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        n_arvore = len(self._arvore) if self._arvore is not None else 0
+        return n_arvore + len(self._buffer)
+
+    def comportamentos(self) -> np.ndarray:
+        """Todos os comportamentos arquivados (n x d)."""
+        partes = []
+        if self._arvore is not None:
+            partes.append(self._arvore.pontos)
+        if self._buffer:
+            partes.append(np.vstack(self._buffer))
+        return np.vstack(partes) if partes else np.empty((0, 0))
+
+    def adicionar(self, comportamentos: np.ndarray) -> None:
+        """Acrescenta comportamentos ao arquivo (reindexação amortizada)."""
+        self._buffer.extend(np.atleast_2d(comportamentos))
+
+        # Reconstrói a árvore quando o buffer excede max(tamanho_buffer, sqrt(n)):
+        # o buffer (força bruta) nunca passa de O(sqrt(n)), logo as consultas
+        # mantêm-se sublineares e a reconstrução O(n log n) é rara
+        limite = max(self.tamanho_buffer, int(np.sqrt(len(self))))
+        if len(self._buffer) > limite:
+            self._arvore = ArvoreKD(self.comportamentos(), self._tamanho_folha)
+            self._buffer = []
+
+    def novidade(self, populacao: np.ndarray) -> np.ndarray:
+        """
+        Novidade de cada indivíduo: distância média aos k vizinhos mais próximos
+        no arquivo e na própria população (excluindo o próprio indivíduo).
+        """
+        populacao = np.atleast_2d(np.asarray(populacao, dtype=np.float64))
+        n = len(populacao)
+
+        # População contra população (força bruta vetorizada, P x P)
+        d_pop = np.sqrt(((populacao[:, None, :] - populacao[None, :, :]) ** 2).sum(axis=2))
+        d_pop[np.arange(n), np.arange(n)] = np.inf
+        candidatos = [_k_menores(d_pop, self.k)]
+
+        # População contra arquivo indexado
+        if self._arvore is not None:
+            candidatos.append(self._arvore.k_vizinhos(populacao, self.k))
+        if self._buffer:
+            buf = np.vstack(self._buffer)
+            d_buf = np.sqrt(((populacao[:, None, :] - buf[None, :, :]) ** 2).sum(axis=2))
+            candidatos.append(_k_menores(d_buf, self.k))
+
+        vizinhos = _k_menores(np.hstack(candidatos), self.k)
+        validos = np.isfinite(vizinhos)
+        contagem = validos.sum(axis=1)
+        soma = np.where(validos, vizinhos, 0.0).sum(axis=1)
+        return np.divide(soma, contagem, out=np.zeros(n), where=contagem > 0)
+
+    def atualizar(self, populacao: np.ndarray, novidades: np.ndarray) -> int:
+        """
+        Arquiva os indivíduos com novidade acima do limiar e ajusta o limiar.
+        Devolve o número de comportamentos adicionados.
+        """
+        selecionados = np.asarray(populacao)[novidades > self.limiar]
+        if len(selecionados):
+            self.adicionar(selecionados)
+
+        if len(selecionados) > self.adicoes_alvo:
+            self.limiar *= 1.2
+        elif len(selecionados) == 0:
+            self.limiar *= 0.95
+        return len(selecionados)
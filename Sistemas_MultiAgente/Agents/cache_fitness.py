@@ -0,0 +1,69 @@
+from __future__ import annotations
+import hashlib
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Sequence
+
+import numpy as np
+
+
+def impressao_digital(*partes: Any) -> str:
+    """
+    Fingerprint do ambiente/configuração (mapa, início, saída, MAX_PASSOS...).
+    Qualquer alteração nas partes produz uma chave de cache diferente.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for parte in partes:
+        h.update(repr(parte).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def hash_genoma(genoma: Sequence[float]) -> bytes:
+    """Hash exato dos pesos do genoma (float64 bit a bit)."""
+    return hashlib.blake2b(np.asarray(genoma, dtype=np.float64).tobytes(), digest_size=16).digest()
+
+
+class CacheFitness:
+    """
+    Cache LRU do resultado de rollouts determinísticos.
+
+    A chave é (hash do genoma, fingerprint do ambiente): elites copiados sem
+    alterações e filhos que não sofreram mutação saltam a simulação. O valor
+    guardado é o resultado bruto do rollout; termos dependentes da geração
+    (ex: novidade) continuam a ser recalculados por quem usa a cache.
+    """
+
+    def __init__(self, fingerprint: str, capacidade: int = 10000) -> None:
+        self.fingerprint = fingerprint
+        self.capacidade = capacidade
+        self._dados: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+    def _chave(self, genoma: Sequence[float]) -> Hashable:
+        return (hash_genoma(genoma), self.fingerprint)
+
+    def obter(self, genoma: Sequence[float]) -> Optional[Any]:
+        """Devolve o resultado guardado para o genoma, ou None."""
+        chave = self._chave(genoma)
+        resultado = self._dados.get(chave)
+        if resultado is None:
+            self.falhas += 1
+            return None
+        self._dados.move_to_end(chave)
+        self.acertos += 1
+        return resultado
+
+    def guardar(self, genoma: Sequence[float], resultado: Any) -> None:
+        chave = self._chave(genoma)
+        self._dados[chave] = resultado
+        self._dados.move_to_end(chave)
+        if len(self._dados) > self.capacidade:
+            self._dados.popitem(last=False)  # remove o menos usado recentemente
+
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
@@ -1,8 +1,16 @@
 from __future__ import annotations
 import random
 import math
-from typing import List, Optional
+from typing import List, Optional, Sequence
+
+import numpy as np
+
 from Core import Agent, Accao
+from .operadores_geneticos import mutacao_gaussiana
+
+# Ações pela ordem das saídas da rede
+_OPCOES = tuple(Accao.mover(d) for d in (Accao.CIMA, Accao.BAIXO, Accao.ESQUERDA, Accao.DIREITA))
+_SEM_SENSORES = (0, 0, 0, 0)
 
 class GeneticAgent(Agent):
     """
@@ -13,6 +21,9 @@ class GeneticAgent(Agent):
     com obstáculos complexos.
     """
 
+    # Clamping dos pesos mutados (estabilidade numérica)
+    LIMITE_GENE = 10.0
+
     def __init__(self, agent_id: int, genoma: Optional[List[float]] = None):
         """
         Inicializa o agente genético.
@@ -41,7 +52,11 @@ class GeneticAgent(Agent):
         else:
             self.genoma = genoma
 
-    def age(self, sensores_parede: Optional[List[int]] = None) -> Accao:
+        # Buffers reutilizados entre passos: entradas (o último é o Bias) e camada oculta
+        self._entradas = [0.0] * (self.n_inputs - 1) + [1.0]
+        self._ocultos = [0.0] * self.n_hidden
+
+    def age(self, sensores_parede: Optional[Sequence[int]] = None) -> Accao:
         """
         Executa o 'Forward Pass' da rede neuronal para decidir a próxima ação.
 
@@ -52,78 +67,65 @@ class GeneticAgent(Agent):
             Accao: A ação escolhida pela rede (maior ativação na saída).
         """
         if sensores_parede is None:
-            sensores_parede = [0, 0, 0, 0]
+            sensores_parede = _SEM_SENSORES
 
         # Decomposição da observação (x_agente, y_agente, x_alvo, y_alvo)
         obs = self._ultima_observacao
         ax, ay, sx, sy = obs
         
-        # 1. Pré-processamento e Normalização dos Inputs
+        # 1. Vetor de entrada (escrito no buffer; o Bias já está na última posição)
         # Assumindo grelha de dimensão aprox. 15x15 para normalização
-        norm_x = ax / 15.0
-        norm_y = ay / 15.0
-        
+        entradas = self._entradas
+        entradas[0] = ax / 15.0
+        entradas[1] = ay / 15.0
+
         # Vetor de direção relativa ao objetivo
-        dx = 1 if sx > ax else (-1 if sx < ax else 0)
-        dy = 1 if sy > ay else (-1 if sy < ay else 0)
-        
-        # Montagem do vetor de entrada (+1.0 para o Bias)
-        inputs = [norm_x, norm_y, dx, dy] + sensores_parede + [1.0]
+        entradas[2] = 1 if sx > ax else (-1 if sx < ax else 0)
+        entradas[3] = 1 if sy > ay else (-1 if sy < ay else 0)
+
+        # Sensores de parede
+        entradas[4], entradas[5], entradas[6], entradas[7] = sensores_parede
         
         # 2. Processamento da Camada Oculta (Input -> Hidden)
-        hidden_vals = [0.0] * self.n_hidden
+        genoma = self.genoma
+        ocultos = self._ocultos
         gene_idx = 0
         
         for h in range(self.n_hidden):
             soma = 0.0
-            for inp in inputs:
-                soma += inp * self.genoma[gene_idx]
+            for inp in entradas:
+                soma += inp * genoma[gene_idx]
                 gene_idx += 1
             
             # Função de Ativação: Tangente Hiperbólica (Tanh)
-            hidden_vals[h] = math.tanh(soma)
+            ocultos[h] = math.tanh(soma)
             
-        # 3. Processamento da Camada de Saída (Hidden -> Output)
-        outputs = [0.0] * self.n_outputs
+        # 3. Camada de Saída (Hidden -> Output, linear) e 4. Seleção da Ação (Argmax)
+        maior_valor = -float('inf') # Garante que qualquer valor real será maior
+        acao_idx = 0
         
         for o in range(self.n_outputs):
             soma = 0.0
-            for h in range(self.n_hidden):
-                soma += hidden_vals[h] * self.genoma[gene_idx]
+            for valor in ocultos:
+                soma += valor * genoma[gene_idx]
                 gene_idx += 1
-            
-            outputs[o] = soma # Saída linear (raw scores)
 
-        # 4. Seleção da Ação (Argmax)
-        maior_valor = -float('inf') # Garante que qualquer valor real será maior
-        acao_idx = 0
-        
-        for i in range(self.n_outputs):
-            if outputs[i] > maior_valor:
-                maior_valor = outputs[i]
-                acao_idx = i
+            if soma > maior_valor:
+                maior_valor = soma
+                acao_idx = o
                 
         # Mapeamento do índice para a Ação
-        opcoes = [Accao.CIMA, Accao.BAIXO, Accao.ESQUERDA, Accao.DIREITA]
-        return Accao(tipo="mover", direcao=opcoes[acao_idx])
+        return _OPCOES[acao_idx]
 
-    def mutar(self, taxa: float = 0.1, forca: float = 0.5) -> None:
+    def mutar(self, taxa: float = 0.1, forca: float = 0.5, rng: Optional[np.random.Generator] = None) -> None:
         """
         Aplica mutação gaussiana aos pesos da rede neuronal.
 
         Args:
             taxa (float): Probabilidade de um gene (peso) sofrer mutação.
             forca (float): Desvio padrão da mutação gaussiana.
+            rng (np.random.Generator): Gerador do ciclo evolutivo (ver `operadores_geneticos.gerador`).
         """
-        novo_genoma = []
-        
-        for gene in self.genoma:
-            if random.random() < taxa:
-                # Aplica ruído gaussiano
-                gene += random.gauss(0, forca)
-                # Clamping: Limita os pesos ao intervalo [-10, 10] para estabilidade
-                gene = max(-10.0, min(10.0, gene))
-            
-            novo_genoma.append(gene)
-            
-        self.genoma = novo_genoma
\ No newline at end of file
+        # Mutação vetorizada (ver operadores_geneticos); pesos limitados a [-10, 10]
+        genes = np.asarray(self.genoma, dtype=np.float64)[None, :]
+        self.genoma = mutacao_gaussiana(genes, taxa, forca, self.LIMITE_GENE, rng)[0].tolist()
\ No newline at end of file
@@ -1,7 +1,14 @@
 from __future__ import annotations
 import random
 from typing import List, Optional, Dict, Any
-from Core import Agent, Accao
+
+import numpy as np
+
+from Core import Agent, Accao, ObservacaoFarol
+from .operadores_geneticos import mutacao_gaussiana
+
+# Ações pela ordem das saídas da rede
+_OPCOES = tuple(Accao.mover(d) for d in (Accao.CIMA, Accao.BAIXO, Accao.ESQUERDA, Accao.DIREITA))
 
 class GeneticFarolAgent(Agent):
     """
@@ -9,6 +16,9 @@ class GeneticFarolAgent(Agent):
     Otimizado para o ambiente Farol, mapeando inputs espaciais diretamente em ações.
     """
 
+    # Clamping dos pesos mutados (estabilidade numérica)
+    LIMITE_GENE = 5.0
+
     def __init__(self, agent_id: int, genoma: Optional[List[float]] = None):
         """
         Inicializa o agente.
@@ -31,77 +41,69 @@ class GeneticFarolAgent(Agent):
         else:
             self.genoma = genoma
 
-    def age(self, env_info: Optional[Dict[str, Any]] = None) -> Accao:
+        # Vetor de entrada reutilizado entre passos (o último é o Bias)
+        self._entradas = [0.0] * (self.n_inputs - 1) + [1.0]
+
+    def age(self, env_info: Optional[ObservacaoFarol | Dict[str, Any]] = None) -> Accao:
         """
         Calcula a ação baseada no estado do ambiente (Forward Pass).
 
         Args:
-            env_info (Dict[str, Any]): Dicionário com coordenadas absolutas (x, y, farol_x, farol_y).
+            env_info (ObservacaoFarol): Observação do Farol com coordenadas absolutas
+                (x, y, farol_x, farol_y) e tamanho N. Um dicionário com as
+                mesmas chaves também é aceite (N = 20 se não indicado).
 
         Returns:
             Accao: Ação com maior ativação na saída da rede.
         """
         # Fallback de segurança para falta de informação
         if env_info is None:
-            opcoes = [Accao.CIMA, Accao.BAIXO, Accao.ESQUERDA, Accao.DIREITA]
-            return Accao(tipo="mover", direcao=random.choice(opcoes))
+            return random.choice(_OPCOES)
 
-        ax = env_info["x"]
-        ay = env_info["y"]
-        fx = env_info["farol_x"]
-        fy = env_info["farol_y"]
+        if isinstance(env_info, ObservacaoFarol):
+            ax, ay = env_info.x, env_info.y
+            fx, fy = env_info.farol_x, env_info.farol_y
+            n = env_info.N
+        else:
+            # Adaptador: observação em dicionário
+            ax, ay = env_info["x"], env_info["y"]
+            fx, fy = env_info["farol_x"], env_info["farol_y"]
+            n = env_info.get("N", 20.0)
 
-        # 1. Normalização dos Inputs (Assumindo grelha 20x20)
-        norm_x = ax / 20.0
-        norm_y = ay / 20.0
-        
-        # Vetores de Direção
-        dx = 0
-        if fx > ax: dx = 1
-        elif fx < ax: dx = -1
-        
-        dy = 0
-        if fy > ay: dy = 1
-        elif fy < ay: dy = -1
-        
-        # Vetor de Entrada (+ Bias)
-        inputs = [norm_x, norm_y, dx, dy, 1.0]
-        
-        # 2. Processamento Linear (Sem camada oculta)
-        outputs = [0.0] * self.n_outputs
-        peso_idx = 0
-        
-        for i in range(self.n_outputs):
-            valor = 0.0
-            for val_in in inputs:
-                valor += val_in * self.genoma[peso_idx]
-                peso_idx += 1
-            outputs[i] = valor
+        # 1. Vetor de Entrada: posição normalizada pelo tamanho da grelha e
+        #    vetores de direção (o Bias já está na última posição)
+        entradas = self._entradas
+        entradas[0] = ax / n
+        entradas[1] = ay / n
+        entradas[2] = 1 if fx > ax else (-1 if fx < ax else 0)
+        entradas[3] = 1 if fy > ay else (-1 if fy < ay else 0)
 
-        # 3. Seleção da Ação (Argmax)
+        # 2. Processamento Linear (Sem camada oculta) e 3. Seleção da Ação (Argmax)
+        genoma = self.genoma
         maior_valor = -float('inf')
         acao_idx = 0
+        peso_idx = 0
+
         for i in range(self.n_outputs):
-            if outputs[i] > maior_valor:
-                maior_valor = outputs[i]
+            valor = 0.0
+            for val_in in entradas:
+                valor += val_in * genoma[peso_idx]
+                peso_idx += 1
+            if valor > maior_valor:
+                maior_valor = valor
                 acao_idx = i
-                
-        opcoes = [Accao.CIMA, Accao.BAIXO, Accao.ESQUERDA, Accao.DIREITA]
-        return Accao(tipo="mover", direcao=opcoes[acao_idx])
 
-    def mutar(self, taxa: float = 0.1, forca: float = 0.5) -> None:
+        return _OPCOES[acao_idx]
+
+    def mutar(self, taxa: float = 0.1, forca: float = 0.5, rng: Optional[np.random.Generator] = None) -> None:
         """
         Aplica mutação gaussiana ao genoma.
 
         Args:
             taxa (float): Probabilidade de mutação por gene.
             forca (float): Desvio padrão da mutação.
+            rng (np.random.Generator): Gerador do ciclo evolutivo (ver `operadores_geneticos.gerador`).
         """
-        novo_genoma = []
-        for gene in self.genoma:
-            if random.random() < taxa:
-                gene += random.gauss(0, forca)
-                # Clamping para manter estabilidade numérica [-5.0, 5.0]
-                gene = max(-5.0, min(5.0, gene))
-            novo_genoma.append(gene)
-        self.genoma = novo_genoma
\ No newline at end of file
+        # Mutação vetorizada (ver operadores_geneticos); pesos limitados a [-5, 5]
+        genes = np.asarray(self.genoma, dtype=np.float64)[None, :]
+        self.genoma = mutacao_gaussiana(genes, taxa, forca, self.LIMITE_GENE, rng)[0].tolist()
\ No newline at end of file
@@ -1,5 +1,4 @@
-from typing import Dict, Any
-from Core import Agent, Accao
+from Core import Agent, Accao, ObservacaoFarol
 
 class GreedyFarolAgent(Agent):
     """
@@ -9,14 +8,16 @@ class GreedyFarolAgent(Agent):
     o movimento no eixo com maior distância absoluta ao objetivo em cada passo.
     Utilizado como baseline para comparação de desempenho.
     """
+
+    tipo_observacao = ObservacaoFarol
     
     def age(self) -> Accao:
         """
         Decide a ação que maximiza a aproximação imediata ao alvo.
         """
-        obs: Dict[str, Any] = self._ultima_observacao
-        dx = obs["dx"]
-        dy = obs["dy"]
+        obs: ObservacaoFarol = self._ultima_observacao
+        dx = obs.dx
+        dy = obs.dy
 
         # Verifica se o agente já se encontra nas coordenadas do objetivo
         if dx == 0 and dy == 0:
@@ -26,15 +27,15 @@ class GreedyFarolAgent(Agent):
         if abs(dx) >= abs(dy):
             # Movimento no Eixo X
             if dx > 0:
-                return Accao(tipo="mover", direcao=Accao.DIREITA)
+                return Accao.mover(Accao.DIREITA)
             elif dx < 0:
-                return Accao(tipo="mover", direcao=Accao.ESQUERDA)
+                return Accao.mover(Accao.ESQUERDA)
         
         # Movimento no Eixo Y (Executado se a distância vertical for dominante)
         if dy > 0:
-            return Accao(tipo="mover", direcao=Accao.BAIXO)
+            return Accao.mover(Accao.BAIXO)
         elif dy < 0:
-            return Accao(tipo="mover", direcao=Accao.CIMA)
+            return Accao.mover(Accao.CIMA)
 
         # Fallback de segurança (não deve ser atingido em condições normais)
-        return Accao(tipo="mover", direcao=Accao.CIMA)
\ No newline at end of file
+        return Accao.mover(Accao.CIMA)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Operadores genéticos vetorizados.
+
+Todas as funções trabalham sobre uma matriz de genomas com forma
+(população x genes), aplicando o operador a toda a população com
+meia dúzia de operações NumPy em vez de ciclos por gene.
+
+Todas aceitam um `rng` (np.random.Generator). Um ciclo evolutivo deve criar
+um único gerador e passá-lo a todas as chamadas; sem `rng`, é criado um
+gerador semeado a partir do `random` global, pelo que `random.seed(...)`
+continua a tornar as execuções reprodutíveis.
+"""
+from __future__ import annotations
+import random
+from typing import Optional
+
+import numpy as np
+
+
+def gerador(rng: Optional[np.random.Generator] = None) -> np.random.Generator:
+    """O próprio `rng` ou, sem ele, um Generator semeado a partir do `random` global."""
+    return rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+
+
+# MUTAÇÃO
+
+def mutacao_gaussiana(
+    genomas: np.ndarray,
+    taxa: float = 0.1,
+    forca: float = 0.5,
+    limite: float = 10.0,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Mutação gaussiana mascarada com clamping.
+
+    Args:
+        genomas (np.ndarray): Matriz (população x genes).
+        taxa (float): Probabilidade de cada gene sofrer mutação.
+        forca (float): Desvio padrão do ruído gaussiano.
+        limite (float): Os genes mutados ficam em [-limite, limite].
+
+    Returns:
+        np.ndarray: Nova matriz (a original não é alterada).
+    """
+    rng = gerador(rng)
+    mascara = rng.random(genomas.shape) < taxa
+    ruido = rng.normal(0.0, forca, size=genomas.shape)
+    mutados = np.clip(genomas + ruido, -limite, limite)
+    # Só os genes sorteados são alterados (os restantes não sofrem clamping)
+    return np.where(mascara, mutados, genomas)
+
+
+# CRUZAMENTO
+
+def cruzamento_uniforme(
+    pais_a: np.ndarray,
+    pais_b: np.ndarray,
+    prob: float = 0.5,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Cada gene do filho vem de `pais_a` com probabilidade `prob`, senão de `pais_b`."""
+    rng = gerador(rng)
+    return np.where(rng.random(pais_a.shape) < prob, pais_a, pais_b)
+
+
+def cruzamento_um_ponto(
+    pais_a: np.ndarray,
+    pais_b: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Genes [0, ponto) vêm de `pais_a` e [ponto, n) de `pais_b` (um ponto por par)."""
+    rng = gerador(rng)
+    n_pares, n_genes = pais_a.shape
+    pontos = rng.integers(1, n_genes, size=(n_pares, 1))
+    return np.where(np.arange(n_genes) < pontos, pais_a, pais_b)
+
+
+def cruzamento_blend(
+    pais_a: np.ndarray,
+    pais_b: np.ndarray,
+    alfa: float = 0.5,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Cruzamento BLX-alfa: cada gene é amostrado uniformemente no intervalo
+    definido pelos pais, alargado em `alfa` vezes a sua distância.
+    """
+    rng = gerador(rng)
+    baixo = np.minimum(pais_a, pais_b)
+    alto = np.maximum(pais_a, pais_b)
+    margem = alfa * (alto - baixo)
+    return rng.uniform(baixo - margem, alto + margem)
+
+
+CRUZAMENTOS = {
+    "uniforme": cruzamento_uniforme,
+    "um_ponto": cruzamento_um_ponto,
+    "blend": cruzamento_blend,
+}
+
+
+# SELEÇÃO
+
+def selecao_torneio(
+    fitness: np.ndarray,
+    n_selecionados: int,
+    tamanho: int = 3,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Seleção por torneio vetorizada: devolve os índices dos vencedores de
+    `n_selecionados` torneios independentes com `tamanho` participantes
+    (sorteados com reposição).
+    """
+    rng = gerador(rng)
+    participantes = rng.integers(0, len(fitness), size=(n_selecionados, tamanho))
+    vencedor = np.argmax(fitness[participantes], axis=1)
+    return participantes[np.arange(n_selecionados), vencedor]
+
+
+# REPRODUÇÃO (GERAÇÃO COMPLETA)
+
+def reproduzir_geracao(
+    genomas: np.ndarray,
+    fitness: np.ndarray,
+    elitismo: int,
+    tamanho_torneio: int = 3,
+    taxa_mutacao: float = 0.1,
+    forca_mutacao: float = 0.5,
+    limite: float = 10.0,
+    tipo_cruzamento: Optional[str] = "uniforme",
+    taxa_cruzamento: float = 0.5,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Produz a próxima geração com o mesmo tamanho da atual.
+
+    1. Elitismo: os `elitismo` melhores passam sem alterações (primeiras linhas).
+    2. Seleção: dois pais por filho, escolhidos por torneio.
+    3. Cruzamento: com probabilidade `taxa_cruzamento` o filho resulta do
+       cruzamento dos pais; caso contrário é um clone do primeiro pai.
+    4. Mutação gaussiana de todos os filhos (não dos elites).
+    """
+    rng = gerador(rng)
+    n = len(genomas)
+    n_filhos = n - elitismo
+
+    elites = genomas[np.argsort(-fitness, kind="stable")[:elitismo]]
+
+    pais_a = genomas[selecao_torneio(fitness, n_filhos, tamanho_torneio, rng)]
+    filhos = pais_a
+    if tipo_cruzamento is not None and taxa_cruzamento > 0:
+        pais_b = genomas[selecao_torneio(fitness, n_filhos, tamanho_torneio, rng)]
+        cruzados = CRUZAMENTOS[tipo_cruzamento](pais_a, pais_b, rng=rng)
+        cruzados = np.clip(cruzados, -limite, limite)  # o blend pode sair do intervalo
+        filhos = np.where(rng.random((n_filhos, 1)) < taxa_cruzamento, cruzados, pais_a)
+
+    filhos = mutacao_gaussiana(filhos, taxa_mutacao, forca_mutacao, limite, rng)
+    return np.concatenate([elites, filhos])
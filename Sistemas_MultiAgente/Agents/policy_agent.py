@@ -0,0 +1,163 @@
+from __future__ import annotations
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Core import Agent, Accao
+
+
+class PoliticaCompilada:
+    """
+    Política greedy densa: um código de ação (uint8, índice em Accao.DIRECOES)
+    por estado, indexado pelo estado codificado (ex: (x, y, sx, sy)).
+
+    Cada componente i do estado é deslocado por `offsets[i]` e a tabela tem
+    forma `forma`; estados fora destes limites usam a `acao_omissao`.
+    """
+
+    def __init__(
+        self,
+        acoes: np.ndarray,
+        offsets: Sequence[int],
+        acao_omissao: int,
+        campos: Optional[Sequence[str]] = None,
+        gamma: float = 0.99,
+    ) -> None:
+        self.acoes = np.ascontiguousarray(acoes, dtype=np.uint8)
+        self.forma = tuple(int(d) for d in self.acoes.shape)
+        self.offsets = tuple(int(o) for o in offsets)
+        self.acao_omissao = int(acao_omissao)
+        self.campos = tuple(campos) if campos else None  # chaves de observações dict
+        self.gamma = gamma
+
+        # Passos (strides) para codificar o estado num índice plano
+        passos = []
+        acumulado = 1
+        for d in reversed(self.forma):
+            passos.append(acumulado)
+            acumulado *= d
+        self.passos = tuple(reversed(passos))
+
+        # Lista Python: a indexação é mais rápida do que num array NumPy
+        self._tabela: List[int] = self.acoes.ravel().tolist()
+
+    def codigo(self, estado: Sequence[int]) -> int:
+        """Código da ação greedy para o estado (lookup O(1))."""
+        idx = 0
+        for v, off, dim, passo in zip(estado, self.offsets, self.forma, self.passos):
+            v -= off
+            if not 0 <= v < dim:
+                return self.acao_omissao
+            idx += v * passo
+        return self._tabela[idx]
+
+    # Persistência
+
+    def guardar(self, caminho: str) -> None:
+        """Guarda a política num ficheiro .npz comprimido (poucos KB)."""
+        with open(caminho, "wb") as f:
+            np.savez_compressed(
+                f,
+                acoes=self.acoes,
+                offsets=np.array(self.offsets, dtype=np.int64),
+                acao_omissao=np.array(self.acao_omissao),
+                campos=np.array(self.campos or (), dtype=str),
+                gamma=np.array(self.gamma),
+            )
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "PoliticaCompilada":
+        with np.load(caminho) as d:
+            return cls(
+                acoes=d["acoes"],
+                offsets=d["offsets"].tolist(),
+                acao_omissao=int(d["acao_omissao"]),
+                campos=[str(c) for c in d["campos"]] or None,
+                gamma=float(d["gamma"]),
+            )
+
+
+def compilar_politica(
+    q: Dict[Tuple[Hashable, str], float],
+    acoes_possiveis: Sequence[str],
+    limites: Optional[Sequence[Tuple[int, int]]] = None,
+    campos: Optional[Sequence[str]] = None,
+    gamma: float = 0.99,
+) -> PoliticaCompilada:
+    """
+    Compila uma Q-table {(estado, acao): valor} numa política densa.
+
+    O desempate replica `QLearningAgentBase._melhor_acao` (ordenação
+    decrescente de (Q, direcao)), pelo que a política compilada escolhe
+    sempre a mesma ação que o agente original, incluindo em estados nunca
+    visitados (todos os Q a 0).
+
+    Args:
+        limites: (mínimo, máximo) de cada componente do estado. Se None,
+                 são inferidos a partir dos estados presentes na Q-table.
+    """
+    if limites is None:
+        if not q:
+            raise ValueError("Q-table vazia: indique os limites do espaço de estados.")
+        matriz = np.array([s for (s, _a) in q], dtype=np.int64)
+        limites = list(zip(matriz.min(axis=0).tolist(), matriz.max(axis=0).tolist()))
+
+    offsets = [lo for lo, _hi in limites]
+    forma = [hi - lo + 1 for lo, hi in limites]
+
+    # Q densa (n_estados x n_acoes), estados não visitados ficam a 0.0
+    valores = np.zeros((int(np.prod(forma)), len(acoes_possiveis)))
+    if q:
+        coluna = {a: j for j, a in enumerate(acoes_possiveis)}
+        chaves = list(q.keys())
+        coords = np.array([s for (s, _a) in chaves], dtype=np.int64) - np.array(offsets)
+        linhas = np.ravel_multi_index(tuple(coords.T), forma)
+        colunas = np.array([coluna[a] for (_s, a) in chaves])
+        valores[linhas, colunas] = np.fromiter(q.values(), dtype=np.float64, count=len(q))
+
+    # Argmax com desempate pela direção (ordem decrescente de string)
+    prioridade = np.argsort(np.argsort(np.array(acoes_possiveis)))
+    empatados = valores == valores.max(axis=1, keepdims=True)
+    escolha = np.argmax(np.where(empatados, prioridade, -1), axis=1)
+    acao_omissao = int(np.argmax(prioridade))  # escolha com todos os Q a 0
+
+    # Converte o índice local para o código canónico (Accao.DIRECOES)
+    para_codigo = np.array([Accao.DIRECOES.index(a) for a in acoes_possiveis], dtype=np.uint8)
+    return PoliticaCompilada(
+        acoes=para_codigo[escolha].reshape(forma),
+        offsets=offsets,
+        acao_omissao=int(para_codigo[acao_omissao]),
+        campos=campos,
+        gamma=gamma,
+    )
+
+
+class PolicyAgent(Agent):
+    """
+    Agente de política fixa que apenas consulta uma `PoliticaCompilada`.
+    Substitui um agente Q-Learning treinado (epsilon=0.0) nas fases de teste
+    e na demo, à velocidade de um lookup num array.
+    """
+
+    def __init__(self, agent_id: int, politica: PoliticaCompilada):
+        super().__init__(agent_id)
+        self.politica = politica
+        self.gamma = politica.gamma  # usado pelo Simulator na recompensa descontada
+
+        # Ações pré-construídas (Accao é imutável, pode ser partilhada)
+        self._accoes = [Accao.mover(d) for d in Accao.DIRECOES]
+
+    @classmethod
+    def carregar(cls, agent_id: int, caminho: str) -> "PolicyAgent":
+        return cls(agent_id, PoliticaCompilada.carregar(caminho))
+
+    def processar_estado(self, obs: Any) -> Tuple[int, ...]:
+        """Converte a observação no tuplo de estado (dict -> valores de `campos`)."""
+        campos = self.politica.campos
+        if campos is not None:
+            return tuple(obs[c] for c in campos)
+        return obs
+
+    def age(self) -> Accao:
+        estado = self.processar_estado(self._ultima_observacao)
+        return self._accoes[self.politica.codigo(estado)]
@@ -0,0 +1,267 @@
+"""
+Partilha em tempo real da política greedy entre o processo de treino e
+outros processos (ex: a demo visual), através de um ficheiro mapeado em
+memória (`mmap`).
+
+Formato do ficheiro (little-endian): um cabeçalho fixo com um contador de
+versão, o índice do buffer ativo, um contador de sequência por buffer e os
+metadados da `PoliticaCompilada` (forma, offsets, ação por omissão, gamma,
+campos), seguido de dois buffers com a tabela de ações (uint8).
+
+Publicação (um único escritor): a nova tabela é escrita no buffer inativo,
+entre duas incrementações do seu contador de sequência (ímpar = a ser
+escrito); depois o buffer ativo é trocado e a versão incrementada. Quem lê
+copia o buffer ativo e só aceita a cópia se o contador desse buffer não
+mudou entretanto (seqlock), sem nunca bloquear o treino.
+
+Um novo treino com a mesma forma de política continua a numeração no
+ficheiro existente; com outra forma o ficheiro é substituído e os leitores
+reabrem-no.
+"""
+from __future__ import annotations
+import mmap
+import os
+import struct
+import time
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .policy_agent import PoliticaCompilada
+
+_MAGIA = b"SMAPOL01"
+_MAX_DIMS = 8
+_TAM_CAMPOS = 64
+
+# Posições dos campos no cabeçalho
+_VERSAO = 8
+_ATIVO = 16
+_SEQUENCIA = 24          # dois uint64, um por buffer
+_NDIM = 40
+_OMISSAO = 48
+_GAMMA = 56
+_FORMA = 64
+_OFFSETS = _FORMA + 8 * _MAX_DIMS
+_CAMPOS = _OFFSETS + 8 * _MAX_DIMS
+_DADOS = _CAMPOS + _TAM_CAMPOS
+
+
+def _cabecalho(politica: PoliticaCompilada) -> bytes:
+    ndim = len(politica.forma)
+    if ndim > _MAX_DIMS:
+        raise ValueError(f"Política com {ndim} dimensões (máximo {_MAX_DIMS}).")
+    campos = ",".join(politica.campos or ()).encode("utf-8")
+    if len(campos) > _TAM_CAMPOS:
+        raise ValueError("Nomes dos campos demasiado longos para o cabeçalho.")
+    preenche = (0,) * (_MAX_DIMS - ndim)
+    return b"".join([
+        _MAGIA,
+        struct.pack("<QQQQ", 1, 0, 0, 0),  # versão 1 no buffer 0
+        struct.pack("<Qqd", ndim, politica.acao_omissao, politica.gamma),
+        struct.pack(f"<{_MAX_DIMS}q", *politica.forma, *preenche),
+        struct.pack(f"<{_MAX_DIMS}q", *politica.offsets, *preenche),
+        campos.ljust(_TAM_CAMPOS, b"\0"),
+    ])
+
+
+class PublicadorPolitica:
+    """
+    Escritor: publica a política greedy do agente em treino a cada
+    `intervalo` segundos (via `episodio`, chamado pelo Simulator no fim de
+    cada episódio) ou explicitamente com `publicar`.
+
+    Args:
+        caminho: Ficheiro partilhado (criado na primeira publicação).
+        limites: (mínimo, máximo) de cada componente do estado, passados a
+                 `compilar_politica` do agente.
+        intervalo: Segundos mínimos entre publicações automáticas.
+    """
+
+    def __init__(
+        self,
+        caminho: str = "politica_live.bin",
+        limites: Optional[Sequence[Tuple[int, int]]] = None,
+        intervalo: float = 2.0,
+    ) -> None:
+        self.caminho = caminho
+        self.limites = limites
+        self.intervalo = intervalo
+        self.versao = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._forma: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = None
+        self._tamanho = 0
+        self._proximo = time.monotonic()
+        self._agentes: Sequence[Any] = ()
+
+    def _abrir(self, politica: PoliticaCompilada) -> bool:
+        """
+        Cria o ficheiro ou, se já existir um compatível (mesmo cabeçalho
+        exceto contadores), reutiliza-o. Devolve True se o criou.
+        """
+        self._tamanho = len(politica.acoes.ravel())
+        self._forma = (politica.forma, politica.offsets)
+        cabecalho = _cabecalho(politica)
+        criado = False
+        try:
+            with open(self.caminho, "rb") as f:
+                existente = f.read(_DADOS)
+            compativel = (
+                existente[:8] == cabecalho[:8]
+                and existente[_NDIM:] == cabecalho[_NDIM:]
+                and os.path.getsize(self.caminho) == _DADOS + 2 * self._tamanho
+            )
+        except FileNotFoundError:
+            compativel = False
+
+        if not compativel:
+            # Criação atómica: um leitor nunca vê o ficheiro sem cabeçalho
+            dados = politica.acoes.tobytes()
+            temporario = self.caminho + ".tmp"
+            with open(temporario, "wb") as f:
+                f.write(cabecalho)
+                f.write(dados)
+                f.write(dados)
+            os.replace(temporario, self.caminho)
+            criado = True
+
+        self._ficheiro = open(self.caminho, "r+b")
+        self._mm = mmap.mmap(self._ficheiro.fileno(), 0)
+        self.versao = struct.unpack_from("<Q", self._mm, _VERSAO)[0]
+        return criado
+
+    def publicar(self, politica: PoliticaCompilada) -> int:
+        """Publica uma nova versão da política; devolve o número da versão."""
+        if self._mm is None and self._abrir(politica):
+            return self.versao
+        if (politica.forma, politica.offsets) != self._forma:
+            raise ValueError("A forma da política mudou desde a primeira publicação.")
+
+        mm = self._mm
+        alvo = 1 - struct.unpack_from("<Q", mm, _ATIVO)[0]
+        posicao_seq = _SEQUENCIA + 8 * alvo
+        seq = struct.unpack_from("<Q", mm, posicao_seq)[0]
+
+        struct.pack_into("<Q", mm, posicao_seq, seq + 1)  # ímpar: a ser escrito
+        inicio = _DADOS + alvo * self._tamanho
+        mm[inicio:inicio + self._tamanho] = politica.acoes.tobytes()
+        struct.pack_into("<Q", mm, posicao_seq, seq + 2)
+
+        # Troca atómica do buffer ativo e nova versão
+        struct.pack_into("<Q", mm, _ATIVO, alvo)
+        self.versao += 1
+        struct.pack_into("<Q", mm, _VERSAO, self.versao)
+        return self.versao
+
+    def publicar_agente(self, agente: Any) -> int:
+        """Compila a política greedy do agente (Q-Learning ou PolicyAgent) e publica-a."""
+        politica = getattr(agente, "politica", None)
+        if not isinstance(politica, PoliticaCompilada):
+            politica = agente.compilar_politica(self.limites)
+        return self.publicar(politica)
+
+    def episodio(self, agentes: Sequence[Any]) -> None:
+        """Hook do Simulator: publica o primeiro agente se passou o intervalo."""
+        self._agentes = agentes
+        if time.monotonic() >= self._proximo and agentes:
+            self.publicar_agente(agentes[0])
+            self._proximo = time.monotonic() + self.intervalo
+
+    def fechar(self) -> None:
+        """Publica a última versão (se houver agentes registados) e fecha o ficheiro."""
+        if self._agentes:
+            self.publicar_agente(self._agentes[0])
+        if self._mm is not None:
+            self._mm.close()
+            self._ficheiro.close()
+            self._mm = None
+
+    def __enter__(self) -> "PublicadorPolitica":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.fechar()
+
+
+class PoliticaPartilhada:
+    """
+    Leitor: segue a política publicada por um `PublicadorPolitica`. A
+    consulta de `versao` é uma leitura de 8 bytes, barata o suficiente para
+    ser feita a cada passo.
+    """
+
+    def __init__(self, caminho: str) -> None:
+        self.caminho = caminho
+        with open(caminho, "rb") as f:
+            self._inode = os.fstat(f.fileno()).st_ino
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != _MAGIA:
+            self._mm.close()
+            raise ValueError(f"{caminho} não é um ficheiro de política partilhada.")
+
+        mm = self._mm
+        ndim, self.acao_omissao, self.gamma = struct.unpack_from("<Qqd", mm, _NDIM)
+        self.forma = struct.unpack_from(f"<{ndim}q", mm, _FORMA)
+        self.offsets = struct.unpack_from(f"<{ndim}q", mm, _OFFSETS)
+        campos = bytes(mm[_CAMPOS:_CAMPOS + _TAM_CAMPOS]).rstrip(b"\0").decode("utf-8")
+        self.campos = campos.split(",") if campos else None
+        self._tamanho = int(np.prod(self.forma))
+        self.versao_lida = 0
+
+    @classmethod
+    def esperar(cls, caminho: str, timeout: Optional[float] = None, intervalo: float = 0.5) -> "PoliticaPartilhada":
+        """Espera até o ficheiro existir (ex: a demo arranca antes do treino)."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while not os.path.exists(caminho):
+            if limite is not None and time.monotonic() > limite:
+                raise TimeoutError(f"Política partilhada não publicada em {caminho}.")
+            time.sleep(intervalo)
+        return cls(caminho)
+
+    @property
+    def versao(self) -> int:
+        return struct.unpack_from("<Q", self._mm, _VERSAO)[0]
+
+    def ler(self, tentativas: int = 100) -> Tuple[int, PoliticaCompilada]:
+        """Cópia consistente da versão atual: (versão, política)."""
+        mm = self._mm
+        for _ in range(tentativas):
+            versao = struct.unpack_from("<Q", mm, _VERSAO)[0]
+            ativo = struct.unpack_from("<Q", mm, _ATIVO)[0]
+            posicao_seq = _SEQUENCIA + 8 * ativo
+            seq = struct.unpack_from("<Q", mm, posicao_seq)[0]
+            if seq % 2:
+                continue  # buffer a ser escrito: tenta de novo
+            inicio = _DADOS + ativo * self._tamanho
+            dados = bytes(mm[inicio:inicio + self._tamanho])
+            if struct.unpack_from("<Q", mm, posicao_seq)[0] != seq:
+                continue
+            politica = PoliticaCompilada(
+                acoes=np.frombuffer(dados, dtype=np.uint8).reshape(self.forma),
+                offsets=self.offsets,
+                acao_omissao=self.acao_omissao,
+                campos=self.campos,
+                gamma=self.gamma,
+            )
+            self.versao_lida = versao
+            return versao, politica
+        raise RuntimeError("Não foi possível obter uma cópia consistente da política.")
+
+    def _substituido(self) -> bool:
+        try:
+            return os.stat(self.caminho).st_ino != self._inode
+        except FileNotFoundError:
+            return False
+
+    def atualizar(self, agente: Any) -> bool:
+        """Troca a política de um `PolicyAgent` se houver uma versão nova."""
+        if self._substituido():
+            # Novo treino com outra forma de política: reabre o ficheiro
+            self._mm.close()
+            self.__init__(self.caminho)
+        elif self.versao == self.versao_lida:
+            return False
+        _versao, agente.politica = self.ler()
+        return True
+
+    def fechar(self) -> None:
+        self._mm.close()
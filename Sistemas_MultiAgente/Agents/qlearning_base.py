@@ -1,5 +1,5 @@
 import random
-from typing import Any, Dict, Tuple, Hashable, List
+from typing import Any, Dict, Tuple, Hashable, List, Optional, Sequence
 
 from Core import Agent, Accao
 
@@ -13,6 +13,10 @@ class QLearningAgentBase(Agent):
     Responsável pela decisão (Epsilon-Greedy) e pela aprendizagem (Equação de Bellman).
     """
 
+    # Chaves usadas para converter observações dict no tuplo de estado
+    # (None quando a observação já é o próprio tuplo)
+    campos_estado: Optional[Tuple[str, ...]] = None
+
     def __init__(self, agent_id: int, alpha=0.1, gamma=0.90, epsilon=0.2):
         super().__init__(agent_id)
 
@@ -28,6 +32,12 @@ class QLearningAgentBase(Agent):
         self._ultimo_estado = None
         self._ultima_acao = None
 
+        # Ações e chaves (estado, acao) construídas uma única vez: os ciclos de
+        # decisão e de atualização não alocam tuplos nem listas por passo.
+        self._acoes: Tuple[str, ...] = tuple(self.acoes_possiveis())
+        self._indice_acao: Dict[str, int] = {a: j for j, a in enumerate(self._acoes)}
+        self._pares: Dict[Hashable, Tuple[Tuple[EstadoQ, str], ...]] = {}
+
 
     # Métodos a implementar nas Subclasses
 
@@ -53,7 +63,7 @@ class QLearningAgentBase(Agent):
         # Epsilon-Greedy: Decide entre Exploração (aleatório) e Explotação (melhor Q-valor).
         if random.random() < self.epsilon:
             # Exploração: Escolhe uma ação aleatória.
-            direcao = random.choice(self.acoes_possiveis())
+            direcao = random.choice(self._acoes)
         else:
             # Explotação: Escolhe a ação com o maior valor esperado na Q-Table.
             direcao = self._melhor_acao(estado)
@@ -62,16 +72,27 @@ class QLearningAgentBase(Agent):
         self._ultimo_estado = estado
         self._ultima_acao = direcao
 
-        return Accao(tipo="mover", direcao=direcao)
+        return Accao.mover(direcao)
+
+    def _pares_estado(self, estado: Hashable) -> Tuple[Tuple[EstadoQ, str], ...]:
+        """Pares ((estado, acao), acao) de cada ação, criados na primeira visita ao estado."""
+        pares = self._pares.get(estado)
+        if pares is None:
+            pares = self._pares[estado] = tuple(((estado, a), a) for a in self._acoes)
+        return pares
 
     def _melhor_acao(self, estado: Hashable) -> str:
         """
         Função auxiliar para encontrar a ação Greedy (Q-valor máximo).
         """
-        # Cria tuplas (Q_valor, direcao) para todas as ações possíveis no estado atual.
-        qs = [(self.q.get((estado, a), 0.0), a) for a in self.acoes_possiveis()]
-        qs.sort(reverse=True) # Ordena do maior Q-valor para o menor
-        return qs[0][1] # Devolve a direção correspondente ao Q-valor máximo.
+        # Maior (Q_valor, direcao): em empate de Q ganha a maior direção.
+        q = self.q
+        melhor, melhor_q = None, 0.0
+        for chave, a in self._pares_estado(estado):
+            v = q.get(chave, 0.0)
+            if melhor is None or v > melhor_q or (v == melhor_q and a > melhor):
+                melhor, melhor_q = a, v
+        return melhor
 
     def avaliacaoEstadoAtual(self, recompensa: float):
         """
@@ -86,27 +107,46 @@ class QLearningAgentBase(Agent):
         a1 = self._ultima_acao        # Ação Tomada (a)
         s2 = self.processar_estado(self._ultima_observacao) # Novo Estado (s')
 
+        q = self.q
+
         # 1. Calcular o Valor Futuro Esperado: max_a' Q(s', a')
-        max_q2 = max(self.q.get((s2, a), 0.0) for a in self.acoes_possiveis())
+        max_q2 = None
+        for chave, _a in self._pares_estado(s2):
+            v = q.get(chave, 0.0)
+            if max_q2 is None or v > max_q2:
+                max_q2 = v
 
         # 2. Obter o Q-valor atual Q(s, a)
-        antigo = self.q.get((s1, a1), 0.0)
+        chave = self._pares_estado(s1)[self._indice_acao[a1]][0]
+        antigo = q.get(chave, 0.0)
         
         # 3. Regra de Atualização (Q-Learning):
         # Q(s,a) <- Q(s,a) + alpha * [ r + gamma * max Q(s') - Q(s,a) ]
         novo = antigo + self.alpha * (recompensa + self.gamma * max_q2 - antigo)
 
         # 4. Atualizar a Q-table
-        self.q[(s1, a1)] = novo
+        q[chave] = novo
 
     def fim_de_episodio(self):
         """
         Hook chamado no final do episódio. Implementa o decaimento suave de epsilon (Annealing).
         """
         # Reduz epsilon ligeiramente (0.995) para favorecer a explotação ao longo do tempo.
-        self.epsilon = max(0.01, self.epsilon * 0.995)
+        # epsilon = 0.0 representa uma política fixa (modo teste) e mantém-se a 0.
+        if self.epsilon > 0.0:
+            self.epsilon = max(0.01, self.epsilon * 0.995)
         
     
+    # Consulta da Q-table (ver QLearningLabirintoAgent: a tabela pode não estar em self.q)
+
+    def tabela_q(self) -> Dict[EstadoQ, float]:
+        """Q-table atual no formato de dicionário {(estado, acao): valor}."""
+        return self.q
+
+    def tamanho_q(self) -> int:
+        """Número de entradas da Q-table atual (barato: não constrói o dicionário)."""
+        return len(self.q)
+
     # Persistência da Política (Modo Teste)
     
     def save_qtable(self, path: str) -> None:
@@ -119,4 +159,23 @@ class QLearningAgentBase(Agent):
         """Carrega a Q-table pré-treinada para o Modo de Teste/Avaliação."""
         import pickle
         with open(path, "rb") as f:
-            self.q = pickle.load(f)
\ No newline at end of file
+            self.q = pickle.load(f)
+
+    def treinar_offline(self, transicoes, **parametros) -> None:
+        """
+        Substitui a Q-table pela aprendida offline sobre um lote de
+        transições (`Transicoes`), com o gamma do agente. Ver `iteracao_q_ajustada`.
+        """
+        from .qlearning_offline import iteracao_q_ajustada
+        parametros.setdefault("gamma", self.gamma)
+        self.q = iteracao_q_ajustada(transicoes, self.acoes_possiveis(), **parametros)
+
+    def compilar_politica(self, limites: Optional[Sequence[Tuple[int, int]]] = None):
+        """
+        Exporta a política greedy (argmax Q) como tabela densa de ações,
+        para ser usada por um `PolicyAgent`. Ver `compilar_politica`.
+        """
+        from .policy_agent import compilar_politica
+        return compilar_politica(
+            self.q, self.acoes_possiveis(), limites, campos=self.campos_estado, gamma=self.gamma
+        )
\ No newline at end of file
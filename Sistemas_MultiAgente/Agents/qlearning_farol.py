@@ -1,4 +1,6 @@
-from typing import Dict, Any, Hashable
+from typing import Dict, Hashable, Tuple
+
+from Core import ObservacaoFarol
 from .qlearning_base import QLearningAgentBase
 
 class QLearningFarolAgent(QLearningAgentBase):
@@ -7,8 +9,24 @@ class QLearningFarolAgent(QLearningAgentBase):
     O estado é definido pelo vetor de distância relativa (dx, dy).
     """
 
-    def processar_estado(self, obs: Dict[str, Any]) -> Hashable:
+    campos_estado = ("dx", "dy")
+    tipo_observacao = ObservacaoFarol
+
+    def __init__(self, agent_id: int, alpha=0.1, gamma=0.90, epsilon=0.2):
+        super().__init__(agent_id, alpha=alpha, gamma=gamma, epsilon=epsilon)
+        # dx -> dy -> tuplo (dx, dy) único: o estado de cada passo é procurado,
+        # não construído (os inteiros pequenos do Python já são partilhados)
+        self._estados: Dict[int, Dict[int, Tuple[int, int]]] = {}
+
+    def processar_estado(self, obs: ObservacaoFarol) -> Hashable:
         """
         Extrai (dx, dy) da observação para usar como chave na Q-Table.
         """
-        return (obs["dx"], obs["dy"])
\ No newline at end of file
+        dx, dy = obs.dx, obs.dy
+        linha = self._estados.get(dx)
+        if linha is None:
+            linha = self._estados[dx] = {}
+        estado = linha.get(dy)
+        if estado is None:
+            estado = linha[dy] = (dx, dy)
+        return estado
@@ -1,14 +1,142 @@
-from typing import Any, Hashable, Tuple
-from .qlearning_base import QLearningAgentBase
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .qlearning_base import QLearningAgentBase, EstadoQ
 
 class QLearningLabirintoAgent(QLearningAgentBase):
     """
     Agente Q-Learning especializado para o ambiente Labirinto.
     O estado é definido pelas coordenadas absolutas do agente e do objetivo.
+
+    Modo "todos os objetivos" (relabelling em retrospetiva): indicando as
+    saídas possíveis (`objetivos`) e o tamanho da grelha (`dimensoes`), a
+    Q-table passa a ser densa (objetivo x célula x ação). Como o movimento e
+    as paredes não dependem da saída, cada transição real é aplicada de uma
+    só vez às linhas de todos os objetivos, com a recompensa recalculada:
+    100 (e fim) se a célula de chegada for esse objetivo, a recompensa real
+    caso contrário. Neste modo os valores vivem em `q_objetivos` e `self.q`
+    só é sincronizado ao guardar/compilar: durante o treino consulte
+    `tabela_q()` / `tamanho_q()`.
     """
 
+    def __init__(
+        self,
+        agent_id: int,
+        alpha=0.1,
+        gamma=0.90,
+        epsilon=0.2,
+        objetivos: Optional[Sequence[Tuple[int, int]]] = None,
+        dimensoes: Optional[Tuple[int, int]] = None,
+    ):
+        super().__init__(agent_id, alpha=alpha, gamma=gamma, epsilon=epsilon)
+
+        self.q_objetivos: Optional[np.ndarray] = None
+        if objetivos is not None:
+            if dimensoes is None:
+                raise ValueError("O modo todos-os-objetivos precisa das dimensões (largura, altura).")
+            self.largura, self.altura = dimensoes
+            self.objetivos = [tuple(o) for o in objetivos]
+
+            # Q densa: (objetivo, célula y*largura + x, ação em acoes_possiveis())
+            celulas = self.largura * self.altura
+            self.q_objetivos = np.zeros((len(self.objetivos), celulas, len(self.acoes_possiveis())))
+            self._celula_objetivo = np.array([y * self.largura + x for x, y in self.objetivos], dtype=np.int64)
+            self._indice_objetivo = {o: g for g, o in enumerate(self.objetivos)}
+            self._coluna = {a: j for j, a in enumerate(self.acoes_possiveis())}
+
     def processar_estado(self, obs: Any) -> Hashable:
         """
         Retorna a observação completa (tuplo de coordenadas) como estado.
         """
-        return obs
\ No newline at end of file
+        return obs
+
+    # Modo todos-os-objetivos (Q densa)
+
+    def _linha(self, estado: Tuple[int, int, int, int]) -> Tuple[int, int]:
+        x, y, sx, sy = estado
+        g = self._indice_objetivo.get((sx, sy))
+        if g is None:
+            raise ValueError(f"Saída {(sx, sy)} fora dos objetivos configurados.")
+        return g, y * self.largura + x
+
+    def _melhor_acao(self, estado: Hashable) -> str:
+        if self.q_objetivos is None:
+            return super()._melhor_acao(estado)
+        g, s = self._linha(estado)
+        # Mesmo desempate da classe base: maior (Q, direcao)
+        return max(zip(self.q_objetivos[g, s].tolist(), self.acoes_possiveis()))[1]
+
+    def avaliacaoEstadoAtual(self, recompensa: float):
+        if self.q_objetivos is None:
+            return super().avaliacaoEstadoAtual(recompensa)
+        if self._ultimo_estado is None or self._ultima_acao is None:
+            return
+
+        _g, s1 = self._linha(self._ultimo_estado)
+        _g, s2 = self._linha(self.processar_estado(self._ultima_observacao))
+        a1 = self._coluna[self._ultima_acao]
+
+        # Recompensa e fim de episódio de cada objetivo: só um movimento válido
+        # pode chegar a uma saída; para as restantes, um movimento vale -1
+        chegou = self._celula_objetivo == s2
+        if s2 == s1:
+            chegou[:] = False
+            base = recompensa
+        else:
+            base = -1.0 if recompensa == 100.0 else recompensa
+        recompensas = np.where(chegou, 100.0, base)
+
+        # Q(s,a) <- Q(s,a) + alpha * [ r + gamma * max Q(s') * (1 - fim) - Q(s,a) ]
+        q = self.q_objetivos
+        futuro = q[:, s2, :].max(axis=1)
+        futuro[chegou] = 0.0
+        antigo = q[:, s1, a1]
+        novo = antigo + self.alpha * (recompensas + self.gamma * futuro - antigo)
+
+        # Linhas em que o agente já estaria sobre a saída não são estados reais
+        q[:, s1, a1] = np.where(self._celula_objetivo == s1, antigo, novo)
+
+    def tabela_q(self) -> Dict[EstadoQ, float]:
+        """Q-table no formato de dicionário {((x, y, sx, sy), acao): valor} (entradas não nulas)."""
+        if self.q_objetivos is None:
+            return self.q
+        acoes = self.acoes_possiveis()
+        tabela: Dict[EstadoQ, float] = {}
+        for g, s, j in zip(*np.nonzero(self.q_objetivos)):
+            sx, sy = self.objetivos[g]
+            estado = (int(s) % self.largura, int(s) // self.largura, sx, sy)
+            tabela[(estado, acoes[j])] = float(self.q_objetivos[g, s, j])
+        return tabela
+
+    def tamanho_q(self) -> int:
+        if self.q_objetivos is None:
+            return len(self.q)
+        return int(np.count_nonzero(self.q_objetivos))
+
+    # Persistência: sempre no formato de dicionário (compatível com o modo normal)
+
+    def save_qtable(self, path: str) -> None:
+        self.q = self.tabela_q()
+        super().save_qtable(path)
+
+    def load_qtable(self, path: str) -> None:
+        super().load_qtable(path)
+        self._carregar_densa()
+
+    def treinar_offline(self, transicoes, **parametros) -> None:
+        super().treinar_offline(transicoes, **parametros)
+        self._carregar_densa()
+
+    def _carregar_densa(self) -> None:
+        # Copia a Q-table em dicionário (self.q) para a Q densa
+        if self.q_objetivos is None:
+            return
+        self.q_objetivos[:] = 0.0
+        for (estado, acao), valor in self.q.items():
+            g, s = self._linha(estado)
+            self.q_objetivos[g, s, self._coluna[acao]] = valor
+
+    def compilar_politica(self, limites: Optional[Sequence[Tuple[int, int]]] = None):
+        self.q = self.tabela_q()
+        return super().compilar_politica(limites)
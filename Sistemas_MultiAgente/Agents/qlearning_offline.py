@@ -0,0 +1,169 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from Core import Accao
+from .qlearning_base import EstadoQ
+
+# Função de estado: (posições (N, 2), alvo (x, y)) -> estados (N, D)
+FuncaoEstado = Callable[[np.ndarray, Tuple[int, int]], np.ndarray]
+
+
+def estado_labirinto(posicoes: np.ndarray, alvo: Tuple[int, int]) -> np.ndarray:
+    """Estado do `QLearningLabirintoAgent`: (x, y, sx, sy)."""
+    return np.column_stack([posicoes, np.broadcast_to(np.asarray(alvo), posicoes.shape)])
+
+
+def estado_farol(posicoes: np.ndarray, alvo: Tuple[int, int]) -> np.ndarray:
+    """Estado do `QLearningFarolAgent`: (dx, dy) ao alvo (exato com um só farol)."""
+    return np.asarray(alvo) - posicoes
+
+
+@dataclass
+class Transicoes:
+    """
+    Conjunto de transições (s, a, r, s', fim) em arrays, para treino offline.
+
+    Campos:
+      - estados / proximos: estados codificados (N, D), int64
+      - acoes: códigos das ações (N,), índices em Accao.DIRECOES
+      - recompensas: (N,), float64
+      - terminais: (N,), bool - a transição terminou o episódio
+    """
+    estados: np.ndarray
+    acoes: np.ndarray
+    recompensas: np.ndarray
+    proximos: np.ndarray
+    terminais: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.acoes)
+
+    @classmethod
+    def de_tuplos(cls, transicoes: Iterable[Tuple[Sequence[int], Any, float, Sequence[int], bool]]) -> "Transicoes":
+        """
+        A partir de tuplos (s, a, r, s', fim); `a` pode ser uma direção, uma
+        Accao ou o seu código. Ações sem direção são descartadas (não têm
+        coluna na Q-table).
+        """
+        codigos = {d: i for i, d in enumerate(Accao.DIRECOES)}
+        estados, acoes, recompensas, proximos, terminais = [], [], [], [], []
+        for s, a, r, s2, fim in transicoes:
+            if isinstance(a, Accao):
+                a = a.direcao
+            codigo = int(a) if isinstance(a, (int, np.integer)) else codigos.get(a)
+            if codigo is None or not 0 <= codigo < len(Accao.DIRECOES):
+                continue
+            estados.append(tuple(s))
+            acoes.append(codigo)
+            recompensas.append(r)
+            proximos.append(tuple(s2))
+            terminais.append(fim)
+        return cls(
+            estados=np.array(estados, dtype=np.int64),
+            acoes=np.array(acoes, dtype=np.uint8),
+            recompensas=np.array(recompensas, dtype=np.float64),
+            proximos=np.array(proximos, dtype=np.int64),
+            terminais=np.array(terminais, dtype=bool),
+        )
+
+    @classmethod
+    def de_trajetorias(cls, trajetorias: Iterable[Any], estado: FuncaoEstado = estado_labirinto) -> "Transicoes":
+        """
+        A partir de episódios gravados (`Metrics.LeitorTrajetorias` ou uma
+        lista de `Trajetoria`), um segmento por agente. `estado` converte as
+        posições e o alvo do episódio no estado do agente. Num episódio com
+        sucesso, a última ação gravada é a transição terminal.
+        """
+        partes = []
+        for t in trajetorias:
+            ultimo = t.passos - 1
+            for indice in np.unique(t.agentes).tolist():
+                passos = np.flatnonzero(t.agentes == indice)
+                caminho = t.posicoes_agente(indice).astype(np.int64)
+                partes.append((
+                    estado(caminho[:-1], t.alvo),
+                    t.acoes[passos],
+                    t.recompensas[passos],
+                    estado(caminho[1:], t.alvo),
+                    (passos == ultimo) & bool(t.sucesso),
+                ))
+        if not partes:
+            raise ValueError("Sem transições nas trajetórias indicadas.")
+
+        estados, acoes, recompensas, proximos, terminais = (np.concatenate(c) for c in zip(*partes))
+        validas = acoes < len(Accao.DIRECOES)  # descarta ações sem direção
+        return cls(
+            estados=estados[validas].astype(np.int64),
+            acoes=acoes[validas].astype(np.uint8),
+            recompensas=recompensas[validas].astype(np.float64),
+            proximos=proximos[validas].astype(np.int64),
+            terminais=terminais[validas],
+        )
+
+
+def iteracao_q_ajustada(
+    transicoes: Transicoes,
+    acoes: Sequence[str] = Accao.DIRECOES,
+    gamma: float = 0.9,
+    alpha: float = 1.0,
+    max_iteracoes: int = 1000,
+    tolerancia: float = 1e-6,
+) -> Dict[EstadoQ, float]:
+    """
+    Q-learning offline (fitted Q-iteration tabular) sobre um lote fixo de
+    transições. Cada iteração é uma passagem vetorizada por todo o lote:
+
+        alvo_i = r_i + gamma * (1 - fim_i) * max_a' Q(s'_i, a')
+        Q(s, a) <- Q(s, a) + alpha * [ média dos alvo_i de (s, a) - Q(s, a) ]
+
+    Com alpha = 1 é a iteração de Q ajustada clássica (regressão tabular =
+    média); alpha < 1 dá varrimentos amortecidos. Pares (s, a) ausentes do
+    lote ficam a 0, como na Q-table online.
+
+    Args:
+        acoes: Colunas da Q-table (ordem de `acoes_possiveis()` do agente).
+
+    Returns:
+        Q-table {(estado, acao): valor} com os pares presentes no lote, no
+        formato de `QLearningAgentBase.save_qtable` / `load_qtable`.
+    """
+    n = len(transicoes)
+    if n == 0:
+        return {}
+
+    # Estados -> índices densos 0..S-1
+    todos = np.concatenate([transicoes.estados, transicoes.proximos])
+    unicos, ids = np.unique(todos, axis=0, return_inverse=True)
+    ids = ids.reshape(-1)
+    s, s2 = ids[:n], ids[n:]
+    n_estados, n_acoes = len(unicos), len(acoes)
+
+    coluna = np.full(len(Accao.DIRECOES), -1, dtype=np.int64)
+    for j, a in enumerate(acoes):
+        coluna[Accao.DIRECOES.index(a)] = j
+    colunas = coluna[transicoes.acoes]
+    if (colunas < 0).any():
+        raise ValueError("O lote tem ações fora de `acoes`.")
+
+    sa = s * n_acoes + colunas
+    contagem = np.bincount(sa, minlength=n_estados * n_acoes)
+    visitados = np.flatnonzero(contagem)
+    contagem = contagem[visitados]
+    desconto = gamma * ~transicoes.terminais
+
+    q = np.zeros(n_estados * n_acoes)
+    for _ in range(max_iteracoes):
+        v = q.reshape(n_estados, n_acoes).max(axis=1)  # max por estado, antes de indexar o lote
+        alvo = transicoes.recompensas + desconto * v[s2]
+        media = np.bincount(sa, weights=alvo, minlength=n_estados * n_acoes)[visitados] / contagem
+        delta = alpha * (media - q[visitados])
+        q[visitados] += delta
+        if np.abs(delta).max() < tolerancia:
+            break
+
+    estados = [tuple(e) for e in unicos[visitados // n_acoes].tolist()]
+    nomes = [acoes[j] for j in (visitados % n_acoes).tolist()]
+    return dict(zip(zip(estados, nomes), q[visitados].tolist()))
@@ -0,0 +1,156 @@
+from __future__ import annotations
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .qlearning_base import EstadoQ
+from .qlearning_labirinto import QLearningLabirintoAgent
+
+
+class TabelaQPartilhada:
+    """
+    Q-table densa (n_estados x n_acoes, float64) num bloco de
+    `multiprocessing.shared_memory`, partilhada por vários processos.
+
+    O bloco guarda também o epsilon global (primeiro float64), que o processo
+    principal atualiza e os workers leem no fim de cada episódio.
+
+    Args:
+        limites: (mínimo, máximo) de cada componente do estado (ex: (x, y, sx, sy)).
+        n_acoes: Número de ações (colunas).
+        nome: Nome de um bloco existente (worker); None cria um bloco novo.
+    """
+
+    def __init__(
+        self,
+        limites: Sequence[Tuple[int, int]],
+        n_acoes: int,
+        nome: Optional[str] = None,
+    ) -> None:
+        self.limites = [tuple(l) for l in limites]
+        self.offsets = [lo for lo, _hi in self.limites]
+        self.forma = [hi - lo + 1 for lo, hi in self.limites]
+        self.n_acoes = n_acoes
+        self.n_estados = int(np.prod(self.forma))
+
+        passos = []
+        acumulado = n_acoes
+        for d in reversed(self.forma):
+            passos.append(acumulado)
+            acumulado *= d
+        self.passos = tuple(reversed(passos))  # em floats, já multiplicados por n_acoes
+
+        n_bytes = 8 * (1 + self.n_estados * n_acoes)
+        self.criador = nome is None
+        if self.criador:
+            self._shm = shared_memory.SharedMemory(create=True, size=n_bytes)
+            self._shm.buf[:n_bytes] = bytes(n_bytes)  # Q inicial a 0.0
+        else:
+            # Workers herdam o resource tracker do processo principal, que é
+            # o único a remover o bloco (destruir)
+            self._shm = shared_memory.SharedMemory(name=nome)
+
+        # memoryview 'd': acesso escalar mais rápido do que indexar um ndarray
+        self._valores = self._shm.buf[:n_bytes].cast("d")
+
+    @property
+    def nome(self) -> str:
+        return self._shm.name
+
+    @property
+    def epsilon(self) -> float:
+        return self._valores[0]
+
+    @epsilon.setter
+    def epsilon(self, valor: float) -> None:
+        self._valores[0] = valor
+
+    def base(self, estado: Sequence[int]) -> int:
+        """Posição (no bloco) do Q da primeira ação do estado."""
+        idx = 1
+        for v, off, passo in zip(estado, self.offsets, self.passos):
+            idx += (v - off) * passo
+        return idx
+
+    def como_array(self) -> np.ndarray:
+        """Cópia da Q-table como array (n_estados x n_acoes)."""
+        q = np.frombuffer(self._valores, dtype=np.float64, offset=8)
+        return q.reshape(self.n_estados, self.n_acoes).copy()
+
+    def tamanho(self) -> int:
+        """Número de entradas Q != 0 (sem copiar o bloco)."""
+        return int(np.count_nonzero(np.frombuffer(self._valores, dtype=np.float64, offset=8)))
+
+    def para_dict(self, acoes: Sequence[str]) -> Dict[EstadoQ, float]:
+        """Converte para o formato {(estado, acao): Q} dos agentes (só Q != 0)."""
+        q = self.como_array()
+        linhas, colunas = np.nonzero(q)
+        estados = np.array(np.unravel_index(linhas, self.forma)).T + np.array(self.offsets)
+        return {
+            (tuple(estado), acoes[c]): v
+            for estado, c, v in zip(estados.tolist(), colunas.tolist(), q[linhas, colunas].tolist())
+        }
+
+    def fechar(self) -> None:
+        self._valores.release()
+        self._shm.close()
+
+    def destruir(self) -> None:
+        """Fecha e remove o bloco (apenas o processo que o criou)."""
+        self.fechar()
+        if self.criador:
+            self._shm.unlink()
+
+
+class QLearningPartilhadoAgent(QLearningLabirintoAgent):
+    """
+    Q-Learning do Labirinto sobre uma `TabelaQPartilhada` (estilo Hogwild):
+    vários processos aplicam atualizações TD sem locks na mesma tabela.
+
+    A política e a regra de atualização são as de `QLearningAgentBase`
+    (incluindo o desempate de `_melhor_acao`); o epsilon é o global da tabela.
+    """
+
+    def __init__(self, agent_id: int, tabela: TabelaQPartilhada, alpha=0.1, gamma=0.90):
+        super().__init__(agent_id, alpha=alpha, gamma=gamma, epsilon=tabela.epsilon)
+        self.tabela = tabela
+
+        acoes = self.acoes_possiveis()
+        # Ordem de desempate de _melhor_acao: (Q, direcao) decrescente
+        self._ordem: List[Tuple[int, str]] = sorted(enumerate(acoes), key=lambda p: p[1], reverse=True)
+
+    def _melhor_acao(self, estado: Hashable) -> str:
+        valores = self.tabela._valores
+        base = self.tabela.base(estado)
+        melhor, melhor_q = None, None
+        for j, a in self._ordem:
+            q = valores[base + j]
+            if melhor_q is None or q > melhor_q:
+                melhor, melhor_q = a, q
+        return melhor
+
+    def avaliacaoEstadoAtual(self, recompensa: float):
+        if self._ultimo_estado is None or self._ultima_acao is None:
+            return
+
+        valores = self.tabela._valores
+        acoes = self.acoes_possiveis()
+        s2 = self.processar_estado(self._ultima_observacao)
+        base2 = self.tabela.base(s2)
+        max_q2 = max(valores[base2:base2 + len(acoes)])
+
+        # Atualização sem lock: leitura e escrita de um único float64
+        i = self.tabela.base(self._ultimo_estado) + acoes.index(self._ultima_acao)
+        antigo = valores[i]
+        valores[i] = antigo + self.alpha * (recompensa + self.gamma * max_q2 - antigo)
+
+    def tabela_q(self) -> Dict[EstadoQ, float]:
+        return self.tabela.para_dict(self.acoes_possiveis())
+
+    def tamanho_q(self) -> int:
+        return self.tabela.tamanho()
+
+    def fim_de_episodio(self):
+        # O decaimento é global (processo principal): lê o valor atual
+        self.epsilon = self.tabela.epsilon
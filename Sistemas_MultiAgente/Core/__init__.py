@@ -1,6 +1,9 @@
 from .action import Accao
 from .agent import Agent
 from .environment import Environment
+from .mensagens import BarramentoMensagens, Mensagem
+from .modelo_mdp import ModeloMDP
+from .observacao import Observacao, ObservacaoFarol
 from .simulator import Simulator
 
-__all__ = ["Accao", "Agent", "Environment", "Simulator"]
+__all__ = ["Accao", "Agent", "BarramentoMensagens", "Environment", "Mensagem", "ModeloMDP", "Observacao", "ObservacaoFarol", "Simulator"]
@@ -14,4 +14,16 @@ class Accao:
     CIMA = "cima"
     BAIXO = "baixo"
     ESQUERDA = "esquerda"
-    DIREITA = "direita"
\ No newline at end of file
+    DIREITA = "direita"
+
+    # Ordem canónica das direções: o índice é o código compacto da ação (0..3).
+    # Qualquer outra ação (ex: "nenhuma") é codificada como len(DIRECOES).
+    DIRECOES = (CIMA, BAIXO, ESQUERDA, DIREITA)
+
+    @staticmethod
+    def mover(direcao: str) -> "Accao":
+        """Ação de movimento partilhada (imutável): evita criar um objeto por passo."""
+        return _MOVER[direcao]
+
+
+_MOVER = {direcao: Accao(tipo="mover", direcao=direcao) for direcao in Accao.DIRECOES}
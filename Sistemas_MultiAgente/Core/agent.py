@@ -1,6 +1,9 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .mensagens import BarramentoMensagens, Mensagem
 
 # Alias para flexibilidade na definição do estado (pode ser tupla, imagem, vetor, etc.)
 Observation = Any
@@ -11,6 +14,13 @@ class Agent(ABC):
     Gere o ciclo de vida de perceção, deliberação e atuação.
     """
 
+    # Ligado pelo Simulator quando há um barramento de mensagens
+    barramento: Optional[BarramentoMensagens] = None
+
+    # Subclasse de `Observacao` lida pelo agente (por atributos); observações
+    # noutro formato (ex: dict) são convertidas em `observacao()`
+    tipo_observacao: Optional[type] = None
+
     def __init__(self, agent_id: int):
         self.id = agent_id
         self._ultima_observacao: Optional[Observation] = None
@@ -19,14 +29,22 @@ class Agent(ABC):
     def cria(cls, nome_ficheiro_parametros: str) -> "Agent":
         """
         Factory method para instanciar agentes a partir de ficheiros de configuração.
-        Deve ser sobreposto pelas subclasses concretas.
+        Lê a secção "agente" de uma especificação JSON/TOML (ou o ficheiro
+        inteiro): {"tipo": ..., "id": ..., "parametros": {...}}. Chamado numa
+        subclasse, o "tipo" é opcional e tem de ser compatível com ela.
         """
-        raise NotImplementedError("O método 'cria' deve ser implementado na subclasse.")
+        from .especificacao import carregar_especificacao, criar_agente
+
+        spec = carregar_especificacao(nome_ficheiro_parametros)
+        return criar_agente(spec.get("agente", spec), base=cls)
 
     def observacao(self, obs: Observation) -> None:
         """
         [Perceção] Recebe e armazena a observação atual do estado do ambiente.
         """
+        tipo = self.tipo_observacao
+        if tipo is not None and not isinstance(obs, tipo):
+            obs = tipo.de_mapeamento(obs)  # adaptador: observações em dict
         self._ultima_observacao = obs
 
     @abstractmethod
@@ -56,6 +74,16 @@ class Agent(ABC):
         """
         pass
 
+    def recebe_mensagens(self, mensagens: Sequence[Mensagem]) -> None:
+        """
+        [Comunicação] Lote de mensagens entregue pelo barramento antes de `age()`.
+        Por omissão chama `comunica` para cada mensagem; agentes com muitas
+        mensagens podem reimplementar para as tratar de uma vez.
+        """
+        for msg in mensagens:
+            remetente = self.barramento.agente(msg.remetente) if self.barramento else None
+            self.comunica(msg.conteudo, remetente)
+
     def fim_de_episodio(self) -> None:
         """
         Hook executado no final de cada episódio.
@@ -1,6 +1,10 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Sequence
+
+# `info` vazio partilhado (imutável) para os resultados de `agir` sem dados extra
+SEM_INFO = MappingProxyType({})
 
 class Environment(ABC):
     """
@@ -16,6 +20,10 @@ class Environment(ABC):
         """
         Gera a observação do estado do mundo específica para um determinado agente.
         Simula os sensores do agente (ex: visão local, coordenadas).
+
+        Ambientes com observações de campos fixos devem devolver uma
+        `Observacao` reutilizável por agente, reescrita no lugar a cada
+        chamada (sem alocar um dicionário por passo).
         """
         ...
 
@@ -31,6 +39,64 @@ class Environment(ABC):
         """
         ...
 
+    def observacoes_lote(self, agentes: Sequence[Any]) -> list[Any]:
+        """
+        [Opcional] Observações de vários agentes numa só chamada, pela ordem
+        de `agentes`. Por omissão recorre a `observacaoPara` para cada um;
+        ambientes com representação em arrays devem reimplementar.
+        """
+        return [self.observacaoPara(agente) for agente in agentes]
+
+    def agir_lote(
+        self, accoes: Sequence[Any], agentes: Sequence[Any]
+    ) -> tuple[list[float], list[bool], list[dict]]:
+        """
+        [Opcional] Executa as ações de vários agentes num só passo.
+
+        As ações são aplicadas pela ordem dada; se uma terminar o episódio, as
+        seguintes não são executadas e as listas devolvidas ficam truncadas
+        nesse agente. Ambientes com movimento simultâneo devolvem uma entrada
+        por agente. Por omissão recorre a `agir` para cada ação.
+
+        Retorna:
+            - recompensas, terminou, infos: uma entrada por ação executada.
+        """
+        recompensas: list[float] = []
+        terminou: list[bool] = []
+        infos: list[dict] = []
+        for accao, agente in zip(accoes, agentes):
+            recompensa, done, info = self.agir(accao, agente)
+            recompensas.append(recompensa)
+            terminou.append(done)
+            infos.append(info)
+            if done:
+                break
+        return recompensas, terminou, infos
+
+    def suporta_lote(self) -> bool:
+        """True se o ambiente tem uma implementação nativa de `agir_lote`."""
+        return type(self).agir_lote is not Environment.agir_lote
+
+    def posicao_agente(self, agente: Any) -> tuple[int, int]:
+        """
+        [Opcional] Posição (x, y) atual do agente na grelha.
+        Usado para gravação de trajetórias e renderização.
+        """
+        raise NotImplementedError(f"{type(self).__name__} não expõe posições.")
+
+    def posicao_alvo(self) -> tuple[int, int]:
+        """
+        [Opcional] Posição (x, y) do objetivo no episódio atual.
+        """
+        raise NotImplementedError(f"{type(self).__name__} não expõe o objetivo.")
+
+    def definir_estado(self, posicao: tuple[int, int], alvo: tuple[int, int]) -> None:
+        """
+        [Opcional] Coloca o ambiente num estado arbitrário (posição do agente e
+        objetivo). Permite reconstruir observações a partir de gravações.
+        """
+        raise NotImplementedError(f"{type(self).__name__} não suporta definir_estado.")
+
     def atualizacao(self) -> None:
         """
         Executa a lógica interna do ambiente (física, movimento de obstáculos, etc.).
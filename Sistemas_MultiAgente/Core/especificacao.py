@@ -0,0 +1,95 @@
+"""
+Especificações declarativas de experiências (ficheiros JSON ou TOML).
+
+Uma especificação descreve o ambiente, o agente, as fases e as seeds:
+
+    {
+      "nome": "labirinto_ql",
+      "ambiente": {"tipo": "LabirintoEnvironment", "parametros": {}},
+      "agente": {"tipo": "QLearningLabirintoAgent", "id": 1,
+                 "parametros": {"alpha": 0.1, "gamma": 0.9, "epsilon": 0.3}},
+      "seeds": [0],
+      "fases": [
+        {"nome": "Treino", "episodios": 25000, "max_passos": 500, "aprendizagem": true},
+        {"nome": "Teste", "episodios": 50, "max_passos": 500, "aprendizagem": false,
+         "atributos": {"epsilon": 0.0}, "detetar_ciclos": true}
+      ]
+    }
+
+Os tipos são nomes de classes exportadas por `Envs` / `Agents`, ou caminhos
+completos "modulo.Classe".
+"""
+from __future__ import annotations
+import importlib
+import inspect
+import json
+import os
+from typing import Any, Dict, Optional
+
+
+def carregar_especificacao(caminho: str) -> Dict[str, Any]:
+    """Lê uma especificação .json ou .toml."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".toml":
+        import tomllib  # Python 3.11+
+
+        with open(caminho, "rb") as f:
+            return tomllib.load(f)
+    if extensao == ".json":
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    raise ValueError(f"Formato de especificação não suportado: {caminho} (use .json ou .toml)")
+
+
+def resolver_classe(tipo: str, pacote: str) -> type:
+    """Resolve "Classe" (exportada por `pacote`) ou "modulo.Classe"."""
+    modulo, _, nome = tipo.rpartition(".")
+    try:
+        return getattr(importlib.import_module(modulo or pacote), nome)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Tipo desconhecido em '{pacote}': {tipo}") from e
+
+
+def criar_ambiente(seccao: Dict[str, Any], seed: Optional[int] = None) -> Any:
+    """
+    Instancia o ambiente descrito em `seccao`. A `seed` é passada ao
+    construtor quando este a aceita e a especificação não a fixa.
+    """
+    classe = resolver_classe(seccao["tipo"], "Envs")
+    parametros = dict(seccao.get("parametros", {}))
+    if seed is not None and "seed" not in parametros:
+        if "seed" in inspect.signature(classe).parameters:
+            parametros["seed"] = seed
+    return classe(**parametros)
+
+
+def criar_agente(seccao: Dict[str, Any], base: Optional[type] = None) -> Any:
+    """Instancia o agente descrito em `seccao` (opcionalmente validando a classe base)."""
+    if "tipo" in seccao:
+        classe = resolver_classe(seccao["tipo"], "Agents")
+    elif base is not None:
+        classe = base
+    else:
+        raise ValueError("A secção do agente não indica o 'tipo'.")
+    if base is not None and not issubclass(classe, base):
+        raise TypeError(f"{classe.__name__} não é subclasse de {base.__name__}.")
+    return classe(seccao.get("id", 1), **seccao.get("parametros", {}))
+
+
+def parametros_fase(fase: Dict[str, Any], nome_base: str = "Experiencia") -> Dict[str, Any]:
+    """Argumentos do `Simulator` para uma fase da especificação."""
+    return {
+        "nome_experiencia": f"{nome_base}_{fase['nome']}" if "nome" in fase else nome_base,
+        "num_episodios": fase.get("episodios", 1),
+        "max_passos": fase.get("max_passos", 100),
+        "modo_aprendizagem": fase.get("aprendizagem", True),
+        "detetar_ciclos": fase.get("detetar_ciclos", False),
+    }
+
+
+def aplicar_atributos(agente: Any, fase: Dict[str, Any]) -> None:
+    """Ajusta atributos do agente antes da fase (ex: {"epsilon": 0.0} no teste)."""
+    for nome, valor in fase.get("atributos", {}).items():
+        if not hasattr(agente, nome):
+            raise AttributeError(f"{type(agente).__name__} não tem o atributo '{nome}'.")
+        setattr(agente, nome, valor)
@@ -0,0 +1,139 @@
+"""
+Índices espaciais para pesquisa de vizinhos mais próximos.
+
+Usado pelo Novelty Search (arquivo de comportamentos) e pelos ambientes com
+muitos alvos (farol mais próximo), onde uma pesquisa linear deixaria de escalar.
+"""
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+class ArvoreKD:
+    """
+    Árvore k-d estática para consultas dos k vizinhos mais próximos.
+    As folhas guardam até `tamanho_folha` pontos, comparados de forma vetorizada.
+    """
+
+    def __init__(self, pontos: np.ndarray, tamanho_folha: int = 16) -> None:
+        self.pontos = np.asarray(pontos, dtype=np.float64)
+        self.tamanho_folha = tamanho_folha
+        self._ordem = np.arange(len(self.pontos))
+
+        # Nós em listas paralelas: dimensão de corte (-1 = folha), valor de corte,
+        # filhos, e intervalo [inicio, fim) em `_ordem` para as folhas
+        self._dim: List[int] = []
+        self._corte: List[float] = []
+        self._esq: List[int] = []
+        self._dir: List[int] = []
+        self._inicio: List[int] = []
+        self._fim: List[int] = []
+
+        if len(self.pontos):
+            self._construir(0, len(self.pontos))
+
+    def __len__(self) -> int:
+        return len(self.pontos)
+
+    def _novo_no(self, inicio: int, fim: int) -> int:
+        self._dim.append(-1)
+        self._corte.append(0.0)
+        self._esq.append(-1)
+        self._dir.append(-1)
+        self._inicio.append(inicio)
+        self._fim.append(fim)
+        return len(self._dim) - 1
+
+    def _construir(self, inicio: int, fim: int) -> int:
+        no = self._novo_no(inicio, fim)
+        if fim - inicio <= self.tamanho_folha:
+            return no
+
+        segmento = self._ordem[inicio:fim]
+        valores = self.pontos[segmento]
+        amplitude = valores.max(axis=0) - valores.min(axis=0)
+        dim = int(np.argmax(amplitude))
+        if amplitude[dim] == 0:
+            return no  # pontos todos iguais: folha grande
+
+        # Partição pela mediana na dimensão de maior amplitude
+        meio = (fim - inicio) // 2
+        particao = np.argpartition(valores[:, dim], meio)
+        self._ordem[inicio:fim] = segmento[particao]
+
+        self._dim[no] = dim
+        self._corte[no] = float(self.pontos[self._ordem[inicio + meio], dim])
+        esq = self._construir(inicio, inicio + meio)
+        dir_ = self._construir(inicio + meio, fim)
+        self._esq[no] = esq
+        self._dir[no] = dir_
+        return no
+
+    def k_vizinhos(self, consultas: np.ndarray, k: int) -> np.ndarray:
+        """
+        Distâncias euclidianas aos k vizinhos mais próximos de cada consulta.
+        Devolve uma matriz (m, k) ordenada; posições sem vizinho ficam a inf.
+        """
+        consultas = np.atleast_2d(np.asarray(consultas, dtype=np.float64))
+        resultado = np.full((len(consultas), k), np.inf)
+        if len(self.pontos) == 0:
+            return resultado
+
+        for i, q in enumerate(consultas):
+            melhores = np.full(k, np.inf)  # distâncias ao quadrado
+            pilha = [(0, 0.0)]  # (nó, distância mínima ao quadrado até à sua região)
+            while pilha:
+                no, minimo = pilha.pop()
+                if minimo >= melhores.max():
+                    continue
+                dim = self._dim[no]
+                if dim < 0:
+                    idx = self._ordem[self._inicio[no]:self._fim[no]]
+                    d2 = ((self.pontos[idx] - q) ** 2).sum(axis=1)
+                    candidatos = np.concatenate([melhores, d2])
+                    melhores = np.partition(candidatos, k - 1)[:k]
+                    continue
+
+                diff = q[dim] - self._corte[no]
+                perto, longe = (self._esq[no], self._dir[no]) if diff < 0 else (self._dir[no], self._esq[no])
+                # O ramo distante só é visitado se o plano de corte estiver
+                # mais perto do que o pior dos k atuais (verificado ao retirar)
+                pilha.append((longe, max(minimo, diff * diff)))
+                pilha.append((perto, minimo))
+
+            resultado[i] = np.sqrt(np.sort(melhores))
+        return resultado
+
+    def mais_proximo(self, ponto: Sequence[float]) -> Tuple[int, float]:
+        """
+        Vizinho mais próximo de um único ponto: (índice em `pontos`, distância
+        euclidiana). Descida O(log n) com poda pelos planos de corte.
+        """
+        q = np.asarray(ponto, dtype=np.float64)
+        melhor_idx, melhor_d2 = -1, np.inf
+        pilha = [(0, 0.0)]
+        while pilha:
+            no, minimo = pilha.pop()
+            if minimo >= melhor_d2:
+                continue
+            dim = self._dim[no]
+            if dim < 0:
+                idx = self._ordem[self._inicio[no]:self._fim[no]]
+                d2 = ((self.pontos[idx] - q) ** 2).sum(axis=1)
+                j = int(np.argmin(d2))
+                if d2[j] < melhor_d2:
+                    melhor_idx, melhor_d2 = int(idx[j]), float(d2[j])
+                continue
+
+            diff = q[dim] - self._corte[no]
+            perto, longe = (self._esq[no], self._dir[no]) if diff < 0 else (self._dir[no], self._esq[no])
+            pilha.append((longe, max(minimo, diff * diff)))
+            pilha.append((perto, minimo))
+
+        return melhor_idx, float(np.sqrt(melhor_d2))
+
+    def mais_proximos(self, consultas: np.ndarray) -> np.ndarray:
+        """Índice do vizinho mais próximo de cada consulta (m,)."""
+        consultas = np.atleast_2d(consultas)
+        return np.array([self.mais_proximo(q)[0] for q in consultas], dtype=np.int64)
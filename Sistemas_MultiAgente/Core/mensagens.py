@@ -0,0 +1,296 @@
+from __future__ import annotations
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .agent import Agent
+    from .environment import Environment
+
+# Modos de entrega
+DIFUSAO = "difusao"          # todos os agentes (exceto o remetente)
+DIRETA = "direta"            # um agente identificado pelo id
+VIZINHANCA = "vizinhanca"    # agentes a uma distância <= raio do remetente
+
+# Políticas para filas cheias
+DESCARTAR_ANTIGAS = "descartar_antigas"  # a mensagem nova substitui a mais antiga
+DESCARTAR_NOVAS = "descartar_novas"      # a mensagem nova é rejeitada
+COALESCER = "coalescer"                  # por (remetente, tipo) só fica a última
+
+POLITICAS = (DESCARTAR_ANTIGAS, DESCARTAR_NOVAS, COALESCER)
+
+
+@dataclass(frozen=True)
+class Mensagem:
+    """
+    Mensagem entre agentes. Imutável: uma difusão é partilhada por todos os
+    destinatários sem cópias.
+    """
+    remetente: Hashable
+    conteudo: Any
+    tipo: str = ""                     # chave de coalescência (ex: "posicao")
+    modo: str = DIFUSAO
+    destino: Optional[Hashable] = None  # id do destinatário (modo direto)
+    raio: float = 0.0                  # alcance (modo vizinhança)
+    passo_envio: int = 0
+    instante_envio: float = 0.0        # time.perf_counter() no envio
+
+
+class _Caixa:
+    """Fila limitada de um agente, segundo a política configurada."""
+
+    __slots__ = ("capacidade", "politica", "fila")
+
+    def __init__(self, capacidade: int, politica: str) -> None:
+        self.capacidade = capacidade
+        self.politica = politica
+        self.fila: Any = OrderedDict() if politica == COALESCER else deque()
+
+    def __len__(self) -> int:
+        return len(self.fila)
+
+    def colocar(self, msg: Mensagem) -> Tuple[int, int]:
+        """Enfileira a mensagem. Devolve (descartadas, coalescidas)."""
+        fila = self.fila
+        if self.politica == COALESCER:
+            chave = (msg.remetente, msg.tipo)
+            if chave in fila:
+                fila[chave] = msg
+                fila.move_to_end(chave)
+                return 0, 1
+            fila[chave] = msg
+            if len(fila) > self.capacidade:
+                fila.popitem(last=False)
+                return 1, 0
+            return 0, 0
+
+        if len(fila) < self.capacidade:
+            fila.append(msg)
+            return 0, 0
+        if self.politica == DESCARTAR_NOVAS:
+            return 1, 0
+        fila.popleft()
+        fila.append(msg)
+        return 1, 0
+
+    def esvaziar(self) -> List[Mensagem]:
+        fila = self.fila
+        mensagens = list(fila.values()) if self.politica == COALESCER else list(fila)
+        fila.clear()
+        return mensagens
+
+
+class BarramentoMensagens:
+    """
+    Barramento de mensagens entre agentes, com entrega por lotes.
+
+    As mensagens enviadas durante um passo ficam num buffer e só são
+    entregues no início do passo seguinte (`entregar`, antes de `age()`),
+    todas de uma vez. Cada agente tem uma fila limitada (`capacidade`) com a
+    política indicada para quando enche.
+
+    O custo por passo é linear no número de mensagens (mais uma passagem
+    pelos agentes): as difusões são guardadas uma só vez e partilhadas por
+    todos os destinatários, e a vizinhança usa uma grelha de hashing espacial
+    com células do tamanho do raio, pelo que cada mensagem só examina os
+    agentes das 3x3 células à volta do remetente.
+
+    Agentes que não reimplementam `comunica` nem `recebe_mensagens` não
+    recebem nada (evita N chamadas vazias por difusão).
+
+    Args:
+        capacidade (int): Tamanho máximo da fila de cada agente (e do lote de
+                          difusões de um passo).
+        politica (str): DESCARTAR_ANTIGAS, DESCARTAR_NOVAS ou COALESCER.
+    """
+
+    def __init__(self, capacidade: int = 64, politica: str = DESCARTAR_ANTIGAS) -> None:
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconhecida: {politica}. Opções: {POLITICAS}")
+        self.capacidade = capacidade
+        self.politica = politica
+
+        self.ambiente: Optional[Environment] = None
+        self._agentes: Dict[Hashable, Agent] = {}
+        self._recetores: List[Agent] = []
+        self._caixas: Dict[Hashable, _Caixa] = {}
+        self._pendentes: List[Mensagem] = []
+        self.passo = 0
+
+        self.reiniciar_estatisticas()
+
+    # Configuração
+
+    def ligar(self, agentes: Sequence[Agent], ambiente: Optional[Environment] = None) -> None:
+        """Regista os agentes (e o ambiente, para a vizinhança) no barramento."""
+        from .agent import Agent
+
+        self.ambiente = ambiente
+        self._agentes = {agente.id: agente for agente in agentes}
+        # Só quem sabe tratar mensagens as recebe (e tem fila)
+        self._recetores = [
+            agente for agente in agentes
+            if type(agente).comunica is not Agent.comunica
+            or type(agente).recebe_mensagens is not Agent.recebe_mensagens
+        ]
+        self._caixas = {
+            agente.id: _Caixa(self.capacidade, self.politica) for agente in self._recetores
+        }
+        for agente in agentes:
+            agente.barramento = self
+        self.novo_episodio()
+
+    def novo_episodio(self) -> None:
+        """Descarta mensagens pendentes e filas (não atravessam episódios)."""
+        self._pendentes = []
+        for caixa in self._caixas.values():
+            caixa.fila.clear()
+        self.passo = 0
+
+    def agente(self, agent_id: Hashable) -> Optional[Agent]:
+        """Agente registado com o id indicado (ou None)."""
+        return self._agentes.get(agent_id)
+
+    # Envio (bufferizado até ao próximo `entregar`)
+
+    def _enfileirar(self, msg: Mensagem) -> None:
+        self._pendentes.append(msg)
+        self.enviadas += 1
+
+    def difundir(self, remetente: Agent, conteudo: Any, tipo: str = "") -> None:
+        """Envia para todos os agentes (exceto o remetente)."""
+        self._enfileirar(Mensagem(
+            remetente.id, conteudo, tipo, DIFUSAO,
+            passo_envio=self.passo, instante_envio=time.perf_counter(),
+        ))
+
+    def enviar(self, remetente: Agent, destino: Hashable, conteudo: Any, tipo: str = "") -> None:
+        """Envia para um único agente (id `destino`)."""
+        if destino not in self._agentes:
+            raise KeyError(f"Agente destino desconhecido: {destino}")
+        self._enfileirar(Mensagem(
+            remetente.id, conteudo, tipo, DIRETA, destino=destino,
+            passo_envio=self.passo, instante_envio=time.perf_counter(),
+        ))
+
+    def vizinhanca(self, remetente: Agent, conteudo: Any, raio: float, tipo: str = "") -> None:
+        """Envia para os agentes a distância euclidiana <= raio do remetente."""
+        if self.ambiente is None:
+            raise ValueError("A entrega por vizinhança precisa do ambiente (ligar(agentes, ambiente)).")
+        self._enfileirar(Mensagem(
+            remetente.id, conteudo, tipo, VIZINHANCA, raio=raio,
+            passo_envio=self.passo, instante_envio=time.perf_counter(),
+        ))
+
+    # Entrega
+
+    def _posicoes(self) -> Dict[Hashable, Tuple[int, int]]:
+        posicao = self.ambiente.posicao_agente
+        return {aid: posicao(agente) for aid, agente in self._agentes.items()}
+
+    def _entregar_vizinhanca(self, mensagens: List[Mensagem]) -> None:
+        """Hashing espacial: uma grelha por raio distinto usado neste passo."""
+        posicoes = self._posicoes()
+        caixas = self._caixas
+        grelhas: Dict[float, Dict[Tuple[int, int], List[Hashable]]] = {}
+
+        for msg in mensagens:
+            raio = msg.raio
+            celula_lado = max(raio, 1.0)
+            grelha = grelhas.get(raio)
+            if grelha is None:
+                grelha = grelhas[raio] = {}
+                for aid, (x, y) in posicoes.items():
+                    grelha.setdefault((int(x // celula_lado), int(y // celula_lado)), []).append(aid)
+
+            ox, oy = posicoes[msg.remetente]
+            cx, cy = int(ox // celula_lado), int(oy // celula_lado)
+            raio2 = raio * raio
+            for i in (cx - 1, cx, cx + 1):
+                for j in (cy - 1, cy, cy + 1):
+                    for aid in grelha.get((i, j), ()):
+                        if aid == msg.remetente:
+                            continue
+                        x, y = posicoes[aid]
+                        if (x - ox) ** 2 + (y - oy) ** 2 <= raio2:
+                            self._colocar(caixas.get(aid), msg)
+
+    def _colocar(self, caixa: Optional[_Caixa], msg: Mensagem) -> None:
+        if caixa is None:
+            return  # destinatário não recebe mensagens
+        descartadas, coalescidas = caixa.colocar(msg)
+        self.descartadas += descartadas
+        self.coalescidas += coalescidas
+
+    def entregar(self, passo: int) -> None:
+        """
+        Encaminha as mensagens enviadas desde a última entrega e entrega,
+        de uma vez, o lote de cada agente (`Agent.recebe_mensagens`).
+        Chamado pelo Simulator no início de cada passo, antes de `age()`.
+        """
+        pendentes, self._pendentes = self._pendentes, []
+        self.passo = passo
+
+        # 1. Encaminhamento (cada mensagem é processada uma vez)
+        difusoes: List[Mensagem] = []
+        vizinhanca: List[Mensagem] = []
+        for msg in pendentes:
+            if msg.modo == DIRETA:
+                self._colocar(self._caixas.get(msg.destino), msg)
+            elif msg.modo == VIZINHANCA:
+                vizinhanca.append(msg)
+            else:
+                difusoes.append(msg)
+        if vizinhanca:
+            self._entregar_vizinhanca(vizinhanca)
+
+        # Difusões: um único lote limitado, partilhado por todos os agentes
+        if difusoes:
+            caixa = _Caixa(self.capacidade, self.politica)
+            for msg in difusoes:
+                self._colocar(caixa, msg)
+            difusoes = caixa.esvaziar()
+
+        # 2. Entrega em lote
+        agora = time.perf_counter()
+        for agente in self._recetores:
+            caixa = self._caixas[agente.id]
+            if difusoes:
+                lote = [m for m in difusoes if m.remetente != agente.id]
+                if len(caixa):
+                    lote = caixa.esvaziar() + lote
+            elif len(caixa):
+                lote = caixa.esvaziar()
+            else:
+                continue
+            if not lote:
+                continue
+
+            self.entregues += len(lote)
+            for msg in lote:
+                self.latencia_passos += passo - msg.passo_envio
+                self.latencia_segundos += agora - msg.instante_envio
+            agente.recebe_mensagens(lote)
+
+    # Instrumentação
+
+    def reiniciar_estatisticas(self) -> None:
+        self.enviadas = 0
+        self.entregues = 0
+        self.descartadas = 0
+        self.coalescidas = 0
+        self.latencia_passos = 0
+        self.latencia_segundos = 0.0
+
+    def estatisticas(self) -> Dict[str, float]:
+        """Contagens de entrega e latência média (em passos e em segundos)."""
+        n = self.entregues
+        return {
+            "enviadas": self.enviadas,
+            "entregues": n,
+            "descartadas": self.descartadas,
+            "coalescidas": self.coalescidas,
+            "latencia_media_passos": self.latencia_passos / n if n else 0.0,
+            "latencia_media_ms": 1000.0 * self.latencia_segundos / n if n else 0.0,
+        }
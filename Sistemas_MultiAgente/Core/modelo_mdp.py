@@ -0,0 +1,107 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .action import Accao
+
+# Colunas das tabelas: os códigos de Accao.DIRECOES e, no fim, "sem movimento"
+ACOES_MDP: Tuple[Optional[str], ...] = Accao.DIRECOES + (None,)
+PARADO = len(Accao.DIRECOES)
+
+# Deslocamento (dx, dy) de cada coluna
+DESLOCAMENTOS_MDP = ((0, -1), (0, 1), (-1, 0), (1, 0), (0, 0))
+
+# direção -> coluna (qualquer outra ação usa PARADO)
+CODIGOS_MDP = {direcao: i for i, direcao in enumerate(Accao.DIRECOES)}
+
+
+@dataclass
+class ModeloMDP:
+    """
+    Modelo explícito de um ambiente de grelha determinístico: tabelas
+    (n_estados x n_acoes) de próximo estado, recompensa e fim de episódio.
+
+    Os estados são as células da grelha, `s = y * largura + x`; as colunas
+    seguem ACOES_MDP (Accao.DIRECOES + "sem movimento"). Serve tanto para
+    avançar ambientes por indexação (escalar ou em lote) como para
+    planeamento (`iteracao_valores`).
+    """
+
+    largura: int
+    altura: int
+    proximo: np.ndarray      # int64 (S, A)
+    recompensa: np.ndarray   # float64 (S, A)
+    terminal: np.ndarray     # bool (S, A): a transição termina o episódio
+    xs: np.ndarray = field(init=False, repr=False)
+    ys: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.xs, self.ys = self.coordenadas(self.largura, self.altura)
+
+    @staticmethod
+    def coordenadas(largura: int, altura: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(xs, ys) de cada estado (S,)."""
+        s = np.arange(largura * altura, dtype=np.int64)
+        return s % largura, s // largura
+
+    @property
+    def n_estados(self) -> int:
+        return self.proximo.shape[0]
+
+    @property
+    def n_acoes(self) -> int:
+        return self.proximo.shape[1]
+
+    def estado(self, x: int, y: int) -> int:
+        return y * self.largura + x
+
+    def posicao(self, s: int) -> Tuple[int, int]:
+        return s % self.largura, s // self.largura
+
+    def codigo(self, accao: Accao) -> int:
+        return CODIGOS_MDP.get(accao.direcao, PARADO)
+
+    def passo(self, s: int, a: int) -> Tuple[int, float, bool]:
+        """Transição (s, a) -> (s', r, terminou)."""
+        return int(self.proximo[s, a]), float(self.recompensa[s, a]), bool(self.terminal[s, a])
+
+    def passo_lote(self, estados: np.ndarray, acoes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transições de vários pares (s, a) numa só indexação."""
+        return self.proximo[estados, acoes], self.recompensa[estados, acoes], self.terminal[estados, acoes]
+
+    def iteracao_valores(
+        self,
+        gamma: float = 0.9,
+        tolerancia: float = 1e-9,
+        max_iteracoes: int = 10000,
+        acoes: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Planeamento por iteração de valores:
+        Q(s, a) = r(s, a) + gamma * (1 - terminal) * V(s'),  V(s) = max_a Q(s, a).
+
+        Args:
+            acoes: Colunas consideradas (por omissão, as quatro direções).
+
+        Returns:
+            (Q (S, A) nas colunas `acoes`, política greedy: código da ação por estado (uint8)).
+        """
+        if acoes is None:
+            acoes = np.arange(PARADO)
+        prox = self.proximo[:, acoes]
+        r = self.recompensa[:, acoes]
+        continua = ~self.terminal[:, acoes]
+
+        v = np.zeros(self.n_estados)
+        q = r.copy()
+        for _ in range(max_iteracoes):
+            q = r + gamma * continua * v[prox]
+            novo = q.max(axis=1)
+            if np.max(np.abs(novo - v)) < tolerancia:
+                v = novo
+                break
+            v = novo
+        politica = np.asarray(acoes, dtype=np.uint8)[np.argmax(q, axis=1)]
+        return q, politica
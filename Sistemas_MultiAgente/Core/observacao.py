@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+
+class Observacao:
+    """
+    Observação com campos fixos (`__slots__`), reutilizável entre passos.
+
+    O ambiente cria um objeto por agente e reescreve os campos no lugar a
+    cada `observacaoPara`, sem criar dicionários. Os agentes leem os campos
+    como atributos (`obs.dx`).
+
+    Adaptador para agentes existentes: a observação comporta-se também como
+    um mapeamento só de leitura (`obs["dx"]`, `obs.get("N", 20)`, `dict(obs)`).
+
+    O objeto devolvido pelo ambiente só é válido até à observação seguinte
+    do mesmo agente; para guardar um histórico use `copia()` ou `valores()`.
+    """
+
+    __slots__ = ()
+
+    # Subclasses: nomes dos campos, pela ordem de `valores()`
+    campos: Tuple[str, ...] = ()
+
+    def __init__(self, **valores: Any) -> None:
+        for campo in self.campos:
+            setattr(self, campo, valores.get(campo, 0))
+
+    @classmethod
+    def de_mapeamento(cls, dados: Mapping[str, Any], destino: Optional["Observacao"] = None) -> "Observacao":
+        """Converte uma observação em dicionário (reutilizando `destino`, se indicado)."""
+        obs = destino if destino is not None else cls()
+        for campo in cls.campos:
+            if campo in dados:
+                setattr(obs, campo, dados[campo])
+        return obs
+
+    def valores(self) -> Tuple[Any, ...]:
+        """Cópia imutável dos campos (ex: chave de estado)."""
+        return tuple(getattr(self, campo) for campo in self.campos)
+
+    def copia(self) -> Dict[str, Any]:
+        return {campo: getattr(self, campo) for campo in self.campos}
+
+    # Adaptador de mapeamento (compatibilidade com observações em dict)
+
+    def __getitem__(self, campo: str) -> Any:
+        try:
+            return getattr(self, campo)
+        except AttributeError:
+            raise KeyError(campo) from None
+
+    def get(self, campo: str, omissao: Any = None) -> Any:
+        return getattr(self, campo, omissao) if campo in self.campos else omissao
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.campos
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((campo, getattr(self, campo)) for campo in self.campos)
+
+    def __contains__(self, campo: object) -> bool:
+        return campo in self.campos
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.campos)
+
+    def __len__(self) -> int:
+        return len(self.campos)
+
+    def __eq__(self, outro: object) -> bool:
+        if isinstance(outro, Observacao):
+            return self.campos == outro.campos and self.valores() == outro.valores()
+        if isinstance(outro, Mapping):
+            return self.copia() == dict(outro)
+        return NotImplemented
+
+    __hash__ = None  # mutável
+
+    def __repr__(self) -> str:
+        campos = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.campos)
+        return f"{type(self).__name__}({campos})"
+
+
+class ObservacaoFarol(Observacao):
+    """
+    Observação do Farol: distância (dx, dy) ao farol mais próximo, mais as
+    coordenadas absolutas do agente e do farol e o tamanho N da grelha
+    (usadas pelos agentes genéticos).
+    """
+
+    __slots__ = ("dx", "dy", "x", "y", "farol_x", "farol_y", "N")
+    campos = __slots__
@@ -1,10 +1,16 @@
 from __future__ import annotations
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional
 
 from .agent import Agent
 from .environment import Environment
+from .mensagens import BarramentoMensagens
+from .observacao import Observacao
 from Metrics import EpisodioStats, MetricsLogger
 
+if TYPE_CHECKING:
+    from Agents.politica_partilhada import PublicadorPolitica
+    from Metrics import ExportadorMetricas, GravadorTrajetorias
+
 
 class Simulator:
     """
@@ -23,6 +29,12 @@ class Simulator:
         modo_aprendizagem: bool = True,
         gamma_default: float = 0.99,
         logger: Optional[MetricsLogger] = None,
+        gravador: Optional[GravadorTrajetorias] = None,
+        detetar_ciclos: bool = False,
+        usar_lote: Optional[bool] = None,
+        barramento: Optional[BarramentoMensagens] = None,
+        exportador: Optional[ExportadorMetricas] = None,
+        publicador: Optional[PublicadorPolitica] = None,
     ) -> None:
         self.ambiente = ambiente
         self.agentes = agentes
@@ -32,14 +44,52 @@ class Simulator:
         self.modo_aprendizagem = modo_aprendizagem
         self.gamma_default = gamma_default
         self.logger = logger
+        self.gravador = gravador  # Opt-in: gravação compacta de trajetórias
+
+        # Modo avaliação: termina episódios presos num ciclo (política fixa)
+        self.detetar_ciclos = detetar_ciclos
+        self.ciclos: Dict[int, int] = {}  # episódio -> comprimento do ciclo detetado
+
+        # Passo em lote (observacoes_lote / agir_lote): por omissão é usado
+        # quando o ambiente tem uma implementação nativa e há vários agentes
+        # (com um só agente o caminho escalar tem menos overhead). No passo em
+        # lote as decisões são síncronas: todos decidem sobre o mesmo estado.
+        if usar_lote is None:
+            usar_lote = ambiente.suporta_lote() and len(agentes) > 1
+        self.usar_lote = usar_lote
+
+        # Comunicação entre agentes: mensagens entregues em lote antes de age()
+        self.barramento = barramento
+        if barramento is not None:
+            barramento.ligar(agentes, ambiente)
+
+        # Telemetria em tempo real (ficheiro Prometheus/JSON e endpoint HTTP)
+        self.exportador = exportador
+
+        # Partilha da política greedy em tempo real (ex: demo a acompanhar o treino)
+        self.publicador = publicador
 
     @classmethod
     def cria(cls, nome_ficheiro_parametros: str) -> "Simulator":
-        """Factory method para criação via ficheiro (não implementado)."""
-        raise NotImplementedError(
-            "Neste projeto o simulador é criado diretamente em código."
+        """
+        Factory method para criação via ficheiro de especificação (JSON/TOML).
+        Cria o ambiente (com a primeira seed), o agente e um simulador para a
+        primeira fase. Experiências com várias fases e seeds correm com
+        `Experiments.fila_experiencias`.
+        """
+        from .especificacao import (
+            aplicar_atributos, carregar_especificacao, criar_agente, criar_ambiente, parametros_fase,
         )
 
+        spec = carregar_especificacao(nome_ficheiro_parametros)
+        seeds = spec.get("seeds") or [None]
+        fase = (spec.get("fases") or [{}])[0]
+
+        ambiente = criar_ambiente(spec["ambiente"], seeds[0])
+        agente = criar_agente(spec["agente"], base=Agent)
+        aplicar_atributos(agente, fase)
+        return cls(ambiente, [agente], **parametros_fase(fase, spec.get("nome", "Experiencia")))
+
     def lista_agentes(self) -> List[Agent]:
         return self.agentes
 
@@ -54,18 +104,62 @@ class Simulator:
             stats = self._executa_episodio(ep)
             resultados.append(stats)
 
+            ciclo = self.ciclos.get(ep)
             print(
                 f"  Episódio {stats.episodio} terminou em {stats.passos} passos "
                 f"(recompensa total: {stats.recompensa_total:.2f})"
+                + (f" [ciclo de {ciclo} passos]" if ciclo else "")
             )
 
             if self.logger is not None:
                 self.logger.registar(stats)
+            if self.exportador is not None:
+                self.exportador.episodio(stats, self.agentes)
+            if self.publicador is not None:
+                self.publicador.episodio(self.agentes)
+
+        if self.gravador is not None:
+            self.gravador.descarregar()
 
         print(f"### {self.nome_experiencia} concluído. Total de {len(resultados)} episódios. ###")
         
         return resultados
 
+    def _detecao_ciclos_ativa(self) -> bool:
+        """
+        A deteção só é válida para um único agente com política determinística
+        (sem exploração) e sem aprendizagem, e quando não se está a gravar
+        trajetórias (que devem ficar completas).
+        """
+        return (
+            self.detetar_ciclos
+            and not self.modo_aprendizagem
+            and self.gravador is None
+            and self.barramento is None
+            and len(self.agentes) == 1
+            and getattr(self.agentes[0], "epsilon", 0.0) == 0.0
+        )
+
+    def _passo_lote_ativo(self) -> bool:
+        """
+        No passo em lote todos os agentes decidem antes de o ambiente aplicar
+        as ações; com vários agentes a gravação de trajetórias (posição após
+        cada ação) exige o caminho escalar.
+        """
+        return self.usar_lote and (self.gravador is None or len(self.agentes) == 1)
+
+    @staticmethod
+    def _chave_estado(agente: Agent) -> Hashable:
+        """Representação hashable do estado percebido pelo agente."""
+        obs: Any = agente._ultima_observacao
+        if hasattr(agente, "processar_estado"):
+            return agente.processar_estado(obs)
+        if isinstance(obs, Observacao):
+            return obs.valores()
+        if isinstance(obs, dict):
+            return tuple(sorted(obs.items()))
+        return obs
+
     def _executa_episodio(self, numero_episodio: int) -> EpisodioStats:
         self.ambiente.reset()
 
@@ -82,34 +176,111 @@ class Simulator:
         sucesso = 0
         terminou = False
 
+        # Deteção de ciclos: passo em que cada par (estado, ação) ocorreu e
+        # recompensa de cada passo executado
+        deteta_ciclos = self._detecao_ciclos_ativa()
+        visitados: Dict[Hashable, int] = {}
+        historico: List[float] = []
+
+        gravador = self.gravador
+        if gravador is not None:
+            gravador.inicio_episodio(self.nome_experiencia, numero_episodio, self.ambiente, self.agentes)
+
         for agente in self.agentes:
             obs = self.ambiente.observacaoPara(agente)
             agente.observacao(obs)
 
+        def fecha_ciclo(agente: Agent, accao: Any, passo: int) -> bool:
+            """
+            Se o par (estado, ação) já ocorreu, com política e ambiente
+            determinísticos o resto do episódio repete o ciclo: acumula as
+            recompensas restantes com as mesmas operações do ciclo normal
+            (estatísticas idênticas) e devolve True.
+            """
+            nonlocal recompensa_total, recompensa_descontada, fator
+            chave = (self._chave_estado(agente), accao)
+            inicio_ciclo = visitados.get(chave)
+            if inicio_ciclo is None:
+                visitados[chave] = len(historico)
+                return False
+            ciclo = historico[inicio_ciclo:]
+            for k in range(self.max_passos - passo + 1):
+                r = ciclo[k % len(ciclo)]
+                recompensa_total += r
+                recompensa_descontada += fator * r
+                fator *= gamma
+            self.ciclos[numero_episodio] = len(ciclo)
+            return True
+
+        def regista(indice: int, agente: Agent, accao: Any, recompensa: float, obs: Any) -> None:
+            nonlocal recompensa_total, recompensa_descontada, fator
+            if deteta_ciclos:
+                historico.append(recompensa)
+
+            if gravador is not None:
+                gravador.registar_passo(
+                    indice, accao, self.ambiente.posicao_agente(agente), recompensa
+                )
+
+            recompensa_total += recompensa
+            recompensa_descontada += fator * recompensa
+            fator *= gamma
+
+            agente.observacao(obs)
+
+            if self.modo_aprendizagem:
+                if hasattr(agente, "avaliacaoEstadoAtual"):
+                    agente.avaliacaoEstadoAtual(recompensa)
+                elif hasattr(agente, "avaliacao_estado_atual"):
+                    agente.avaliacao_estado_atual(recompensa)
+
+        lote = self._passo_lote_ativo()
+        barramento = self.barramento
+        if barramento is not None:
+            barramento.novo_episodio()
+
         for passo in range(1, self.max_passos + 1):
             passos = passo
 
-            for agente in self.agentes:
-                accao = agente.age()
-                recompensa, done, _info = self.ambiente.agir(accao, agente)
+            if barramento is not None:
+                barramento.entregar(passo)
 
-                recompensa_total += recompensa
-                recompensa_descontada += fator * recompensa
-                fator *= gamma
+            if lote:
+                # Todos os agentes decidem; o ambiente aplica as ações numa
+                # só chamada e devolve as observações no fim do passo
+                accoes = [agente.age() for agente in self.agentes]
 
-                obs = self.ambiente.observacaoPara(agente)
-                agente.observacao(obs)
+                if deteta_ciclos and fecha_ciclo(self.agentes[0], accoes[0], passo):
+                    passos = self.max_passos
+                    break  # termina como falha (sucesso = 0)
 
-                if self.modo_aprendizagem:
-                    if hasattr(agente, "avaliacaoEstadoAtual"):
-                        agente.avaliacaoEstadoAtual(recompensa)
-                    elif hasattr(agente, "avaliacao_estado_atual"):
-                        agente.avaliacao_estado_atual(recompensa)
+                recompensas, dones, _infos = self.ambiente.agir_lote(accoes, self.agentes)
+                executados = self.agentes[:len(recompensas)]
+                observacoes = self.ambiente.observacoes_lote(executados)
 
-                if done:
+                # O ambiente já aplicou todas as ações executadas: regista-as
+                # todas (recompensas finais incluídas) antes de terminar
+                for indice, agente in enumerate(executados):
+                    regista(indice, agente, accoes[indice], recompensas[indice], observacoes[indice])
+                if any(dones):
                     terminou = True
                     sucesso = 1
-                    break
+            else:
+                for indice, agente in enumerate(self.agentes):
+                    accao = agente.age()
+
+                    if deteta_ciclos and fecha_ciclo(agente, accao, passo):
+                        passos = self.max_passos
+                        terminou = True  # termina como falha (sucesso = 0)
+                        break
+
+                    recompensa, done, _info = self.ambiente.agir(accao, agente)
+                    regista(indice, agente, accao, recompensa, self.ambiente.observacaoPara(agente))
+
+                    if done:
+                        terminou = True
+                        sucesso = 1
+                        break
 
             if terminou:
                 break
@@ -121,6 +292,9 @@ class Simulator:
             if hasattr(agente, "fim_de_episodio"):
                 agente.fim_de_episodio()
 
+        if gravador is not None:
+            gravador.fim_episodio(sucesso)
+
         return EpisodioStats(
             experiencia=self.nome_experiencia,
             episodio=numero_episodio,
@@ -1,7 +1,11 @@
 from .env_farol import FarolEnvironment
+from .env_farol_lote import FarolEnvironmentLote
 from .env_labirinto import LabirintoEnvironment
+from .env_labirinto_multi import LabirintoEnvironmentMulti
 
 __all__ = [
     "FarolEnvironment",
+    "FarolEnvironmentLote",
     "LabirintoEnvironment",
+    "LabirintoEnvironmentMulti",
 ]
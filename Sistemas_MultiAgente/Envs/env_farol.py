@@ -1,37 +1,233 @@
 from __future__ import annotations
-from typing import Dict, Tuple
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from Core import Accao, Environment, Agent, ObservacaoFarol
+from Core.environment import SEM_INFO
+from Core.indice_espacial import ArvoreKD
+from Core.modelo_mdp import CODIGOS_MDP, DESLOCAMENTOS_MDP, PARADO, ModeloMDP
+
+# Distribuição de posições: posição fixa (x, y), lista de posições, "aleatorio"
+# (uniforme na grelha) ou função (rnd, N, quantidade) -> lista de posições
+Distribuicao = Union[Tuple[int, int], Sequence[Tuple[int, int]], str, Callable[..., Sequence[Tuple[int, int]]]]
+
+# Abaixo deste número de faróis a pesquisa linear é mais rápida do que a árvore
+LIMIAR_INDICE = 16
+
+# Tabelas de transição compiladas por omissão até este número de células
+LIMIAR_TABELAS = 4096
+
+# Máximo de elementos por bloco na pesquisa por força bruta (posições x faróis)
+_BLOCO = 1 << 20
+
+_MOVIMENTOS = {
+    Accao.CIMA: (0, -1),
+    Accao.BAIXO: (0, 1),
+    Accao.ESQUERDA: (-1, 0),
+    Accao.DIREITA: (1, 0),
+}
+
+# Resultados de `agir` pré-construídos (sem alocação por passo)
+_SUCESSO = (100.0, True, SEM_INFO)
+_PASSO = (-1.0, False, SEM_INFO)
+
+
+def amostrar_posicoes(
+    distribuicao: Distribuicao, rnd: random.Random, N: int, quantidade: int
+) -> List[Tuple[int, int]]:
+    """Gera `quantidade` posições na grelha N x N segundo a distribuição indicada."""
+    if callable(distribuicao):
+        return [(int(x), int(y)) for x, y in distribuicao(rnd, N, quantidade)]
+    if distribuicao == "aleatorio":
+        return [(rnd.randrange(N), rnd.randrange(N)) for _ in range(quantidade)]
+    if isinstance(distribuicao[0], (int, np.integer)):
+        return [(int(distribuicao[0]), int(distribuicao[1]))]
+    return [(int(x), int(y)) for x, y in distribuicao]
+
+
+def distribuicao_fixa(distribuicao: Distribuicao) -> bool:
+    """True se a distribuição dá sempre as mesmas posições (uma posição ou uma lista)."""
+    return not callable(distribuicao) and not isinstance(distribuicao, str)
+
+
+def usar_tabelas(tamanho: int, dist_farois: Distribuicao) -> bool:
+    """
+    Tabelas por omissão: grelha pequena e faróis fixos (compiladas uma vez).
+    Com faróis sorteados a cada reset, recompilar custa mais do que poupa.
+    """
+    return tamanho * tamanho <= LIMIAR_TABELAS and distribuicao_fixa(dist_farois)
+
+
+def mais_proximos_forca_bruta(posicoes: np.ndarray, farois: np.ndarray) -> np.ndarray:
+    """
+    Índice do farol mais próximo de cada posição (M,), vetorizado por blocos.
+    Em empate fica o primeiro farol, como em `min`.
+    """
+    resultado = np.empty(len(posicoes), dtype=np.int64)
+    passo = max(1, _BLOCO // len(farois))
+    for i in range(0, len(posicoes), passo):
+        bloco = posicoes[i:i + passo]
+        d2 = ((bloco[:, None, :] - farois[None, :, :]) ** 2).sum(axis=2)
+        resultado[i:i + passo] = np.argmin(d2, axis=1)
+    return resultado
+
+
+def compilar_modelo_farol(N: int, farois: np.ndarray) -> ModeloMDP:
+    """
+    Tabelas (N*N x 5) do Farol: movimento limitado à grelha, recompensa 100
+    e fim de episódio ao entrar numa célula com farol, -1 nas restantes.
+    """
+    xs, ys = ModeloMDP.coordenadas(N, N)
+    deslocamentos = np.array(DESLOCAMENTOS_MDP, dtype=np.int64)
+    nx = np.clip(xs[:, None] + deslocamentos[:, 0], 0, N - 1)
+    ny = np.clip(ys[:, None] + deslocamentos[:, 1], 0, N - 1)
+    proximo = ny * N + nx
+
+    e_farol = np.zeros(N * N, dtype=bool)
+    e_farol[farois[:, 1] * N + farois[:, 0]] = True
+    terminal = e_farol[proximo]
+    recompensa = np.where(terminal, 100.0, -1.0)
+    return ModeloMDP(N, N, proximo, recompensa, terminal)
 
-from Core import Accao, Environment, Agent
 
 class FarolEnvironment(Environment):
     """
     Ambiente Simples 2D (Grelha) para o problema do Farol.
     O objetivo é minimizar a distância ao ponto alvo (Farol) fixo.
+
+    Suporta grelhas arbitrariamente grandes (a grelha nunca é materializada),
+    distribuições configuráveis para o início e para os faróis, e vários
+    faróis: a observação é a distância ao farol mais próximo, obtida por uma
+    árvore k-d (O(log k)) quando há muitos faróis. Atingir qualquer farol
+    termina o episódio.
+
+    Com `tabelas` (por omissão, em grelhas até LIMIAR_TABELAS células com
+    faróis fixos) o ambiente compila um `ModeloMDP` e o farol mais próximo de
+    cada célula: `agir` passa a avançar por indexação, sem ramos nem pesquisa.
     """
 
-    def __init__(self, tamanho: int = 10) -> None:
+    def __init__(
+        self,
+        tamanho: int = 10,
+        num_farois: int = 1,
+        inicio: Distribuicao = (1, 1),
+        farois: Optional[Distribuicao] = None,
+        seed: int | None = None,
+        tabelas: Optional[bool] = None,
+    ) -> None:
+        super().__init__(nome="Farol")
         self.N = tamanho
+        self.num_farois = num_farois
+        self.dist_inicio = inicio
+        # Por omissão: um farol fixo em (N-2, N-2), ou vários aleatórios
+        if farois is None:
+            farois = (tamanho - 2, tamanho - 2) if num_farois == 1 else "aleatorio"
+        self.dist_farois = farois
+        self._rnd = random.Random(seed)
+
+        self.farois: List[Tuple[int, int]] = []
+        self._conjunto_farois: Set[Tuple[int, int]] = set()
+        self._indice: Optional[ArvoreKD] = None
+
+        # Tabelas compiladas (recompiladas quando os faróis mudam)
+        self.tabelas = usar_tabelas(tamanho, farois) if tabelas is None else tabelas
+        self.modelo: Optional[ModeloMDP] = None
+        self._t_proximo: Optional[List[int]] = None
+
+        # Um único corpo: a mesma observação (reescrita no lugar) para todos
+        self._obs = ObservacaoFarol()
         self.reset()
 
     def reset(self) -> None:
-        """Reinicia o agente e o farol nas posições padrão."""
-        self.x = 1
-        self.y = 1
-        self.farol_x = self.N - 2
-        self.farol_y = self.N - 2
+        """Reinicia o agente e o(s) farol(óis) segundo as distribuições configuradas."""
+        self.x, self.y = amostrar_posicoes(self.dist_inicio, self._rnd, self.N, 1)[0]
+
+        farois = amostrar_posicoes(self.dist_farois, self._rnd, self.N, self.num_farois)
+        if farois != self.farois:
+            self._definir_farois(farois)
+        self._atualizar_alvo()
+
+    def _definir_farois(self, farois: List[Tuple[int, int]]) -> None:
+        self.farois = farois
+        self._conjunto_farois = set(farois)
+        # Índice espacial apenas quando compensa
+        self._indice = ArvoreKD(np.array(farois)) if len(farois) > LIMIAR_INDICE else None
+        if self.tabelas:
+            self._compilar_tabelas()
+
+    def _compilar_tabelas(self) -> None:
+        N = self.N
+        self.modelo = modelo = compilar_modelo_farol(N, np.array(self.farois, dtype=np.int64))
 
-    def observacaoPara(self, agente: Agent) -> Dict:
+        # Farol mais próximo de cada célula, com o mesmo critério de farol_mais_proximo
+        celulas = np.stack([modelo.xs, modelo.ys], axis=1)
+        if self._indice is not None:
+            alvos = self._indice.mais_proximos(celulas)
+        else:
+            alvos = mais_proximos_forca_bruta(celulas, np.array(self.farois, dtype=np.int64))
+
+        # Listas planas para o passo escalar (indexar listas é mais rápido do que arrays)
+        self._t_proximo = modelo.proximo.ravel().tolist()
+        self._t_terminal = modelo.terminal.ravel().tolist()
+        self._t_xs = modelo.xs.tolist()
+        self._t_ys = modelo.ys.tolist()
+        self._t_alvo = [self.farois[i] for i in alvos.tolist()]
+
+    def modelo_mdp(self) -> ModeloMDP:
+        """Modelo explícito (tabelas de transição e recompensa) para planeamento."""
+        if self.modelo is None:
+            return compilar_modelo_farol(self.N, np.array(self.farois, dtype=np.int64))
+        return self.modelo
+
+    def farol_mais_proximo(self, x: int, y: int) -> Tuple[int, int]:
+        """Farol mais próximo (distância euclidiana) da posição (x, y)."""
+        if self._indice is not None:
+            i, _dist = self._indice.mais_proximo((x, y))
+            return self.farois[i]
+        if len(self.farois) == 1:
+            return self.farois[0]
+        return min(self.farois, key=lambda f: (f[0] - x) ** 2 + (f[1] - y) ** 2)
+
+    def _atualizar_alvo(self) -> None:
+        # farol_x / farol_y guardam sempre o farol mais próximo do agente
+        if self._t_proximo is not None:
+            self.farol_x, self.farol_y = self._t_alvo[self.y * self.N + self.x]
+        else:
+            self.farol_x, self.farol_y = self.farol_mais_proximo(self.x, self.y)
+
+    def observacaoPara(self, agente: Agent) -> ObservacaoFarol:
         """
-        Retorna o vetor de distância relativa (dx, dy) como perceção.
+        Retorna o vetor de distância relativa (dx, dy) ao farol mais próximo
+        (e as coordenadas absolutas), reescrito no mesmo objeto a cada passo.
         """
-        dx = self.farol_x - self.x
-        dy = self.farol_y - self.y
-        return {"dx": dx, "dy": dy}
+        obs = self._obs
+        obs.x = x = self.x
+        obs.y = y = self.y
+        obs.farol_x = fx = self.farol_x
+        obs.farol_y = fy = self.farol_y
+        obs.dx = fx - x
+        obs.dy = fy - y
+        obs.N = self.N
+        return obs
 
     def agir(self, accao: Accao, agente: Agent) -> Tuple[float, bool, Dict]:
         """
         Executa o movimento, garante limites da grelha e retorna recompensa.
         """
+        if self._t_proximo is not None:
+            # Tabelas compiladas: (célula, ação) -> próxima célula / fim
+            i = (self.y * self.N + self.x) * 5 + CODIGOS_MDP.get(accao.direcao, PARADO)
+            s = self._t_proximo[i]
+            self.x = self._t_xs[s]
+            self.y = self._t_ys[s]
+            if self._t_terminal[i]:
+                self.farol_x, self.farol_y = self.x, self.y
+                return _SUCESSO
+            self.farol_x, self.farol_y = self._t_alvo[s]
+            return _PASSO
+
         # Movimento
         if accao.direcao == Accao.CIMA:
             self.y -= 1
@@ -47,10 +243,84 @@ class FarolEnvironment(Environment):
         self.y = max(0, min(self.N - 1, self.y))
 
         # Recompensas
-        if self.x == self.farol_x and self.y == self.farol_y:
-            return 100.0, True, {}  # Sucesso
+        if (self.x, self.y) in self._conjunto_farois:
+            self.farol_x, self.farol_y = self.x, self.y
+            return _SUCESSO
         
-        return -1.0, False, {}  # Custo de passo
+        self._atualizar_alvo()
+        return _PASSO  # Custo de passo
+
+    def observacoes_lote(self, agentes: Sequence[Agent]) -> List[ObservacaoFarol]:
+        """Um único corpo: todos os agentes observam o mesmo vetor (dx, dy)."""
+        return [self.observacaoPara(None)] * len(agentes)
+
+    def agir_lote(
+        self, accoes: Sequence[Accao], agentes: Sequence[Agent]
+    ) -> Tuple[List[float], List[bool], List[Dict]]:
+        """
+        Aplica os movimentos em sequência sobre variáveis locais e só procura
+        o farol mais próximo uma vez, no fim do lote.
+        """
+        if self._t_proximo is not None:
+            return self._agir_lote_tabelas(accoes)
+
+        x, y = self.x, self.y
+        limite = self.N - 1
+        farois = self._conjunto_farois
+        recompensas: List[float] = []
+        terminou: List[bool] = []
+
+        for accao in accoes:
+            dx, dy = _MOVIMENTOS.get(accao.direcao, (0, 0))
+            x = max(0, min(limite, x + dx))
+            y = max(0, min(limite, y + dy))
+            chegou = (x, y) in farois
+            recompensas.append(100.0 if chegou else -1.0)
+            terminou.append(chegou)
+            if chegou:
+                break
+
+        self.x, self.y = x, y
+        if terminou and terminou[-1]:
+            self.farol_x, self.farol_y = x, y
+        else:
+            self._atualizar_alvo()
+        return recompensas, terminou, [SEM_INFO] * len(recompensas)
+
+    def _agir_lote_tabelas(self, accoes: Sequence[Accao]) -> Tuple[List[float], List[bool], List[Dict]]:
+        proximo, terminal = self._t_proximo, self._t_terminal
+        s = self.y * self.N + self.x
+        recompensas: List[float] = []
+        terminou: List[bool] = []
+
+        for accao in accoes:
+            i = s * 5 + CODIGOS_MDP.get(accao.direcao, PARADO)
+            s = proximo[i]
+            chegou = terminal[i]
+            recompensas.append(100.0 if chegou else -1.0)
+            terminou.append(chegou)
+            if chegou:
+                break
+
+        self.x, self.y = self._t_xs[s], self._t_ys[s]
+        if terminou and terminou[-1]:
+            self.farol_x, self.farol_y = self.x, self.y
+        else:
+            self.farol_x, self.farol_y = self._t_alvo[s]
+        return recompensas, terminou, [SEM_INFO] * len(recompensas)
+
+    def posicao_agente(self, agente: Agent) -> Tuple[int, int]:
+        return self.x, self.y
+
+    def posicao_alvo(self) -> Tuple[int, int]:
+        return self.farol_x, self.farol_y
+
+    def definir_estado(self, posicao: Tuple[int, int], alvo: Tuple[int, int]) -> None:
+        """Posiciona o agente; com um único farol, o alvo passa a ser esse farol."""
+        self.x, self.y = posicao
+        if self.num_farois == 1 and [tuple(alvo)] != self.farois:
+            self._definir_farois([tuple(alvo)])
+        self._atualizar_alvo()
 
     def atualizacao(self) -> None:
         pass
\ No newline at end of file
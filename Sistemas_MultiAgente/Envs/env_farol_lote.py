@@ -0,0 +1,250 @@
+from __future__ import annotations
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Core import Accao, Environment, ObservacaoFarol
+from Core.environment import SEM_INFO
+from Core.indice_espacial import ArvoreKD
+from Core.modelo_mdp import CODIGOS_MDP as _CODIGOS, DESLOCAMENTOS_MDP, PARADO, ModeloMDP
+from .env_farol import (
+    Distribuicao, amostrar_posicoes, compilar_modelo_farol, mais_proximos_forca_bruta, usar_tabelas,
+)
+
+# Deslocamento (dx, dy) por código de ação (ordem de Accao.DIRECOES); o último
+# código corresponde a "sem movimento"
+DESLOCAMENTOS = np.array(DESLOCAMENTOS_MDP, dtype=np.int64)
+
+# Vetorizada, a força bruta compensa até muitos mais faróis do que no
+# ambiente escalar: a árvore k-d responde a uma consulta de cada vez
+LIMIAR_INDICE_LOTE = 1024
+
+
+class FarolEnvironmentLote(Environment):
+    """
+    Variante vetorizada do Farol: M agentes independentes, cada um com o seu
+    corpo, avançam todos de uma vez com operações NumPy.
+
+    Os faróis (e as distribuições de início/faróis) seguem as mesmas regras do
+    `FarolEnvironment`. Um agente que atinge um farol fica terminado até ao
+    próximo `reset` (as suas ações seguintes são ignoradas, recompensa 0).
+
+    Com `tabelas` (por omissão, em grelhas até LIMIAR_TABELAS células com
+    faróis fixos) o `ModeloMDP` dos faróis e o farol mais próximo de cada
+    célula são compilados (de novo só quando os faróis mudam): `passo`
+    reduz-se a indexações, sem pesquisa por agente.
+    """
+
+    def __init__(
+        self,
+        num_agentes: int,
+        tamanho: int = 10,
+        num_farois: int = 1,
+        inicio: Distribuicao = (1, 1),
+        farois: Optional[Distribuicao] = None,
+        seed: int | None = None,
+        tabelas: Optional[bool] = None,
+    ) -> None:
+        super().__init__(nome="Farol_Lote")
+        self.M = num_agentes
+        self.N = tamanho
+        self.num_farois = num_farois
+        self.dist_inicio = inicio
+        if farois is None:
+            farois = (tamanho - 2, tamanho - 2) if num_farois == 1 else "aleatorio"
+        self.dist_farois = farois
+        self._rnd = random.Random(seed)
+        self.tabelas = usar_tabelas(tamanho, farois) if tabelas is None else tabelas
+        self.modelo: Optional[ModeloMDP] = None
+        self.farois = np.empty((0, 2), dtype=np.int64)
+
+        # agente.id -> linha nos arrays (atribuída na primeira utilização)
+        self._linhas: Dict[Any, int] = {}
+        # Observação reutilizável por linha (reescrita no lugar)
+        self._obs = [ObservacaoFarol(N=tamanho) for _ in range(num_agentes)]
+        self.reset()
+
+    def reset(self) -> None:
+        inicios = amostrar_posicoes(self.dist_inicio, self._rnd, self.N, self.M)
+        if len(inicios) == 1:
+            inicios = inicios * self.M  # início fixo comum
+        elif len(inicios) != self.M:
+            raise ValueError(
+                f"Distribuição de início com {len(inicios)} posições: "
+                f"esperava 1 (comum) ou {self.M} (uma por agente)."
+            )
+        self.posicoes = np.array(inicios, dtype=np.int64)           # (M, 2)
+        self.terminados = np.zeros(self.M, dtype=bool)
+
+        farois = np.array(
+            amostrar_posicoes(self.dist_farois, self._rnd, self.N, self.num_farois), dtype=np.int64
+        )                                                            # (k, 2)
+        if not np.array_equal(farois, self.farois):
+            self._definir_farois(farois)
+        self._atualizar_alvos()
+
+    def _definir_farois(self, farois: np.ndarray) -> None:
+        self.farois = farois
+        self._codigos_farois = set((self.farois[:, 0] * self.N + self.farois[:, 1]).tolist())
+        self._chave_farois = np.array(sorted(self._codigos_farois), dtype=np.int64)
+        self._indice = ArvoreKD(self.farois) if len(self.farois) > LIMIAR_INDICE_LOTE else None
+        if self.tabelas:
+            self.modelo = compilar_modelo_farol(self.N, self.farois)
+            celulas = np.stack([self.modelo.xs, self.modelo.ys], axis=1)
+            self._alvo_celula = self.mais_proximos(celulas)  # (N*N,) índice do farol
+
+    def modelo_mdp(self) -> ModeloMDP:
+        """Modelo explícito (tabelas de transição e recompensa) dos faróis atuais."""
+        if self.modelo is None:
+            return compilar_modelo_farol(self.N, self.farois)
+        return self.modelo
+
+    # Núcleo vetorizado
+
+    def mais_proximos(self, posicoes: np.ndarray) -> np.ndarray:
+        """Índice do farol mais próximo de cada posição (M,)."""
+        if self._indice is not None:
+            return self._indice.mais_proximos(posicoes)
+        # Poucos faróis: força bruta vetorizada, por blocos de agentes
+        return mais_proximos_forca_bruta(posicoes, self.farois)
+
+    def _atualizar_alvos(self) -> None:
+        if self.modelo is not None:
+            celulas = self.posicoes[:, 1] * self.N + self.posicoes[:, 0]
+            self.alvos = self.farois[self._alvo_celula[celulas]]  # (M, 2)
+        else:
+            self.alvos = self.farois[self.mais_proximos(self.posicoes)]  # (M, 2)
+
+    def observacoes(self) -> np.ndarray:
+        """Matriz (M, 2) com (dx, dy) de cada agente ao farol mais próximo."""
+        return self.alvos - self.posicoes
+
+    def passo(self, codigos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aplica um código de ação (Accao.DIRECOES, ou 4 = parado) a cada agente.
+
+        Returns:
+            (recompensas (M,), terminou (M,)) - `terminou` é cumulativo no episódio.
+        """
+        if self.modelo is not None:
+            return self._passo_tabelas(codigos)
+
+        ativos = ~self.terminados
+        desloc = DESLOCAMENTOS[np.asarray(codigos, dtype=np.int64)]
+        novas = np.clip(self.posicoes + desloc * ativos[:, None], 0, self.N - 1)
+        self.posicoes = novas
+
+        chegou = ativos & np.isin(novas[:, 0] * self.N + novas[:, 1], self._chave_farois)
+        recompensas = np.where(ativos, -1.0, 0.0)
+        recompensas[chegou] = 100.0
+        self.terminados |= chegou
+
+        # Só os agentes que continuam ativos precisam de novo alvo
+        continuar = np.flatnonzero(~self.terminados)
+        if len(continuar):
+            self.alvos[continuar] = self.farois[self.mais_proximos(novas[continuar])]
+        self.alvos[chegou] = novas[chegou]
+        return recompensas, self.terminados.copy()
+
+    def _passo_tabelas(self, codigos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Agentes terminados ficam parados, com recompensa 0
+        ativos = ~self.terminados
+        codigos = np.where(ativos, codigos, PARADO)
+        modelo = self.modelo
+        s = self.posicoes[:, 1] * self.N + self.posicoes[:, 0]
+        s2, recompensas, chegou = modelo.passo_lote(s, codigos)
+        chegou = chegou & ativos
+
+        self.posicoes = np.stack([modelo.xs[s2], modelo.ys[s2]], axis=1)
+        recompensas = np.where(ativos, recompensas, 0.0)
+        self.terminados |= chegou
+        self.alvos = self.farois[self._alvo_celula[s2]]
+        self.alvos[chegou] = self.posicoes[chegou]
+        return recompensas, self.terminados.copy()
+
+    # Interface Environment (um agente de cada vez)
+
+    def _linha(self, agente: Any) -> int:
+        chave = getattr(agente, "id", agente)
+        linha = self._linhas.get(chave)
+        if linha is None:
+            if len(self._linhas) >= self.M:
+                raise ValueError(f"Mais agentes do que os {self.M} configurados.")
+            linha = self._linhas[chave] = len(self._linhas)
+        return linha
+
+    def _escrever_observacao(self, i: int, x: int, y: int, fx: int, fy: int) -> ObservacaoFarol:
+        obs = self._obs[i]
+        obs.x, obs.y, obs.farol_x, obs.farol_y = x, y, fx, fy
+        obs.dx = fx - x
+        obs.dy = fy - y
+        return obs
+
+    def observacaoPara(self, agente: Any) -> ObservacaoFarol:
+        i = self._linha(agente)
+        x, y = self.posicoes[i].tolist()
+        fx, fy = self.alvos[i].tolist()
+        return self._escrever_observacao(i, x, y, fx, fy)
+
+    def agir(self, accao: Accao, agente: Any) -> Tuple[float, bool, Dict]:
+        i = self._linha(agente)
+        if self.terminados[i]:
+            return 0.0, True, SEM_INFO
+
+        codigo = _CODIGOS.get(accao.direcao, PARADO)
+        if self.modelo is not None:
+            s = int(self.posicoes[i, 1]) * self.N + int(self.posicoes[i, 0])
+            s2 = int(self.modelo.proximo[s, codigo])
+            x, y = s2 % self.N, s2 // self.N
+            self.posicoes[i] = (x, y)
+            if self.modelo.terminal[s, codigo]:
+                self.terminados[i] = True
+                self.alvos[i] = (x, y)
+                return 100.0, True, SEM_INFO
+            self.alvos[i] = self.farois[self._alvo_celula[s2]]
+            return -1.0, False, SEM_INFO
+
+        dx, dy = DESLOCAMENTOS[codigo]
+        x = min(self.N - 1, max(0, int(self.posicoes[i, 0] + dx)))
+        y = min(self.N - 1, max(0, int(self.posicoes[i, 1] + dy)))
+        self.posicoes[i] = (x, y)
+
+        if x * self.N + y in self._codigos_farois:
+            self.terminados[i] = True
+            self.alvos[i] = (x, y)
+            return 100.0, True, SEM_INFO
+
+        self.alvos[i] = self.farois[self.mais_proximos(self.posicoes[i:i + 1])[0]]
+        return -1.0, False, SEM_INFO
+
+    def observacoes_lote(self, agentes: Sequence[Any]) -> List[ObservacaoFarol]:
+        linhas = [self._linha(agente) for agente in agentes]
+        posicoes = self.posicoes[linhas].tolist()
+        alvos = self.alvos[linhas].tolist()
+        return [
+            self._escrever_observacao(i, x, y, fx, fy)
+            for i, (x, y), (fx, fy) in zip(linhas, posicoes, alvos)
+        ]
+
+    def agir_lote(
+        self, accoes: Sequence[Accao], agentes: Sequence[Any]
+    ) -> Tuple[List[float], List[bool], List[Dict]]:
+        """
+        Movimento simultâneo com `passo` (cada agente tem o seu corpo, a ordem
+        é irrelevante): as listas devolvidas têm sempre uma entrada por agente.
+        Agentes não incluídos em `agentes` ficam parados.
+        """
+        linhas = [self._linha(agente) for agente in agentes]
+        codigos = np.full(self.M, PARADO, dtype=np.int64)
+        codigos[linhas] = [_CODIGOS.get(accao.direcao, PARADO) for accao in accoes]
+
+        recompensas, terminou = self.passo(codigos)
+        return recompensas[linhas].tolist(), terminou[linhas].tolist(), [SEM_INFO] * len(linhas)
+
+    def posicao_agente(self, agente: Any) -> Tuple[int, int]:
+        x, y = self.posicoes[self._linha(agente)].tolist()
+        return x, y
+
+    def atualizacao(self) -> None:
+        pass
@@ -1,17 +1,75 @@
 from __future__ import annotations
-from typing import Tuple, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from Core import Environment, Accao
+from Core.environment import SEM_INFO
+from Core.modelo_mdp import CODIGOS_MDP, DESLOCAMENTOS_MDP, PARADO, ModeloMDP
 from .mapa_labirinto import MapaLabirinto
 
+_MOVIMENTOS = {
+    Accao.CIMA: (0, -1),
+    Accao.BAIXO: (0, 1),
+    Accao.ESQUERDA: (-1, 0),
+    Accao.DIREITA: (1, 0),
+}
+
+# Resultados de `agir` pré-construídos (sem alocação por passo)
+_INVALIDA = (-10.0, False, SEM_INFO)
+_PAREDE = (-5.0, False, SEM_INFO)
+_SUCESSO = (100.0, True, SEM_INFO)
+_PASSO = (-1.0, False, SEM_INFO)
+
+
+def compilar_modelo_labirinto(mapa: MapaLabirinto, saida: Optional[Tuple[int, int]] = None) -> ModeloMDP:
+    """
+    Tabelas (células x 5) do labirinto: parede ou fora do mapa -> fica, -5;
+    movimento válido -> -1; sem direção -> fica, -10. Com `saida`, entrar
+    nessa célula vale 100 e termina o episódio.
+    """
+    largura, altura = mapa.largura, mapa.altura
+    xs, ys = ModeloMDP.coordenadas(largura, altura)
+    deslocamentos = np.array(DESLOCAMENTOS_MDP, dtype=np.int64)
+    nx = xs[:, None] + deslocamentos[:, 0]
+    ny = ys[:, None] + deslocamentos[:, 1]
+
+    paredes = np.array(mapa.grelha, dtype=bool)
+    dentro = (nx >= 0) & (nx < largura) & (ny >= 0) & (ny < altura)
+    valido = dentro & ~paredes[np.clip(ny, 0, altura - 1), np.clip(nx, 0, largura - 1)]
+    valido[:, PARADO] = False
+
+    proximo = np.where(valido, ny * largura + nx, np.arange(largura * altura)[:, None])
+    recompensa = np.where(valido, -1.0, -5.0)
+    recompensa[:, PARADO] = -10.0
+    terminal = np.zeros_like(valido)
+    if saida is not None:
+        terminal = valido & (proximo == saida[1] * largura + saida[0])
+        recompensa[terminal] = 100.0
+    return ModeloMDP(largura, altura, proximo, recompensa, terminal)
+
+
 class LabirintoEnvironment(Environment):
     """
     Ambiente complexo de Labirinto com obstáculos.
+
+    Com `tabelas`, as transições (independentes da saída) são compiladas uma
+    vez a partir do mapa e `agir` avança por indexação; só a chegada à saída
+    é verificada a cada passo.
     """
 
-    def __init__(self):
+    def __init__(self, seed: int | None = None, tabelas: bool = True):
         super().__init__(nome="Labirinto")
-        self.map = MapaLabirinto()
+        self.map = MapaLabirinto(seed)
+        self.tabelas = tabelas
+        if tabelas:
+            modelo = compilar_modelo_labirinto(self.map)
+            self._t_proximo = modelo.proximo.ravel().tolist()
+            self._t_xs = modelo.xs.tolist()
+            self._t_ys = modelo.ys.tolist()
+            # Resultado pré-construído de cada (célula, ação) que não chega à saída
+            resultados = {-1.0: _PASSO, -5.0: _PAREDE, -10.0: _INVALIDA}
+            self._t_resultado = [resultados[r] for r in modelo.recompensa.ravel().tolist()]
         self.reset()
 
     def reset(self) -> None:
@@ -30,23 +88,26 @@ class LabirintoEnvironment(Environment):
         """
         Processa movimento, colisões com paredes e verifica vitória.
         """
-        mapeamento = {
-            Accao.CIMA: (0, -1),
-            Accao.BAIXO: (0, 1),
-            Accao.ESQUERDA: (-1, 0),
-            Accao.DIREITA: (1, 0),
-        }
+        if self.tabelas:
+            i = (self.agent_y * self.map.largura + self.agent_x) * 5 + CODIGOS_MDP.get(accao.direcao, PARADO)
+            resultado = self._t_resultado[i]
+            if resultado is not _PASSO:
+                return resultado
+            s = self._t_proximo[i]
+            self.agent_x = nx = self._t_xs[s]
+            self.agent_y = ny = self._t_ys[s]
+            return _SUCESSO if self.map.is_saida(nx, ny) else _PASSO
 
-        if accao.direcao not in mapeamento:
-            return -10.0, False, {}
+        if accao.direcao not in _MOVIMENTOS:
+            return _INVALIDA
 
-        dx, dy = mapeamento[accao.direcao]
+        dx, dy = _MOVIMENTOS[accao.direcao]
         nx = self.agent_x + dx
         ny = self.agent_y + dy
 
         # 1. Colisão com Parede
         if self.map.is_parede(nx, ny):
-            return -5.0, False, {}
+            return _PAREDE
 
         # 2. Movimento Válido
         self.agent_x = nx
@@ -54,10 +115,90 @@ class LabirintoEnvironment(Environment):
 
         # 3. Sucesso
         if self.map.is_saida(nx, ny):
-            return 100.0, True, {}
+            return _SUCESSO
 
         # 4. Passo Normal
-        return -1.0, False, {}
+        return _PASSO
+
+    def observacoes_lote(self, agentes: Sequence[Any]) -> List[Tuple[int, int, int, int]]:
+        """Estado global: o mesmo tuplo (imutável) para todos os agentes."""
+        obs = (self.agent_x, self.agent_y, self.saida_x, self.saida_y)
+        return [obs] * len(agentes)
+
+    def agir_lote(
+        self, accoes: Sequence[Accao], agentes: Sequence[Any]
+    ) -> Tuple[List[float], List[bool], List[Dict]]:
+        """
+        Aplica as ações em sequência sobre variáveis locais, com as mesmas
+        regras de `agir`, e escreve a posição final no ambiente uma só vez.
+        """
+        x, y = self.agent_x, self.agent_y
+        is_parede = self.map.is_parede
+        is_saida = self.map.is_saida
+        recompensas: List[float] = []
+        terminou: List[bool] = []
+
+        if self.tabelas:
+            largura = self.map.largura
+            proximo, resultados = self._t_proximo, self._t_resultado
+            s = y * largura + x
+            for accao in accoes:
+                i = s * 5 + CODIGOS_MDP.get(accao.direcao, PARADO)
+                resultado = resultados[i]
+                if resultado is _PASSO:
+                    s = proximo[i]
+                    if is_saida(s % largura, s // largura):
+                        resultado = _SUCESSO
+                recompensas.append(resultado[0])
+                terminou.append(resultado[1])
+                if resultado is _SUCESSO:
+                    break
+            self.agent_x, self.agent_y = s % largura, s // largura
+            return recompensas, terminou, [SEM_INFO] * len(recompensas)
+
+        for accao in accoes:
+            movimento = _MOVIMENTOS.get(accao.direcao)
+            if movimento is None:
+                recompensas.append(-10.0)
+                terminou.append(False)
+                continue
+
+            nx, ny = x + movimento[0], y + movimento[1]
+            if is_parede(nx, ny):
+                recompensas.append(-5.0)
+                terminou.append(False)
+                continue
+
+            x, y = nx, ny
+            if is_saida(x, y):
+                recompensas.append(100.0)
+                terminou.append(True)
+                break
+
+            recompensas.append(-1.0)
+            terminou.append(False)
+
+        self.agent_x, self.agent_y = x, y
+        return recompensas, terminou, [SEM_INFO] * len(recompensas)
+
+    def modelo_mdp(self, saida: Optional[Tuple[int, int]] = None) -> ModeloMDP:
+        """
+        Modelo explícito para planeamento, com a saída indicada (por omissão,
+        a do episódio atual) como estado terminal.
+        """
+        return compilar_modelo_labirinto(self.map, saida or (self.saida_x, self.saida_y))
+
+    def posicao_agente(self, agente) -> Tuple[int, int]:
+        return self.agent_x, self.agent_y
+
+    def posicao_alvo(self) -> Tuple[int, int]:
+        return self.saida_x, self.saida_y
+
+    def definir_estado(self, posicao: Tuple[int, int], alvo: Tuple[int, int]) -> None:
+        """Coloca o agente e a saída em posições arbitrárias (ex: replay)."""
+        self.agent_x, self.agent_y = posicao
+        self.saida_x, self.saida_y = alvo
+        self.map.definir_saida_fixa(*alvo)
 
     def atualizacao(self) -> None:
         pass
\ No newline at end of file
@@ -0,0 +1,253 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Core import Accao, Environment
+from Core.environment import SEM_INFO
+from Core.modelo_mdp import CODIGOS_MDP, PARADO
+from .env_labirinto import compilar_modelo_labirinto
+from .mapa_labirinto import MapaLabirinto
+
+# Resolução de movimentos simultâneos para a mesma célula:
+#   - "prioridade": entra o agente com menor índice (linha)
+#   - "aleatorio": entra um dos agentes, sorteado a cada passo
+#   - "bloquear": nenhum entra
+CONFLITOS = ("prioridade", "aleatorio", "bloquear")
+
+
+class LabirintoEnvironmentMulti(Environment):
+    """
+    Labirinto com M agentes, cada um com o seu corpo e a sua saída.
+
+    As posições ficam num array (uma célula `y * largura + x` por agente,
+    linha atribuída por `agente.id`) e uma grelha de ocupação (célula ->
+    agente, -1 se livre) torna a verificação de colisões O(1). Duas regras
+    de colisão: um agente não entra numa célula ocupada por quem fica parado
+    e dois agentes não trocam de célula (choque frontal); ambos os casos
+    valem `recompensa_colisao`, como uma parede. As cadeias (entrar na
+    célula de quem sai no mesmo passo) e as rotações são permitidas.
+
+    Um agente que atinge a sua saída (`saidas="individuais"`) ou a saída
+    comum (`saidas="comum"`) recebe 100 e sai do labirinto (deixa de ocupar
+    células); as suas ações seguintes são ignoradas com recompensa 0. Para
+    o Simulator o episódio termina quando todos os agentes saíram.
+
+    `passo` aplica um código de ação por agente de forma vetorizada
+    (milhares de agentes por passo); `agir` move um agente de cada vez e
+    `agir_lote` usa `passo` (movimento simultâneo). As transições vêm das
+    tabelas compiladas do mapa (`compilar_modelo_labirinto`).
+    """
+
+    def __init__(
+        self,
+        num_agentes: int,
+        seed: int | None = None,
+        mapa: Optional[MapaLabirinto] = None,
+        conflitos: str = "prioridade",
+        saidas: str = "individuais",
+        recompensa_colisao: float = -5.0,
+    ) -> None:
+        super().__init__(nome="Labirinto_Multi")
+        if conflitos not in CONFLITOS:
+            raise ValueError(f"Resolução de conflitos desconhecida: {conflitos!r} (opções: {CONFLITOS}).")
+        if saidas not in ("individuais", "comum"):
+            raise ValueError(f"Modo de saídas desconhecido: {saidas!r}.")
+
+        self.map = mapa if mapa is not None else MapaLabirinto(seed)
+        self.M = num_agentes
+        self.conflitos = conflitos
+        self.modo_saidas = saidas
+        self.recompensa_colisao = recompensa_colisao
+
+        m = self.map
+        self.largura = m.largura
+        # Só a componente ligada a (1, 1): uma célula isolada nunca chegaria à saída
+        self._livres = np.array([y * m.largura + x for x, y in m.celulas_ligadas(1, 1)], dtype=np.int64)
+        vagas = len(self._livres) - (saidas == "comum")
+        if num_agentes > vagas:
+            raise ValueError(f"{num_agentes} agentes não cabem nas {vagas} células livres do mapa.")
+
+        modelo = compilar_modelo_labirinto(m)
+        self._proximo = modelo.proximo
+        self._recompensa = modelo.recompensa
+        self._rng = np.random.default_rng(seed)
+
+        # agente.id -> linha nos arrays (atribuída na primeira utilização)
+        self._linhas: Dict[Any, int] = {}
+        self.ocupacao = np.full(m.largura * m.altura, -1, dtype=np.int64)
+        self.reset()
+
+    def reset(self) -> None:
+        """Inícios distintos em células livres e uma saída por agente (ou comum)."""
+        n = len(self._livres)
+        escolha = self._rng.choice(n, size=self.M, replace=False)
+        self.celulas = self._livres[escolha]  # (M,)
+
+        if self.modo_saidas == "comum":
+            livres = np.setdiff1d(np.arange(n), escolha)
+            self.saidas = np.full(self.M, self._livres[self._rng.choice(livres)], dtype=np.int64)
+        else:
+            # Célula livre diferente do início de cada agente
+            outra = self._rng.integers(0, n - 1, size=self.M)
+            outra += outra >= escolha
+            self.saidas = self._livres[outra]
+
+        self.ocupacao.fill(-1)
+        self.ocupacao[self.celulas] = np.arange(self.M)
+        self.terminados = np.zeros(self.M, dtype=bool)
+        self._restantes = self.M
+
+    # Núcleo vetorizado
+
+    def _resolver(self, s: np.ndarray, alvo: np.ndarray, quer: np.ndarray) -> np.ndarray:
+        """
+        Agentes que efetivamente se movem, de entre os que `quer`em mudar de
+        célula. Os bloqueados passam a estar parados, o que pode bloquear
+        outros (cadeias): repete até estabilizar. Um perdedor de um conflito
+        fica parado mesmo que o vencedor acabe bloqueado mais à frente.
+        """
+        if self.conflitos == "aleatorio":
+            prioridade = self._rng.permutation(self.M)
+        else:
+            prioridade = np.arange(self.M)
+
+        move = quer.copy()
+        while True:
+            idx = np.flatnonzero(move)
+            if not len(idx):
+                return move
+            destino = alvo[idx]
+            ocupante = self.ocupacao[destino]
+            livre = ocupante < 0
+            ocupante = np.where(livre, 0, ocupante)
+
+            # Ocupante que sai no mesmo passo, sem ser uma troca de células
+            sai = ~livre & move[ocupante] & (alvo[ocupante] != s[idx])
+            candidatos = idx[livre | sai]
+            destino = alvo[candidatos]
+
+            # Vários candidatos para a mesma célula
+            if self.conflitos == "bloquear":
+                _u, inverso, contagem = np.unique(destino, return_inverse=True, return_counts=True)
+                vencedores = candidatos[contagem[inverso] == 1]
+            else:
+                ordem = np.lexsort((prioridade[candidatos], destino))
+                primeiro = np.ones(len(ordem), dtype=bool)
+                primeiro[1:] = destino[ordem[1:]] != destino[ordem[:-1]]
+                vencedores = candidatos[ordem[primeiro]]
+
+            if len(vencedores) == len(idx):
+                return move
+            move = np.zeros(self.M, dtype=bool)
+            move[vencedores] = True
+
+    def passo(self, codigos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aplica um código de ação (Accao.DIRECOES, ou 4 = parado) a cada agente,
+        com movimento simultâneo.
+
+        Returns:
+            (recompensas (M,), saiu (M,)) - `saiu` é cumulativo no episódio.
+        """
+        ativos = ~self.terminados
+        codigos = np.where(ativos, np.asarray(codigos, dtype=np.int64), PARADO)
+        s = self.celulas
+        alvo = self._proximo[s, codigos]
+        recompensas = self._recompensa[s, codigos]
+
+        quer = alvo != s
+        move = self._resolver(s, alvo, quer)
+        recompensas[quer & ~move] = self.recompensa_colisao
+
+        # Liberta primeiro todas as células de origem (cadeias e rotações)
+        linhas = np.flatnonzero(move)
+        self.ocupacao[s[linhas]] = -1
+        self.ocupacao[alvo[linhas]] = linhas
+        self.celulas = np.where(move, alvo, s)
+
+        chegou = move & (self.celulas == self.saidas)
+        recompensas[chegou] = 100.0
+        recompensas[~ativos] = 0.0
+        self.terminados |= chegou
+        self.ocupacao[self.celulas[chegou]] = -1  # sai do labirinto
+        self._restantes -= int(chegou.sum())
+        return recompensas, self.terminados.copy()
+
+    # Interface Environment (um agente de cada vez)
+
+    def _linha(self, agente: Any) -> int:
+        chave = getattr(agente, "id", agente)
+        linha = self._linhas.get(chave)
+        if linha is None:
+            if len(self._linhas) >= self.M:
+                raise ValueError(f"Mais agentes do que os {self.M} configurados.")
+            linha = self._linhas[chave] = len(self._linhas)
+        return linha
+
+    def observacaoPara(self, agente: Any) -> Tuple[int, int, int, int]:
+        """(x, y, sx, sy): posição do agente e da sua saída, como no `LabirintoEnvironment`."""
+        i = self._linha(agente)
+        s, saida = int(self.celulas[i]), int(self.saidas[i])
+        w = self.largura
+        return (s % w, s // w, saida % w, saida // w)
+
+    def agir(self, accao: Accao, agente: Any) -> Tuple[float, bool, Dict]:
+        i = self._linha(agente)
+        if self.terminados[i]:
+            return 0.0, self._restantes == 0, SEM_INFO
+
+        s = int(self.celulas[i])
+        codigo = CODIGOS_MDP.get(accao.direcao, PARADO)
+        alvo = int(self._proximo[s, codigo])
+        if alvo == s:
+            return float(self._recompensa[s, codigo]), False, SEM_INFO
+        if self.ocupacao[alvo] >= 0:
+            return self.recompensa_colisao, False, SEM_INFO
+
+        self.ocupacao[s] = -1
+        self.celulas[i] = alvo
+        if alvo == self.saidas[i]:
+            self.terminados[i] = True
+            self._restantes -= 1
+            return 100.0, self._restantes == 0, SEM_INFO
+        self.ocupacao[alvo] = i
+        return float(self._recompensa[s, codigo]), False, SEM_INFO
+
+    def observacoes_lote(self, agentes: Sequence[Any]) -> List[Tuple[int, int, int, int]]:
+        linhas = [self._linha(agente) for agente in agentes]
+        w = self.largura
+        s = self.celulas[linhas]
+        saida = self.saidas[linhas]
+        return list(zip((s % w).tolist(), (s // w).tolist(), (saida % w).tolist(), (saida // w).tolist()))
+
+    def agir_lote(
+        self, accoes: Sequence[Accao], agentes: Sequence[Any]
+    ) -> Tuple[List[float], List[bool], List[Dict]]:
+        """
+        Movimento simultâneo com `passo`: as listas devolvidas têm sempre uma
+        entrada por agente. Agentes não incluídos em `agentes` ficam parados.
+        """
+        linhas = [self._linha(agente) for agente in agentes]
+        codigos = np.full(self.M, PARADO, dtype=np.int64)
+        codigos[linhas] = [CODIGOS_MDP.get(accao.direcao, PARADO) for accao in accoes]
+
+        recompensas, _saiu = self.passo(codigos)
+        fim = self._restantes == 0
+        return recompensas[linhas].tolist(), [fim] * len(linhas), [SEM_INFO] * len(linhas)
+
+    def posicao_agente(self, agente: Any) -> Tuple[int, int]:
+        s = int(self.celulas[self._linha(agente)])
+        return s % self.largura, s // self.largura
+
+    def saida_agente(self, agente: Any) -> Tuple[int, int]:
+        saida = int(self.saidas[self._linha(agente)])
+        return saida % self.largura, saida // self.largura
+
+    def posicao_alvo(self) -> Tuple[int, int]:
+        """Saída do primeiro agente (a saída comum, com `saidas="comum"`)."""
+        saida = int(self.saidas[0])
+        return saida % self.largura, saida // self.largura
+
+    def atualizacao(self) -> None:
+        pass
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import List, Tuple
+from collections import deque
+from typing import List, Optional, Tuple
 import random
 
 class MapaLabirinto:
@@ -8,11 +9,11 @@ class MapaLabirinto:
     Gere a lógica geométrica (paredes vs livres) e a colocação da saída.
     """
 
-    def __init__(self, seed: int | None = None) -> None:
+    def __init__(self, seed: int | None = None, grelha: Optional[List[List[int]]] = None) -> None:
         self._rnd = random.Random(seed)
 
-        # Definição da Grelha (0=Livre, 1=Parede) - Matriz 13x13
-        self.grelha: List[List[int]] = [
+        # Definição da Grelha (0=Livre, 1=Parede) - Matriz 13x13 por omissão
+        self.grelha: List[List[int]] = grelha if grelha is not None else [
             [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], # 0
             [1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1], # 1 (Início em 1,1)
             [1, 0, 1, 0, 1, 0, 1, 1, 1, 1, 1, 0, 1], # 2
@@ -33,6 +34,45 @@ class MapaLabirinto:
         self._saida_x: int | None = None
         self._saida_y: int | None = None
 
+    @classmethod
+    def gerar(cls, largura: int, altura: int, seed: int | None = None, abertura: float = 0.1) -> "MapaLabirinto":
+        """
+        Labirinto aleatório (largura e altura ímpares) escavado por DFS com
+        retrocesso a partir de (1, 1). `abertura` remove essa fração das
+        paredes separadoras restantes (entre duas células livres, numa linha
+        ou numa coluna), criando ciclos (caminhos alternativos, úteis com
+        muitos agentes) sem abrir células isoladas.
+        """
+        rnd = random.Random(seed)
+        grelha = [[1] * largura for _ in range(altura)]
+        grelha[1][1] = 0
+        pilha = [(1, 1)]
+        while pilha:
+            x, y = pilha[-1]
+            vizinhos = [
+                (x + dx, y + dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                if 0 < x + dx < largura - 1 and 0 < y + dy < altura - 1 and grelha[y + dy][x + dx] == 1
+            ]
+            if not vizinhos:
+                pilha.pop()
+                continue
+            nx, ny = rnd.choice(vizinhos)
+            grelha[(y + ny) // 2][(x + nx) // 2] = 0
+            grelha[ny][nx] = 0
+            pilha.append((nx, ny))
+
+        # Os "pilares" (ambas as coordenadas pares) nunca separam duas células
+        separadoras = [
+            (x, y) for y in range(1, altura - 1) for x in range(1, largura - 1)
+            if grelha[y][x] == 1 and x % 2 != y % 2 and (
+                grelha[y][x - 1] == grelha[y][x + 1] == 0 if x % 2 == 0
+                else grelha[y - 1][x] == grelha[y + 1][x] == 0
+            )
+        ]
+        for x, y in rnd.sample(separadoras, int(abertura * len(separadoras))):
+            grelha[y][x] = 0
+        return cls(seed, grelha=grelha)
+
     def dentro_limites(self, x: int, y: int) -> bool:
         """Verifica se (x,y) está dentro da matriz."""
         return 0 <= y < self.altura and 0 <= x < self.largura
@@ -52,6 +92,20 @@ class MapaLabirinto:
                     livres.append((i, j))
         return livres
 
+    def celulas_ligadas(self, x: int = 1, y: int = 1) -> List[Tuple[int, int]]:
+        """Células livres alcançáveis a partir de (x, y) (pesquisa em largura), pela ordem de `celulas_livres`."""
+        if self.is_parede(x, y):
+            raise ValueError(f"Célula de origem ({x}, {y}) é parede.")
+        visitadas = {(x, y)}
+        fila = deque([(x, y)])
+        while fila:
+            cx, cy = fila.popleft()
+            for vx, vy in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                if (vx, vy) not in visitadas and not self.is_parede(vx, vy):
+                    visitadas.add((vx, vy))
+                    fila.append((vx, vy))
+        return [c for c in self.celulas_livres() if c in visitadas]
+
     def saida_aleatoria(self) -> Tuple[int, int]:
         """
         Define uma nova posição de saída numa célula livre aleatória.
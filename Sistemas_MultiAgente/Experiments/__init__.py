@@ -1,13 +1,38 @@
-from .treino_qlearning_farol import correr_treino_farol
-from .treino_qlearning_labirinto import correr_treino_labirinto
-from .demo_visual import demo_labirinto
-from .treino_genetico_farol import correr_treino_genetico_farol
-from .treino_genetico_labirinto import correr_treino_genetico_labirinto
-
-__all__ = [
-    "correr_treino_farol",
-    "correr_treino_labirinto",
-    "demo_labirinto",
-    "correr_treino_genetico_farol",
-    "correr_treino_genetico_labirinto"
-]
\ No newline at end of file
+"""
+Experiências do simulador.
+
+As funções são importadas apenas quando usadas (PEP 562): importar o pacote
+não carrega tkinter, NumPy ou os restantes módulos de treino.
+"""
+from __future__ import annotations
+import importlib
+from typing import Any
+
+# nome exportado -> módulo que o define
+_EXPORTS = {
+    "correr_treino_farol": ".treino_qlearning_farol",
+    "correr_treino_labirinto": ".treino_qlearning_labirinto",
+    "correr_treino_labirinto_paralelo": ".treino_qlearning_paralelo",
+    "demo_labirinto": ".demo_visual",
+    "demo_headless": ".render_headless",
+    "render_headless": ".render_headless",
+    "correr_treino_genetico_farol": ".treino_genetico_farol",
+    "correr_treino_genetico_labirinto": ".treino_genetico_labirinto",
+    "correr_fila": ".fila_experiencias",
+    "avaliar_paralelo": ".avaliacao_paralela",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(nome: str) -> Any:
+    modulo = _EXPORTS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nome)
+    globals()[nome] = valor  # próximos acessos não passam por aqui
+    return valor
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
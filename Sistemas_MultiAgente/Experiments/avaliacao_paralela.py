@@ -0,0 +1,141 @@
+from __future__ import annotations
+import math
+import multiprocessing as mp
+import os
+import random
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Core import Agent, Environment, Simulator
+from Metrics import EpisodioStats, ExportadorMetricas, MetricsLogger
+
+# Fatias por worker: fatias mais pequenas equilibram melhor a carga
+FATIAS_POR_WORKER = 4
+
+# Estado de cada worker, definido uma única vez pelo inicializador do Pool
+_ESTADO: Dict[str, Any] = {}
+
+
+def _iniciar_worker(
+    fabrica_ambiente: Callable[..., Environment],
+    agente: Agent,
+    nome_experiencia: str,
+    max_passos: int,
+    detetar_ciclos: bool,
+) -> None:
+    # Sem seed, cada worker precisa do seu próprio estado aleatório
+    # (com fork herdaria o do processo principal)
+    random.seed()
+    _ESTADO.update(
+        fabrica_ambiente=fabrica_ambiente,
+        agente=agente,
+        nome_experiencia=nome_experiencia,
+        max_passos=max_passos,
+        detetar_ciclos=detetar_ciclos,
+    )
+
+
+def _correr(inicio: int, quantidade: int, seed: Optional[int]) -> List[EpisodioStats]:
+    """Corre `quantidade` episódios num ambiente novo e numera-os a partir de `inicio`."""
+    if seed is not None:
+        random.seed(seed)
+
+    sim = Simulator(
+        ambiente=_ESTADO["fabrica_ambiente"](seed=seed),
+        agentes=[_ESTADO["agente"]],
+        nome_experiencia=_ESTADO["nome_experiencia"],
+        num_episodios=quantidade,
+        max_passos=_ESTADO["max_passos"],
+        modo_aprendizagem=False,
+        detetar_ciclos=_ESTADO["detetar_ciclos"],
+    )
+    # O resumo é impresso pelo processo principal
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        resultados = sim.executa()
+
+    for k, stats in enumerate(resultados):
+        stats.episodio = inicio + k + 1
+    return resultados
+
+
+def _avaliar_fatia(fatia: Tuple[int, int, Optional[int]]) -> List[EpisodioStats]:
+    """
+    Sem seed, a fatia corre num só ambiente. Com seed, cada episódio corre
+    num ambiente novo com `seed + índice do episódio` (e `random` com a
+    mesma seed): o resultado de um episódio não depende da fatia.
+    """
+    inicio, quantidade, seed = fatia
+    if seed is None:
+        return _correr(inicio, quantidade, None)
+    resultados: List[EpisodioStats] = []
+    for episodio in range(inicio, inicio + quantidade):
+        resultados.extend(_correr(episodio, 1, seed + episodio))
+    return resultados
+
+
+def avaliar_paralelo(
+    fabrica_ambiente: Callable[..., Environment],
+    agente: Agent,
+    nome_experiencia: str,
+    num_episodios: int,
+    max_passos: int = 100,
+    num_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    detetar_ciclos: bool = False,
+    logger: Optional[MetricsLogger] = None,
+    exportador: Optional[ExportadorMetricas] = None,
+) -> List[EpisodioStats]:
+    """
+    Avaliação de uma política congelada (sem aprendizagem nem exploração)
+    distribuída por um Pool de processos.
+
+    O agente (Q-table, política compilada ou genoma) é enviado uma única vez
+    a cada worker, no inicializador do Pool. Os episódios são divididos em
+    fatias contíguas, corridas em ambientes novos criados por
+    `fabrica_ambiente(seed=...)`. Com `seed`, cada episódio tem a sua própria
+    seed (`seed + índice do episódio`, de 0 a num_episodios - 1), pelo que os
+    resultados não dependem do número de workers nem da divisão em fatias.
+    Os `EpisodioStats` são juntos pela ordem dos episódios (1..num_episodios)
+    e registados no logger / exportador por essa ordem.
+
+    Args:
+        fabrica_ambiente: Callable serializável que aceita `seed`
+                          (ex: a classe do ambiente ou um functools.partial).
+        num_workers: Processos do Pool (por omissão, os CPUs); com 1 as
+                     fatias correm no próprio processo.
+    """
+    num_workers = min(num_workers or os.cpu_count() or 1, max(1, num_episodios))
+    tamanho = max(1, math.ceil(num_episodios / (num_workers * FATIAS_POR_WORKER)))
+    fatias = [
+        (inicio, min(tamanho, num_episodios - inicio), seed)
+        for inicio in range(0, num_episodios, tamanho)
+    ]
+    argumentos = (fabrica_ambiente, agente, nome_experiencia, max_passos, detetar_ciclos)
+
+    print(f"### Iniciando Avaliação: {nome_experiencia} ({num_workers} workers, {len(fatias)} fatias) ###")
+    resultados: List[EpisodioStats] = []
+    if num_workers == 1:
+        _iniciar_worker(*argumentos)
+        try:
+            for fatia in fatias:
+                resultados.extend(_avaliar_fatia(fatia))
+        finally:
+            _ESTADO.clear()
+    else:
+        with mp.Pool(num_workers, initializer=_iniciar_worker, initargs=argumentos) as pool:
+            # imap devolve as fatias pela ordem de submissão
+            for parte in pool.imap(_avaliar_fatia, fatias):
+                resultados.extend(parte)
+
+    for stats in resultados:
+        if logger is not None:
+            logger.registar(stats)
+        if exportador is not None:
+            exportador.episodio(stats, [agente])
+
+    sucessos = sum(stats.sucesso for stats in resultados)
+    print(
+        f"### {nome_experiencia} concluído. Total de {len(resultados)} episódios "
+        f"({sucessos / max(1, len(resultados)):.0%} de sucesso). ###"
+    )
+    return resultados
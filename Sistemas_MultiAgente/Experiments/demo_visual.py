@@ -1,21 +1,42 @@
 from __future__ import annotations
+import os
 import time
 import tkinter as tk
+from typing import Optional
 
 from Envs import LabirintoEnvironment
-from Agents import QLearningLabirintoAgent
+from Agents import QLearningLabirintoAgent, PolicyAgent, PoliticaPartilhada
 
 
 class Viewer:
     """
     Janela gráfica simples para visualizar o labirinto.
     Integrada no demo_visual para simplificar a estrutura do projeto.
+
+    Renderização incremental: as paredes (camada estática) são desenhadas uma
+    única vez por episódio e, a cada passo, apenas os itens do agente e da
+    saída são deslocados com `canvas.coords`. O custo por frame é O(1) em vez
+    de O(largura x altura).
     """
 
-    def __init__(self, env, cell_size: int = 50, delay: float = 0.15):
+    # Fatores de velocidade permitidos pelas teclas '+' / '-'
+    VELOCIDADE_MIN = 0.125
+    VELOCIDADE_MAX = 64.0
+
+    def __init__(
+        self,
+        env,
+        cell_size: int = 50,
+        delay: float = 0.15,
+        frame_skip: int = 1,
+        velocidade: float = 1.0,
+    ):
         self.env = env
         self.cell_size = cell_size
         self.delay = delay
+        self.frame_skip = max(1, int(frame_skip))  # desenha 1 em cada N passos
+        self.velocidade = 1.0                       # multiplicador sobre o delay
+        self._ajustar_velocidade(velocidade)        # limitado a [VELOCIDADE_MIN, VELOCIDADE_MAX]
 
         # criar janela
         self.root = tk.Tk()
@@ -33,68 +54,135 @@ class Viewer:
             10, height - 15, anchor="w", text="", font=("Consolas", 10)
         )
 
+        # itens dinâmicos (criados uma vez, depois apenas movidos)
+        self._item_saida = None
+        self._item_agente = None
+
+        # política partilhada em tempo real (ver `seguir`)
+        self._live: Optional[PoliticaPartilhada] = None
+        self._agente_live: Optional[PolicyAgent] = None
+
+        # controlo de velocidade pelo teclado
+        self.root.bind("<plus>", lambda _e: self._ajustar_velocidade(2.0))
+        self.root.bind("<KP_Add>", lambda _e: self._ajustar_velocidade(2.0))
+        self.root.bind("<minus>", lambda _e: self._ajustar_velocidade(0.5))
+        self.root.bind("<KP_Subtract>", lambda _e: self._ajustar_velocidade(0.5))
+
     # -------------------------------------------------- #
-    def _desenhar_labirinto(self, passo: int, recompensa: float):
-        m = self.env.map
+    def seguir(self, live: PoliticaPartilhada, agente: PolicyAgent) -> None:
+        """
+        Acompanha uma política publicada pelo treino: a cada frame, se houver
+        uma versão nova, troca a política do agente (sem pickle nem espera).
+        """
+        self._live = live
+        self._agente_live = agente
+        live.atualizar(agente)
+
+    def _versao_live(self) -> str:
+        if self._live is None:
+            return ""
+        self._live.atualizar(self._agente_live)
+        return f" | política v{self._live.versao_lida}"
+
+    def _ajustar_velocidade(self, fator: float) -> None:
+        self.velocidade = max(
+            self.VELOCIDADE_MIN, min(self.VELOCIDADE_MAX, self.velocidade * fator)
+        )
+
+    def _pausa(self, segundos: float) -> None:
+        if segundos > 0:
+            time.sleep(segundos / self.velocidade)
+
+    def _coords_celula(self, x: int, y: int) -> tuple:
         cs = self.cell_size
+        return (x * cs, y * cs, x * cs + cs, y * cs + cs)
 
-        # apagar células anteriores
-        self.canvas.delete("cell")
+    def _coords_agente(self, x: int, y: int) -> tuple:
+        cs = self.cell_size
+        return (x * cs + cs * 0.2, y * cs + cs * 0.2, x * cs + cs * 0.8, y * cs + cs * 0.8)
+
+    def _desenhar_estatico(self) -> None:
+        """
+        Desenha a camada estática (caminho + paredes).
+        Paredes contíguas na mesma linha são fundidas num único retângulo,
+        reduzindo o número de itens Tk em mapas grandes.
+        """
+        m = self.env.map
+        cs = self.cell_size
 
-        # desenhar grelha
-        for y in range(m.altura):
-            for x in range(m.largura):
-                x0, y0 = x * cs, y * cs
-                x1, y1 = x0 + cs, y0 + cs
+        self.canvas.delete("estatico")
 
-                if m.is_parede(x, y):
-                    cor = "#333333"   # parede
-                else:
-                    cor = "#EEEEEE"   # caminho
+        # fundo: todo o mapa como caminho
+        self.canvas.create_rectangle(
+            0, 0, m.largura * cs, m.altura * cs,
+            fill="#EEEEEE", outline="", tags="estatico",
+        )
 
+        # paredes por segmentos horizontais
+        for y in range(m.altura):
+            x = 0
+            while x < m.largura:
+                if not m.is_parede(x, y):
+                    x += 1
+                    continue
+                inicio = x
+                while x < m.largura and m.is_parede(x, y):
+                    x += 1
                 self.canvas.create_rectangle(
-                    x0, y0, x1, y1, fill=cor, outline="#AAAAAA", tags="cell"
+                    inicio * cs, y * cs, x * cs, y * cs + cs,
+                    fill="#333333", outline="#AAAAAA", tags="estatico",
                 )
 
-        # saída (goal)
-        gx, gy = self.env.saida_x, self.env.saida_y
-        x0, y0 = gx * cs, gy * cs
-        x1, y1 = x0 + cs, y0 + cs
-        self.canvas.create_rectangle(
-            x0, y0, x1, y1, fill="#7CFC00", outline="#006400", tags="cell"
-        )
+        # criar (ou trazer para a frente) os itens dinâmicos
+        if self._item_saida is None:
+            self._item_saida = self.canvas.create_rectangle(
+                0, 0, 0, 0, fill="#7CFC00", outline="#006400", tags="dinamico"
+            )
+            self._item_agente = self.canvas.create_oval(
+                0, 0, 0, 0, fill="#00BFFF", outline="#000080", tags="dinamico"
+            )
+        self.canvas.tag_raise("dinamico")
+        self.canvas.tag_raise(self.info_text)
 
-        # agente
-        ax, ay = self.env.agent_x, self.env.agent_y
-        cx0, cy0 = ax * cs + cs * 0.2, ay * cs + cs * 0.2
-        cx1, cy1 = ax * cs + cs * 0.8, ay * cs + cs * 0.8
-        self.canvas.create_oval(
-            cx0, cy0, cx1, cy1, fill="#00BFFF", outline="#000080", tags="cell"
+    def _desenhar_labirinto(self, passo: int, recompensa: float):
+        # saída (goal) e agente: apenas deslocamento dos itens existentes
+        self.canvas.coords(
+            self._item_saida, *self._coords_celula(self.env.saida_x, self.env.saida_y)
+        )
+        self.canvas.coords(
+            self._item_agente, *self._coords_agente(self.env.agent_x, self.env.agent_y)
         )
 
         # texto em baixo
         self.canvas.itemconfig(
             self.info_text,
-            text=f"Passo {passo} | Recompensa: {recompensa}",
+            text=f"Passo {passo} | Recompensa: {recompensa} | x{self.velocidade:g}{self._versao_live()}",
         )
 
         self.root.update()
-        time.sleep(self.delay)
+        self._pausa(self.delay)
 
     # -------------------------------------------------- #
     def reset(self, episodio: int):
         self.root.title(f"Labirinto - Episódio {episodio + 1}")
+        self._desenhar_estatico()
+        self._desenhar_labirinto(0, 0.0)
 
     def render_step(self, passo: int, recompensa: float):
-        self._desenhar_labirinto(passo, recompensa)
+        # frame-skip: só desenha 1 em cada N passos
+        if passo % self.frame_skip == 0:
+            self._desenhar_labirinto(passo, recompensa)
 
     def render_episode_end(self, episodio: int, passos: int):
+        self.canvas.coords(
+            self._item_agente, *self._coords_agente(self.env.agent_x, self.env.agent_y)
+        )
         self.canvas.itemconfig(
             self.info_text,
             text=f"Episódio {episodio + 1} terminado em {passos} passos.",
         )
         self.root.update()
-        time.sleep(1.0)
+        self._pausa(1.0)
 
     def close(self):
         self.root.destroy()
@@ -105,18 +193,42 @@ def demo_labirinto(
     num_episodios: int = 1,
     max_passos: int = 80,
     delay: float = 0.15,
+    frame_skip: int = 1,
+    velocidade: float = 1.0,
+    caminho_politica: Optional[str] = "politica_labirinto.npz",
+    caminho_qtable: str = "qtable_labirinto.pkl",
+    caminho_live: Optional[str] = None,
 ) -> None:
     """
     Demonstração visual do agente no labirinto numa janela gráfica.
-    Política fixa (epsilon=0.0).
+    Política fixa (epsilon=0.0). Usa a política compilada se
+    `caminho_politica` existir, caso contrário a Q-table em
+    `caminho_qtable`. Com `caminho_live`, segue a política que um
+    treino em curso publica nesse ficheiro (espera pela primeira versão).
+
+    `frame_skip` desenha apenas 1 em cada N passos e `velocidade` acelera a
+    reprodução (ajustável durante a execução com as teclas '+' e '-').
     """
 
     env = LabirintoEnvironment()
-    # Assume-se que o agente QL já tem o método load_qtable definido
-    agent = QLearningLabirintoAgent(agent_id=1, alpha=0.1, gamma=0.99, epsilon=0.0)
-    agent.load_qtable("qtable_labirinto.pkl")
+    live = None
+    if caminho_live:
+        print(f"[Live] À espera da política em {caminho_live}...")
+        live = PoliticaPartilhada.esperar(caminho_live)
+        _versao, politica = live.ler()
+        agent = PolicyAgent(1, politica)
+    elif caminho_politica and os.path.exists(caminho_politica):
+        agent = PolicyAgent.carregar(1, caminho_politica)
+    else:
+        # Assume-se que o agente QL já tem o método load_qtable definido
+        agent = QLearningLabirintoAgent(agent_id=1, alpha=0.1, gamma=0.99, epsilon=0.0)
+        agent.load_qtable(caminho_qtable)
     
-    viewer = Viewer(env, cell_size=50, delay=delay)
+    viewer = Viewer(
+        env, cell_size=50, delay=delay, frame_skip=frame_skip, velocidade=velocidade
+    )
+    if live is not None:
+        viewer.seguir(live, agent)
 
     print("\n=== Demonstração Visual – Labirinto ===")
 
@@ -145,6 +257,8 @@ def demo_labirinto(
             viewer.render_episode_end(ep, max_passos)
 
     viewer.close()
+    if live is not None:
+        live.fechar()
     print("\n--- Fim da demonstração ---")
 
 
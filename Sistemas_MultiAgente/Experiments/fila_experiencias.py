@@ -0,0 +1,148 @@
+from __future__ import annotations
+import functools
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Core import Simulator
+from Core.especificacao import (
+    aplicar_atributos, carregar_especificacao, criar_agente, criar_ambiente, parametros_fase,
+)
+from Metrics import MetricsLogger
+
+# Pacotes cujo código entra na chave de cache (alterar o código invalida resultados)
+PACOTES_CODIGO = ("Core", "Envs", "Agents", "Metrics", "Experiments")
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Ficheiro escrito no fim de uma execução bem-sucedida
+MARCADOR = "concluido.json"
+
+
+@functools.lru_cache(maxsize=1)
+def versao_codigo() -> str:
+    """Hash do código-fonte dos pacotes do simulador."""
+    h = hashlib.blake2b(digest_size=16)
+    for pacote in PACOTES_CODIGO:
+        for pasta, subpastas, ficheiros in sorted(os.walk(os.path.join(RAIZ, pacote))):
+            subpastas.sort()
+            for nome in sorted(ficheiros):
+                if nome.endswith(".py"):
+                    caminho = os.path.join(pasta, nome)
+                    h.update(os.path.relpath(caminho, RAIZ).encode("utf-8"))
+                    with open(caminho, "rb") as f:
+                        h.update(f.read())
+    return h.hexdigest()
+
+
+def chave_execucao(spec: Dict[str, Any], seed: Optional[int]) -> str:
+    """Chave de cache: especificação canónica + seed + versão do código."""
+    canonica = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    h = hashlib.blake2b(digest_size=16)
+    for parte in (canonica, repr(seed), versao_codigo()):
+        h.update(parte.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def pasta_execucao(spec: Dict[str, Any], seed: Optional[int], pasta_resultados: str) -> str:
+    nome = spec.get("nome", "experiencia")
+    sufixo = f"seed{seed}" if seed is not None else "semseed"
+    return os.path.join(pasta_resultados, f"{nome}-{sufixo}-{chave_execucao(spec, seed)[:12]}")
+
+
+def executar_especificacao(spec: Dict[str, Any], seed: Optional[int], destino: str) -> Dict[str, Any]:
+    """
+    Corre todas as fases de uma especificação para uma seed e grava em
+    `destino`: metricas.csv, qtable.pkl (se o agente a tiver), execucao.log
+    e, por último, o marcador `concluido.json`.
+    """
+    os.makedirs(destino, exist_ok=True)
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+    nome = spec.get("nome", "Experiencia")
+    inicio = time.perf_counter()
+    # "metricas": {"modo": "agregado", "tamanho_bloco": 100} guarda só médias por bloco
+    logger = MetricsLogger(**spec.get("metricas", {}))
+
+    with open(os.path.join(destino, "execucao.log"), "w", encoding="utf-8") as log, redirect_stdout(log):
+        ambiente = criar_ambiente(spec["ambiente"], seed)
+        agente = criar_agente(spec["agente"])
+
+        for fase in spec.get("fases", []):
+            # Uma fase pode usar outro agente (ex: baseline Greedy)
+            agente_fase = criar_agente(fase["agente"]) if "agente" in fase else agente
+            aplicar_atributos(agente_fase, fase)
+            Simulator(ambiente, [agente_fase], logger=logger, **parametros_fase(fase, nome)).executa()
+
+        logger.guardar_csv(os.path.join(destino, "metricas.csv"))
+        if hasattr(agente, "save_qtable"):
+            agente.save_qtable(os.path.join(destino, "qtable.pkl"))
+
+    resumo = {
+        "nome": nome,
+        "seed": seed,
+        "chave": chave_execucao(spec, seed),
+        "versao_codigo": versao_codigo(),
+        "duracao_s": round(time.perf_counter() - inicio, 3),
+        "especificacao": spec,
+    }
+    # Escrita atómica do marcador: só existe se a execução terminou
+    temporario = os.path.join(destino, MARCADOR + ".tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(resumo, f, indent=2, ensure_ascii=False)
+    os.replace(temporario, os.path.join(destino, MARCADOR))
+    return resumo
+
+
+def correr_fila(
+    caminhos_specs: Sequence[str],
+    pasta_resultados: str = "resultados",
+    max_workers: Optional[int] = None,
+    forcar: bool = False,
+) -> List[str]:
+    """
+    Fila de execuções: cada (especificação, seed) é uma execução com chave
+    hash(especificação + seed + código). Execuções cujo marcador já existe
+    são saltadas; as restantes correm em paralelo (processos).
+
+    Returns:
+        As pastas de resultados de todas as execuções (pela ordem da fila).
+    """
+    fila: List[Tuple[Dict[str, Any], Optional[int], str]] = []
+    for caminho in caminhos_specs:
+        spec = carregar_especificacao(caminho)
+        for seed in spec.get("seeds") or [None]:
+            fila.append((spec, seed, pasta_execucao(spec, seed, pasta_resultados)))
+
+    pendentes = [
+        execucao for execucao in fila
+        if forcar or not os.path.exists(os.path.join(execucao[2], MARCADOR))
+    ]
+    print(f"### Fila de experiências: {len(fila)} execuções, {len(fila) - len(pendentes)} em cache ###")
+
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {
+                executor.submit(executar_especificacao, spec, seed, destino): destino
+                for spec, seed, destino in pendentes
+            }
+            for futuro in as_completed(futuros):
+                resumo = futuro.result()
+                print(f"  [OK] {resumo['nome']} (seed {resumo['seed']}) em {resumo['duracao_s']:.1f}s -> {futuros[futuro]}")
+
+    return [destino for _spec, _seed, destino in fila]
+
+
+if __name__ == "__main__":
+    import sys
+
+    correr_fila(sys.argv[1:])
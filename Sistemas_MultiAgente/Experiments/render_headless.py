@@ -0,0 +1,284 @@
+from __future__ import annotations
+import os
+import struct
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Core import Agent, Environment
+from Envs import FarolEnvironment, LabirintoEnvironment
+
+
+# Paleta RGB (igual à do Viewer Tk)
+COR_CAMINHO = (0xEE, 0xEE, 0xEE)
+COR_PAREDE = (0x33, 0x33, 0x33)
+COR_ALVO = (0x7C, 0xFC, 0x00)
+COR_AGENTE = (0x00, 0xBF, 0xFF)
+
+# Caracteres do modo ASCII
+CHAR_CAMINHO = "."
+CHAR_PAREDE = "#"
+CHAR_ALVO = "S"
+CHAR_AGENTE = "A"
+
+
+# FUNÇÕES AUXILIARES (ADAPTAÇÃO A CADA AMBIENTE)
+
+def grelha_paredes(env: Environment) -> np.ndarray:
+    """
+    Devolve a grelha (altura x largura) do ambiente com 1=Parede, 0=Livre.
+    O Farol não tem obstáculos, logo a grelha é toda livre.
+    """
+    if isinstance(env, LabirintoEnvironment):
+        return np.asarray(env.map.grelha, dtype=np.uint8)
+    if isinstance(env, FarolEnvironment):
+        return np.zeros((env.N, env.N), dtype=np.uint8)
+    raise TypeError(f"Ambiente não suportado pelo renderizador: {type(env).__name__}")
+
+
+def gravar_trajetoria(env: Environment, agente: Agent, max_passos: int = 100) -> np.ndarray:
+    """
+    Corre um episódio (sem aprendizagem) e devolve as posições visitadas.
+
+    Returns:
+        np.ndarray: Matriz (passos + 1, 2) com as coordenadas (x, y),
+                    incluindo a posição inicial.
+    """
+    env.reset()
+    obs = env.observacaoPara(agente)
+    agente.observacao(obs)
+
+    posicoes = [env.posicao_agente(agente)]
+    for _ in range(max_passos):
+        accao = agente.age()
+        _recompensa, terminou, _info = env.agir(accao, agente)
+        agente.observacao(env.observacaoPara(agente))
+        posicoes.append(env.posicao_agente(agente))
+        if terminou:
+            break
+
+    return np.asarray(posicoes, dtype=np.int16)
+
+
+# RENDERIZAÇÃO RGB
+
+def camada_estatica(grelha: np.ndarray, cell_size: int = 8) -> np.ndarray:
+    """
+    Pré-calcula a imagem RGB das paredes (uint8, altura*cs x largura*cs x 3).
+    É calculada uma vez e reutilizada em todos os frames.
+    """
+    paleta = np.array([COR_CAMINHO, COR_PAREDE], dtype=np.uint8)
+    celulas = paleta[grelha]  # (altura, largura, 3)
+    return np.repeat(np.repeat(celulas, cell_size, axis=0), cell_size, axis=1)
+
+
+def renderizar_trajetoria(
+    grelha: np.ndarray,
+    posicoes: np.ndarray,
+    alvo: Tuple[int, int],
+    cell_size: int = 8,
+    fundo: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Desenha todos os frames de uma trajetória de uma só vez.
+
+    Args:
+        grelha (np.ndarray): Grelha de paredes (ver `grelha_paredes`).
+        posicoes (np.ndarray): Matriz (T, 2) com as posições (x, y) do agente.
+        alvo (Tuple[int, int]): Posição do objetivo.
+        cell_size (int): Lado de cada célula em píxeis.
+        fundo (np.ndarray, opcional): Camada estática já calculada.
+
+    Returns:
+        np.ndarray: Frames RGB com forma (T, altura*cs, largura*cs, 3).
+    """
+    if fundo is None:
+        fundo = camada_estatica(grelha, cell_size)
+
+    # Alvo é estático no episódio: entra na camada de fundo (blit único)
+    base = fundo.copy()
+    ax, ay = alvo
+    base[ay * cell_size:(ay + 1) * cell_size, ax * cell_size:(ax + 1) * cell_size] = COR_ALVO
+
+    posicoes = np.asarray(posicoes, dtype=np.intp).reshape(-1, 2)
+    n_frames = len(posicoes)
+    frames = np.broadcast_to(base, (n_frames,) + base.shape).copy()
+
+    # Agente: quadrado interior (20%..80% da célula), pintado em todos os frames
+    # com uma única atribuição por indexação avançada
+    margem = int(round(cell_size * 0.2))
+    lado = max(1, cell_size - 2 * margem)
+    desloc = np.arange(lado) + margem
+
+    linhas = posicoes[:, 1, None] * cell_size + desloc   # (T, lado)
+    colunas = posicoes[:, 0, None] * cell_size + desloc  # (T, lado)
+    t = np.arange(n_frames)[:, None, None]
+    frames[t, linhas[:, :, None], colunas[:, None, :]] = COR_AGENTE
+
+    return frames
+
+
+# EXPORTAÇÃO
+
+def _png_bytes(imagem: np.ndarray, nivel: int = 6) -> bytes:
+    """Codifica uma imagem RGB uint8 em PNG (apenas biblioteca standard)."""
+    altura, largura, _ = imagem.shape
+    linhas = np.zeros((altura, largura * 3 + 1), dtype=np.uint8)  # byte de filtro = 0
+    linhas[:, 1:] = imagem.reshape(altura, largura * 3)
+
+    def chunk(tipo: bytes, dados: bytes) -> bytes:
+        crc = zlib.crc32(tipo + dados) & 0xFFFFFFFF
+        return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", crc)
+
+    cabecalho = struct.pack(">IIBBBBB", largura, altura, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", cabecalho)
+        + chunk(b"IDAT", zlib.compress(linhas.tobytes(), nivel))
+        + chunk(b"IEND", b"")
+    )
+
+
+def guardar_png_sequencia(frames: np.ndarray, pasta: str, prefixo: str = "frame") -> List[str]:
+    """Guarda cada frame como `<pasta>/<prefixo>_00000.png`. Devolve os caminhos."""
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = []
+    for i, frame in enumerate(frames):
+        caminho = os.path.join(pasta, f"{prefixo}_{i:05d}.png")
+        with open(caminho, "wb") as f:
+            f.write(_png_bytes(frame))
+        caminhos.append(caminho)
+    return caminhos
+
+
+def guardar_gif(frames: np.ndarray, caminho: str, duracao_ms: int = 100) -> None:
+    """
+    Guarda os frames como GIF animado.
+    Requer a biblioteca Pillow (importada apenas quando necessária).
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("A exportação GIF requer Pillow: pip install pillow") from e
+
+    imagens = [Image.fromarray(frame) for frame in frames]
+    imagens[0].save(
+        caminho,
+        save_all=True,
+        append_images=imagens[1:],
+        duration=duracao_ms,
+        loop=0,
+    )
+
+
+# MODO ASCII
+
+def trajetoria_ascii(
+    grelha: np.ndarray,
+    posicoes: np.ndarray,
+    alvo: Tuple[int, int],
+) -> List[str]:
+    """
+    Converte uma trajetória numa lista de frames de texto (um por posição).
+    """
+    base = np.where(grelha == 1, CHAR_PAREDE, CHAR_CAMINHO).astype("<U1")
+    base[alvo[1], alvo[0]] = CHAR_ALVO
+
+    posicoes = np.asarray(posicoes, dtype=np.intp).reshape(-1, 2)
+    n_frames = len(posicoes)
+    frames = np.broadcast_to(base, (n_frames,) + base.shape).copy()
+    frames[np.arange(n_frames), posicoes[:, 1], posicoes[:, 0]] = CHAR_AGENTE
+
+    return ["\n".join("".join(linha) for linha in frame) for frame in frames]
+
+
+# FUNÇÃO DE DEMONSTRAÇÃO PRINCIPAL
+
+def render_headless(
+    env: Environment,
+    posicoes: Sequence[Tuple[int, int]] | np.ndarray,
+    destino: str,
+    formato: str = "gif",
+    cell_size: int = 8,
+    alvo: Optional[Tuple[int, int]] = None,
+    duracao_ms: int = 100,
+) -> None:
+    """
+    Exporta uma trajetória sem necessitar de display.
+
+    Args:
+        formato (str): "gif" (ficheiro animado), "png" (pasta com sequência
+                       de frames) ou "ascii" (ficheiro de texto; "-" imprime
+                       no terminal).
+    """
+    grelha = grelha_paredes(env)
+    if alvo is None:
+        alvo = env.posicao_alvo()
+
+    if formato == "ascii":
+        texto = "\n\n".join(trajetoria_ascii(grelha, posicoes, alvo))
+        if destino == "-":
+            print(texto)
+        else:
+            with open(destino, "w", encoding="utf-8") as f:
+                f.write(texto)
+        return
+
+    frames = renderizar_trajetoria(grelha, posicoes, alvo, cell_size)
+
+    if formato == "gif":
+        guardar_gif(frames, destino, duracao_ms)
+    elif formato == "png":
+        guardar_png_sequencia(frames, destino)
+    else:
+        raise ValueError(f"Formato desconhecido: {formato}")
+
+
+def demo_headless(
+    num_episodios: int = 1,
+    max_passos: int = 80,
+    formato: str = "gif",
+    pasta: str = "renders",
+    cell_size: int = 8,
+    caminho_politica: Optional[str] = "politica_labirinto.npz",
+    caminho_qtable: str = "qtable_labirinto.pkl",
+    caminho_live: Optional[str] = None,
+) -> None:
+    """
+    Equivalente headless de `demo_labirinto`: corre a política treinada
+    (compilada, se `caminho_politica` existir, ou a Q-table com epsilon=0.0)
+    e exporta cada episódio para `pasta`. Com `caminho_live`, segue a
+    política publicada por um treino em curso: cada episódio usa a versão
+    mais recente.
+    """
+    from Agents import PolicyAgent, PoliticaPartilhada, QLearningLabirintoAgent
+
+    env = LabirintoEnvironment()
+    live = None
+    if caminho_live:
+        print(f"[Live] À espera da política em {caminho_live}...")
+        live = PoliticaPartilhada.esperar(caminho_live)
+        _versao, politica = live.ler()
+        agent = PolicyAgent(1, politica)
+    elif caminho_politica and os.path.exists(caminho_politica):
+        agent = PolicyAgent.carregar(1, caminho_politica)
+    else:
+        agent = QLearningLabirintoAgent(agent_id=1, alpha=0.1, gamma=0.99, epsilon=0.0)
+        agent.load_qtable(caminho_qtable)
+
+    os.makedirs(pasta, exist_ok=True)
+    extensao = {"gif": ".gif", "png": "", "ascii": ".txt"}[formato]
+
+    for ep in range(num_episodios):
+        versao = ""
+        if live is not None:
+            live.atualizar(agent)
+            versao = f" (política v{live.versao_lida})"
+        posicoes = gravar_trajetoria(env, agent, max_passos)
+        destino = os.path.join(pasta, f"episodio_{ep + 1:04d}{extensao}")
+        render_headless(env, posicoes, destino, formato=formato, cell_size=cell_size)
+        print(f"  Episódio {ep + 1}: {len(posicoes) - 1} passos -> {destino}{versao}")
+
+    if live is not None:
+        live.fechar()
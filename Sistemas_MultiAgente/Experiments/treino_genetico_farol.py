@@ -1,12 +1,16 @@
 from __future__ import annotations
 import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 # Imports do Projeto
 from Core import Agent
 from Envs import FarolEnvironment
 from Agents.genetic_farol_agent import GeneticFarolAgent
-from Metrics import MetricsLogger, EpisodioStats
+from Agents.operadores_geneticos import gerador, reproduzir_geracao
+from Agents.cache_fitness import CacheFitness, impressao_digital
+from Metrics import ExportadorMetricas, MetricsLogger, EpisodioStats
 
 # --- Hiperparâmetros do Algoritmo Genético ---
 POPULACAO = 50       # Número de indivíduos por geração
@@ -15,10 +19,68 @@ MAX_PASSOS = 30      # Timeout por episódio (impede loops infinitos)
 ELITISMO = 5         # Número de melhores agentes preservados sem mutação
 TAXA_MUTACAO = 0.1   # Probabilidade de mutação por gene
 FORCA_MUTACAO = 0.5  # Desvio padrão da mutação gaussiana
+TAMANHO_TORNEIO = 3  # Participantes por torneio de seleção
+TIPO_CRUZAMENTO = "uniforme"  # "uniforme", "um_ponto", "blend" ou None
+TAXA_CRUZAMENTO = 0.5         # Fração de filhos gerados por cruzamento
+CAPACIDADE_CACHE = 5000       # Máximo de rollouts memorizados (LRU)
+DETETAR_CICLOS = True         # Termina rollouts presos num ciclo (resultado idêntico)
+
+def simular_individuo(env: FarolEnvironment, agente: GeneticFarolAgent) -> Tuple[float, bool]:
+    """
+    Corre um episódio completo do indivíduo a partir do estado inicial.
+
+    A ação depende apenas da posição (o farol é fixo): se uma posição se
+    repete, o agente está num ciclo e as recompensas dos passos restantes
+    são somadas analiticamente, sem continuar a simulação.
+
+    Returns:
+        (recompensa acumulada, chegou ao farol)
+    """
+    env.reset()
+    recompensa_acumulada = 0
+    chegou = False
+
+    # Deteção de ciclos: passo em que cada posição foi visitada e recompensas por passo
+    visitado_em = {(env.x, env.y): 0}
+    recompensas = []
+    
+    for passo in range(MAX_PASSOS):
+        # Observação (x, y, farol_x, farol_y, N), reescrita no lugar pelo ambiente
+        obs = env.observacaoPara(agente)
+        
+        # Ciclo Perceção-Ação
+        accao = agente.age(env_info=obs)
+        r, done, _ = env.agir(accao, agente)
+        
+        recompensa_acumulada += r
+        
+        if done: 
+            chegou = True
+            recompensa_acumulada += 100 
+            break
 
-def correr_treino_genetico_farol():
+        if DETETAR_CICLOS:
+            recompensas.append(r)
+            inicio_ciclo = visitado_em.get((env.x, env.y))
+            if inicio_ciclo is not None:
+                ciclo_r = recompensas[inicio_ciclo:passo + 1]
+                voltas, resto = divmod(MAX_PASSOS - (passo + 1), len(ciclo_r))
+                recompensa_acumulada += voltas * sum(ciclo_r) + sum(ciclo_r[:resto])
+                break
+            visitado_em[(env.x, env.y)] = passo + 1
+
+    return recompensa_acumulada, chegou
+
+def correr_treino_genetico_farol(
+    num_geracoes: int = GERACOES,
+    tamanho_populacao: int = POPULACAO,
+    exportador: Optional[ExportadorMetricas] = None,
+    seed: Optional[int] = None,
+):
     """
     Executa o ciclo de evolução (Algoritmo Genético) para o ambiente Farol.
+    Com `seed` (ou após `random.seed(...)`) a evolução é reprodutível: um
+    único Generator, derivado do `random`, é usado por todos os operadores.
     
     Processo:
     1. Inicializa uma população aleatória.
@@ -27,43 +89,36 @@ def correr_treino_genetico_farol():
     4. Aplica Seleção (Torneio) e Reprodução (Cruzamento/Mutação).
     5. Repete por N gerações.
     """
-    print(f"\n=== Iniciando Treino Genético: Farol ({GERACOES} Gerações) ===")
+    print(f"\n=== Iniciando Treino Genético: Farol ({num_geracoes} Gerações) ===")
     
     logger = MetricsLogger()
-    env = FarolEnvironment(tamanho=10)
+    if seed is not None:
+        random.seed(seed)
+    env = FarolEnvironment(tamanho=10, seed=seed)
+    rng = gerador()
+
+    # Cache de rollouts (cenário fixo + política determinística)
+    env.reset()
+    cache = CacheFitness(
+        impressao_digital("farol", env.N, (env.x, env.y), (env.farol_x, env.farol_y), MAX_PASSOS),
+        capacidade=CAPACIDADE_CACHE,
+    )
     
     # Geração 0: População Aleatória
-    populacao = [GeneticFarolAgent(i) for i in range(POPULACAO)]
+    populacao = [GeneticFarolAgent(i) for i in range(tamanho_populacao)]
 
     # Ciclo Evolutivo
-    for g in range(1, GERACOES + 1):
+    for g in range(1, num_geracoes + 1):
         scores: List[Tuple[float, GeneticFarolAgent, bool]] = []
         
         # 1. Avaliação da População
         for agente in populacao:
-            env.reset()
-            recompensa_acumulada = 0
-            chegou = False
-            
-            for _ in range(MAX_PASSOS):
-                # Construção do vetor de inputs 
-                info = {
-                    "x": env.x, 
-                    "y": env.y, 
-                    "farol_x": env.farol_x, 
-                    "farol_y": env.farol_y
-                }
-                
-                # Ciclo Perceção-Ação
-                accao = agente.age(env_info=info)
-                r, done, _ = env.agir(accao, agente)
-                
-                recompensa_acumulada += r
-                
-                if done: 
-                    chegou = True
-                    recompensa_acumulada += 100 
-                    break
+            # Elites e clones sem mutação reutilizam o resultado memorizado
+            resultado = cache.obter(agente.genoma)
+            if resultado is None:
+                resultado = simular_individuo(env, agente)
+                cache.guardar(agente.genoma, resultado)
+            recompensa_acumulada, chegou = resultado
             
             scores.append((recompensa_acumulada, agente, chegou))
 
@@ -74,7 +129,7 @@ def correr_treino_genetico_farol():
         melhor_fit = scores[0][0]
         n_sucessos = sum(1 for s in scores if s[2])
         
-        print(f"Gen {g:02d} | Melhor Fit: {melhor_fit:.2f} | Taxa Sucesso: {n_sucessos}/{POPULACAO}")
+        print(f"Gen {g:02d} | Melhor Fit: {melhor_fit:.2f} | Taxa Sucesso: {n_sucessos}/{tamanho_populacao} | Cache: {cache.taxa_acerto():.0%}")
 
         # 3. Registo de Métricas
         stats = EpisodioStats(
@@ -87,26 +142,28 @@ def correr_treino_genetico_farol():
         )
         logger.registar(stats)
         logger.guardar_csv("resultados_genetico_farol.csv") 
+        if exportador is not None:
+            exportador.geracao("Farol_Genetico", [s[0] for s in scores], n_sucessos)
 
-        # 4. Reprodução (Nova Geração)
-        nova_pop = []
-        
-        # 4.1. Elitismo: Preserva os melhores
-        elites = [s[1] for s in scores[:ELITISMO]]
-        for e in elites:
-            nova_pop.append(GeneticFarolAgent(e.id, list(e.genoma)))
-            
-        # 4.2. Seleção e Mutação (Preencher o resto da população)
-        while len(nova_pop) < POPULACAO:
-            # Seleção por Torneio (Tamanho 3)
-            pool = random.sample(scores, 3)
-            pai = max(pool, key=lambda x: x[0])[1]
-            
-            filho = GeneticFarolAgent(len(nova_pop), list(pai.genoma))
-            filho.mutar(taxa=TAXA_MUTACAO, forca=FORCA_MUTACAO)
-            nova_pop.append(filho)
-            
-        populacao = nova_pop
+        # 4. Reprodução (Nova Geração) - operadores vetorizados sobre a
+        #    matriz (população x genes): Elitismo, Torneio, Cruzamento e Mutação
+        genomas = np.array([s[1].genoma for s in scores])
+        fitness = np.array([s[0] for s in scores], dtype=np.float64)
+
+        nova_geracao = reproduzir_geracao(
+            genomas,
+            fitness,
+            elitismo=ELITISMO,
+            tamanho_torneio=TAMANHO_TORNEIO,
+            taxa_mutacao=TAXA_MUTACAO,
+            forca_mutacao=FORCA_MUTACAO,
+            limite=GeneticFarolAgent.LIMITE_GENE,
+            tipo_cruzamento=TIPO_CRUZAMENTO,
+            taxa_cruzamento=TAXA_CRUZAMENTO,
+            rng=rng,
+        )
+
+        populacao = [GeneticFarolAgent(i, genoma.tolist()) for i, genoma in enumerate(nova_geracao)]
 
     print("=== Treino Genético Concluído ===")
 
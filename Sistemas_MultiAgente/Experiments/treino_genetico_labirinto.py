@@ -1,51 +1,161 @@
 from __future__ import annotations
 import random
-from typing import Set, Tuple, List
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
 
 # Imports do Core e Ambiente
 from Envs import LabirintoEnvironment
 from Agents.genetic_agent import GeneticAgent
-from Metrics import MetricsLogger, EpisodioStats
+from Agents.operadores_geneticos import gerador, reproduzir_geracao
+from Agents.arquivo_novidade import ArquivoNovidade, bc_posicao_final, bc_histograma_visitas
+from Agents.cache_fitness import CacheFitness, impressao_digital
+from Metrics import ExportadorMetricas, MetricsLogger, EpisodioStats
 
 # --- Hiperparâmetros de Otimização ---
 POPULACAO = 150       # Dimensão da população
 GERACOES = 100        # Número de gerações
 MAX_PASSOS = 150      # Timeout por indivíduo
 ELITISMO = 15         # Número de indivíduos preservados (Top X)
-BONUS_NOVIDADE = 40.0 # Recompensa por explorar células novas
+PESO_NOVIDADE = 10.0  # Peso da novidade (distância média aos k vizinhos) na fitness
+K_VIZINHOS = 15       # Vizinhos considerados no cálculo da novidade
+CARACTERIZACAO = "posicao_final"  # Comportamento: "posicao_final" ou "histograma"
 TAXA_MUTACAO = 0.1
 FORCA_MUTACAO = 0.5
+TAMANHO_TORNEIO = 5   # Participantes por torneio de seleção
+TIPO_CRUZAMENTO = "uniforme"  # "uniforme", "um_ponto", "blend" ou None
+TAXA_CRUZAMENTO = 0.5         # Fração de filhos gerados por cruzamento
+CAPACIDADE_CACHE = 20000      # Máximo de rollouts memorizados (LRU)
+DETETAR_CICLOS = True         # Termina rollouts presos num ciclo (resultado idêntico)
 
-def obter_sensores(env: LabirintoEnvironment) -> List[int]:
+def obter_sensores(env: LabirintoEnvironment, destino: Optional[List[int]] = None) -> List[int]:
     """
     Simula sensores de proximidade (Lidar) lendo o mapa diretamente.
     Retorna: [Cima, Baixo, Esquerda, Direita] onde 1=Parede, 0=Livre.
+    Com `destino`, escreve nessa lista (reutilizada entre passos) e devolve-a.
     """
     x, y = env.agent_x, env.agent_y
     m = env.map
-    
-    return [
-        1 if m.is_parede(x, y-1) else 0, # Cima
-        1 if m.is_parede(x, y+1) else 0, # Baixo
-        1 if m.is_parede(x-1, y) else 0, # Esq
-        1 if m.is_parede(x+1, y) else 0  # Dir
-    ]
-
-def correr_treino_genetico_labirinto():
+    if destino is None:
+        destino = [0, 0, 0, 0]
+
+    destino[0] = 1 if m.is_parede(x, y-1) else 0 # Cima
+    destino[1] = 1 if m.is_parede(x, y+1) else 0 # Baixo
+    destino[2] = 1 if m.is_parede(x-1, y) else 0 # Esq
+    destino[3] = 1 if m.is_parede(x+1, y) else 0 # Dir
+    return destino
+
+def simular_individuo(
+    env: LabirintoEnvironment,
+    agente: GeneticAgent,
+    inicio: Tuple[int, int],
+    objetivo: Tuple[int, int],
+) -> Tuple[float, bool, List[Tuple[int, int]]]:
+    """
+    Corre a vida de um indivíduo no cenário fixo.
+
+    A política é uma função pura da posição (saída e paredes são fixas), logo
+    ao revisitar uma célula o agente fica preso num ciclo. Nesse caso o
+    episódio termina de imediato e os passos restantes são preenchidos
+    analiticamente, repetindo as recompensas e posições do ciclo, pelo que o
+    resultado é igual ao do rollout completo de MAX_PASSOS.
+
+    Returns:
+        (recompensa acumulada, chegou à saída, caminho percorrido incluindo o início)
+    """
+    env.agent_x, env.agent_y = inicio
+    env.saida_x, env.saida_y = objetivo
+
+    # Reset da memória do agente
+    agente._ultima_observacao = None
+
+    # Perceção Inicial
+    obs = env.observacaoPara(agente)
+    agente.observacao(obs)
+
+    caminho_percorrido = [inicio]
+    recompensa_acumulada = 0
+    chegou = False
+
+    # Deteção de ciclos: passo em que cada posição foi visitada e recompensas por passo
+    visitado_em = {inicio: 0}
+    recompensas = []
+    sensores = [0, 0, 0, 0]  # reescrito a cada passo
+
+    for passo in range(MAX_PASSOS):
+        # A. Leitura de Sensores
+        obter_sensores(env, sensores)
+
+        # B. Decisão (Forward Pass)
+        accao = agente.age(sensores_parede=sensores)
+
+        # C. Execução
+        r, done, _ = env.agir(accao, agente)
+
+        # Ajuste de Recompensa (Shaping): Suavizar penalidade de parede
+        if r == -5: r = -2
+
+        # D. Atualização
+        obs = env.observacaoPara(agente)
+        agente.observacao(obs)
+
+        recompensa_acumulada += r
+
+        # Registo de Exploração Local
+        caminho_percorrido.append((env.agent_x, env.agent_y))
+
+        if done and r > 0:
+            chegou = True
+            recompensa_acumulada += 2000 # Grande bónus por sucesso
+            break
+
+        if DETETAR_CICLOS:
+            pos = caminho_percorrido[-1]
+            recompensas.append(r)
+            inicio_ciclo = visitado_em.get(pos)
+            if inicio_ciclo is not None:
+                # Ciclo de comprimento L entre os passos inicio_ciclo e passo+1:
+                # os passos restantes repetem-no periodicamente
+                atual = passo + 1
+                ciclo_r = recompensas[inicio_ciclo:atual]
+                ciclo_pos = caminho_percorrido[inicio_ciclo + 1:atual + 1]
+                restantes = MAX_PASSOS - atual
+                voltas, resto = divmod(restantes, len(ciclo_r))
+
+                recompensa_acumulada += voltas * sum(ciclo_r) + sum(ciclo_r[:resto])
+                caminho_percorrido.extend((ciclo_pos * (voltas + 1))[:restantes])
+                env.agent_x, env.agent_y = caminho_percorrido[-1]
+                break
+            visitado_em[pos] = passo + 1
+
+    return recompensa_acumulada, chegou, caminho_percorrido
+
+def correr_treino_genetico_labirinto(
+    num_geracoes: int = GERACOES,
+    tamanho_populacao: int = POPULACAO,
+    exportador: Optional[ExportadorMetricas] = None,
+    seed: Optional[int] = None,
+):
     """
     Executa o Algoritmo Genético com Novelty Search no ambiente Labirinto.
+    Com `seed` (ou após `random.seed(...)`) a evolução é reprodutível: um
+    único Generator, derivado do `random`, é usado por todos os operadores.
     
     Destaques:
     - Mapa Fixo: Garante que a evolução resolve um problema estático.
-    - Novelty Search: Recompensa agentes que visitam coordenadas inéditas.
+    - Novelty Search: Recompensa agentes cujo comportamento (posição final ou
+      histograma de visitas) está longe dos k vizinhos mais próximos no arquivo.
     - Fitness Híbrida: Combina Recompensa (Objetivo) + Novidade (Exploração).
     """
     print(f"\n=== Iniciando Evolução Labirinto (Novelty Search) ===")
     
     # 1. Configuração do Ambiente e Logger
+    if seed is not None:
+        random.seed(seed)
     logger = MetricsLogger()
-    env = LabirintoEnvironment()
+    env = LabirintoEnvironment(seed=seed)
     env.reset()
+    rng = gerador()
     
     # Fixação do Cenário (Essencial para convergência do AG)
     start_x, start_y = 1, 1
@@ -62,131 +172,118 @@ def correr_treino_genetico_labirinto():
     goal_x, goal_y = env.saida_x, env.saida_y
     
     print(f"--> Mapa: Início({start_x},{start_y}) -> Saída({goal_x},{goal_y})")
-    print(f"--> Config: Pop={POPULACAO}, Gens={GERACOES}, Elitismo={ELITISMO}")
+    print(f"--> Config: Pop={tamanho_populacao}, Gens={num_geracoes}, Elitismo={ELITISMO}")
 
-    # Arquivo de Novidade (Memória Global de Exploração)
-    arquivo_novidade: Set[Tuple[int, int]] = set()
+    # Cache de rollouts: o cenário é fixo e a política determinística, logo
+    # elites e clones sem mutação repetem exatamente o mesmo episódio
+    cache = CacheFitness(
+        impressao_digital(
+            "labirinto", env.map.grelha, env.map.saida_actual(),
+            (start_x, start_y), (goal_x, goal_y), MAX_PASSOS,
+        ),
+        capacidade=CAPACIDADE_CACHE,
+    )
+
+    # Arquivo de Novidade (comportamentos indexados numa árvore k-d)
+    arquivo_novidade = ArquivoNovidade(k=K_VIZINHOS)
+
+    # Células visitadas por qualquer agente (apenas para estatística)
+    celulas_exploradas: Set[Tuple[int, int]] = set()
     
     # Inicialização da População (Aleatória)
-    populacao = [GeneticAgent(i) for i in range(POPULACAO)]
+    populacao = [GeneticAgent(i) for i in range(tamanho_populacao)]
 
     # --- Ciclo Evolutivo ---
-    for g in range(1, GERACOES + 1):
-        scores = []
+    for g in range(1, num_geracoes + 1):
+        resultados = []
+        comportamentos = []
         sucessos_nesta_geracao = 0
         
+        # 2-3. Simulação (Vida de cada Agente)
         for agente in populacao:
-            # 2. Configuração do Episódio
-            env.agent_x = start_x
-            env.agent_y = start_y
-            env.saida_x = goal_x
-            env.saida_y = goal_y
-            
-            # Reset da memória do agente
-            agente._ultima_observacao = None
-            
-            # Perceção Inicial
-            obs = env.observacaoPara(agente)
-            agente.observacao(obs)
-            
-            caminho_percorrido = set()
-            caminho_percorrido.add((start_x, start_y))
-            
-            recompensa_acumulada = 0
-            chegou = False
-            
-            # 3. Simulação (Vida do Agente)
-            for _ in range(MAX_PASSOS):
-                # A. Leitura de Sensores
-                sensores = obter_sensores(env)
-                
-                # B. Decisão (Forward Pass)
-                accao = agente.age(sensores_parede=sensores)
-                
-                # C. Execução
-                r, done, _ = env.agir(accao, agente)
-                
-                # Ajuste de Recompensa (Shaping): Suavizar penalidade de parede
-                if r == -5: r = -2 
-                
-                # D. Atualização
-                obs = env.observacaoPara(agente)
-                agente.observacao(obs)
-                
-                recompensa_acumulada += r
-                
-                # Registo de Exploração Local
-                pos = (env.agent_x, env.agent_y)
-                caminho_percorrido.add(pos)
-                
-                if done and r > 0: 
-                    chegou = True
-                    sucessos_nesta_geracao += 1
-                    recompensa_acumulada += 2000 # Grande bónus por sucesso
-                    break
-            
-            # 4. Cálculo do Fitness (Avaliação)
-            
-            # 4.1. Fator Novidade
-            novidade = 0
-            for pos in caminho_percorrido:
-                if pos not in arquivo_novidade:
-                    novidade += BONUS_NOVIDADE
-                    arquivo_novidade.add(pos)
-            
-            # 4.2. Fator Distância (Heurística de Orientação)
-            dist = abs(goal_x - env.agent_x) + abs(goal_y - env.agent_y)
-            
-            # 4.3. Função de Fitness Composta
-            # Fitness = Recompensa + Exploração - CustoDistância
-            fitness = recompensa_acumulada + novidade - (dist * 5)
-            
+            resultado = cache.obter(agente.genoma)
+            if resultado is None:
+                recompensa_acumulada, chegou, caminho = simular_individuo(
+                    env, agente, (start_x, start_y), (goal_x, goal_y)
+                )
+                resultado = (recompensa_acumulada, chegou, tuple(caminho))
+                cache.guardar(agente.genoma, resultado)
+            recompensa_acumulada, chegou, caminho = resultado
+            final_x, final_y = caminho[-1]
+
+            if chegou:
+                sucessos_nesta_geracao += 1
+            celulas_exploradas.update(caminho)
+
+            # Caracterização do comportamento para o Novelty Search
+            if CARACTERIZACAO == "histograma":
+                bc = bc_histograma_visitas(caminho, env.map.largura, env.map.altura)
+            else:
+                bc = bc_posicao_final(final_x, final_y)
+            comportamentos.append(bc)
+
+            # Fator Distância (Heurística de Orientação)
+            dist = abs(goal_x - final_x) + abs(goal_y - final_y)
+            resultados.append((recompensa_acumulada, dist, chegou))
+
+        # 4. Cálculo do Fitness (Avaliação)
+        
+        # 4.1. Fator Novidade: distância média aos k vizinhos mais próximos
+        #      (arquivo + população atual), calculada para toda a geração
+        comportamentos = np.array(comportamentos)
+        novidades = arquivo_novidade.novidade(comportamentos)
+        arquivo_novidade.atualizar(comportamentos, novidades)
+        
+        # 4.2. Função de Fitness Composta
+        # Fitness = Recompensa + Exploração - CustoDistância
+        scores = []
+        for agente, (recompensa_acumulada, dist, chegou), novidade in zip(populacao, resultados, novidades):
+            fitness = recompensa_acumulada + PESO_NOVIDADE * novidade - (dist * 5)
             scores.append((fitness, agente, chegou))
 
         # 5. Estatísticas e Logs
         scores.sort(key=lambda x: x[0], reverse=True) # Ordenar (Melhor -> Pior)
         melhor_fit = scores[0][0]
         
-        print(f"Gen {g:03d} | Fit: {int(melhor_fit)} | Sucesso: {sucessos_nesta_geracao}/{POPULACAO} | Explorados: {len(arquivo_novidade)}")
+        print(f"Gen {g:03d} | Fit: {int(melhor_fit)} | Sucesso: {sucessos_nesta_geracao}/{tamanho_populacao} | Explorados: {len(celulas_exploradas)} | Arquivo: {len(arquivo_novidade)} | Cache: {cache.taxa_acerto():.0%}")
         
         stats = EpisodioStats(
             experiencia="Gen_Labirinto_Novelty",
             episodio=g,
-            passos=len(arquivo_novidade), # Guardamos nº células exploradas no campo 'passos'
+            passos=len(celulas_exploradas), # Guardamos nº células exploradas no campo 'passos'
             recompensa_total=melhor_fit,
             recompensa_descontada=0.0,
             sucesso=sucessos_nesta_geracao
         )
         logger.registar(stats)
         logger.guardar_csv("resultados_genetico_labirinto.csv")
+        if exportador is not None:
+            exportador.geracao("Gen_Labirinto_Novelty", [s[0] for s in scores], sucessos_nesta_geracao)
 
         # Critério de Convergência Antecipada
-        if sucessos_nesta_geracao > POPULACAO * 0.95:
+        if sucessos_nesta_geracao > tamanho_populacao * 0.95:
             print(">>> População convergiu (>95% sucesso). Parando treino.")
             break
 
-        # 6. Reprodução (Nova Geração)
-        nova_pop = []
-        
-        # 6.1. Elitismo
-        elites = [s[1] for s in scores[:ELITISMO]]
-        for e in elites:
-            nova_pop.append(GeneticAgent(e.id, list(e.genoma)))
-            
-        # 6.2. Cruzamento e Mutação
-        while len(nova_pop) < POPULACAO:
-            # Seleção por Torneio (5 participantes)
-            pool = random.sample(scores, 5)
-            pai = max(pool, key=lambda x: x[0])[1]
-            
-            # Clonagem
-            filho = GeneticAgent(len(nova_pop), list(pai.genoma))
-            
-            # Mutação
-            filho.mutar(taxa=TAXA_MUTACAO, forca=FORCA_MUTACAO)
-            nova_pop.append(filho)
-            
-        populacao = nova_pop
+        # 6. Reprodução (Nova Geração) - Elitismo, Torneio, Cruzamento e
+        #    Mutação vetorizados sobre a matriz (população x genes)
+        genomas = np.array([s[1].genoma for s in scores])
+        fitness = np.array([s[0] for s in scores], dtype=np.float64)
+
+        nova_geracao = reproduzir_geracao(
+            genomas,
+            fitness,
+            elitismo=ELITISMO,
+            tamanho_torneio=TAMANHO_TORNEIO,
+            taxa_mutacao=TAXA_MUTACAO,
+            forca_mutacao=FORCA_MUTACAO,
+            limite=GeneticAgent.LIMITE_GENE,
+            tipo_cruzamento=TIPO_CRUZAMENTO,
+            taxa_cruzamento=TAXA_CRUZAMENTO,
+            rng=rng,
+        )
+
+        populacao = [GeneticAgent(i, genoma.tolist()) for i, genoma in enumerate(nova_geracao)]
 
     print("=== Evolução Concluída ===")
 
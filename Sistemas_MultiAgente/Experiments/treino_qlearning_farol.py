@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import Tuple
+from typing import Optional, Tuple
 
 from Agents import QLearningFarolAgent, GreedyFarolAgent
 from Envs import FarolEnvironment
-from Metrics import EpisodioStats, MetricsLogger
+from Metrics import EpisodioStats, ExportadorMetricas, MetricsLogger
+from .avaliacao_paralela import avaliar_paralelo
 
 
 def _correr_episodio_farol(
@@ -81,10 +82,19 @@ def correr_treino_farol(
     num_episodios_teste_greedy: int = 40,
     max_passos: int = 100,
     caminho_csv: str = "resultados_qlearning_farol.csv",
+    exportador: Optional[ExportadorMetricas] = None,
+    num_workers_teste: int = 1,
+    seed_teste: Optional[int] = None,
 ) -> None:
     """
     Corre as 3 fases de simulação (Treino QL, Teste QL, Teste Greedy)
-    e garante que todas as métricas são registadas no Logger.
+    e garante que todas as métricas são registadas no Logger (e, se
+    indicado, no exportador de métricas em tempo real).
+
+    Com `num_workers_teste` > 1 as fases de teste (políticas fixas) são
+    avaliadas em paralelo com `avaliar_paralelo`. Com `seed_teste` também
+    (mesmo com um só worker), com uma seed por episódio: os resultados dos
+    testes são reprodutíveis e não dependem do número de workers.
     """
 
     env = FarolEnvironment()
@@ -105,7 +115,9 @@ def correr_treino_farol(
             modo_aprendizagem=True,
             max_passos=max_passos,
         )
-        logger.registar(stats) 
+        logger.registar(stats)
+        if exportador is not None:
+            exportador.episodio(stats, [ql_agent])
 
     # ========================== 2. TESTE (QL pré-treinado) ======================= #
     experiencia_teste_ql = "Farol_QL_Teste"
@@ -113,31 +125,49 @@ def correr_treino_farol(
 
     ql_agent.epsilon = 0.0 # Desativa exploração para teste
 
-    for ep in range(1, num_episodios_teste_ql + 1):
-        stats = _correr_episodio_farol(
-            env,
-            ql_agent, # Agente QL
-            experiencia_nome=experiencia_teste_ql,
-            numero_episodio=ep,
-            modo_aprendizagem=False, # Modo Teste
-            max_passos=max_passos,
+    if num_workers_teste > 1 or seed_teste is not None:
+        avaliar_paralelo(
+            FarolEnvironment, ql_agent, experiencia_teste_ql, num_episodios_teste_ql,
+            max_passos=max_passos, num_workers=num_workers_teste, seed=seed_teste,
+            logger=logger, exportador=exportador,
         )
-        logger.registar(stats) 
+    else:
+        for ep in range(1, num_episodios_teste_ql + 1):
+            stats = _correr_episodio_farol(
+                env,
+                ql_agent, # Agente QL
+                experiencia_nome=experiencia_teste_ql,
+                numero_episodio=ep,
+                modo_aprendizagem=False, # Modo Teste
+                max_passos=max_passos,
+            )
+            logger.registar(stats)
+            if exportador is not None:
+                exportador.episodio(stats, [ql_agent])
 
     # ========================== 3. TESTE (Greedy) ======================= #
     experiencia_teste_greedy = "Farol_Greedy_Teste"
     print(f"\n### {experiencia_teste_greedy} – MODO TESTE (Política Greedy Fixa) ###")
-    
-    for ep in range(1, num_episodios_teste_greedy + 1):
-        stats = _correr_episodio_farol(
-            env,
-            greedy_agent, # Agente Greedy
-            experiencia_nome=experiencia_teste_greedy,
-            numero_episodio=ep,
-            modo_aprendizagem=False, # Não aprende
-            max_passos=max_passos,
+
+    if num_workers_teste > 1 or seed_teste is not None:
+        avaliar_paralelo(
+            FarolEnvironment, greedy_agent, experiencia_teste_greedy, num_episodios_teste_greedy,
+            max_passos=max_passos, num_workers=num_workers_teste, seed=seed_teste,
+            logger=logger, exportador=exportador,
         )
-        logger.registar(stats) 
+    else:
+        for ep in range(1, num_episodios_teste_greedy + 1):
+            stats = _correr_episodio_farol(
+                env,
+                greedy_agent, # Agente Greedy
+                experiencia_nome=experiencia_teste_greedy,
+                numero_episodio=ep,
+                modo_aprendizagem=False, # Não aprende
+                max_passos=max_passos,
+            )
+            logger.registar(stats)
+            if exportador is not None:
+                exportador.episodio(stats, [greedy_agent])
 
     logger.guardar_csv(caminho_csv)
     print(f"[CSV] Métricas guardadas em: {caminho_csv}")
\ No newline at end of file
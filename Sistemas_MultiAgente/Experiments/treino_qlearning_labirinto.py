@@ -1,9 +1,11 @@
 from __future__ import annotations
+from typing import Optional
 
 from Core import Simulator
 from Envs import LabirintoEnvironment
-from Agents import QLearningLabirintoAgent
-from Metrics import MetricsLogger
+from Agents import QLearningLabirintoAgent, PolicyAgent, PublicadorPolitica
+from Metrics import ExportadorMetricas, MetricsLogger
+from .avaliacao_paralela import avaliar_paralelo
 
 
 def correr_treino_labirinto(
@@ -11,21 +13,40 @@ def correr_treino_labirinto(
     num_episodios_teste: int = 50,
     max_passos: int = 1000,
     caminho_csv: str = "resultados_qlearning_labirinto.csv",
+    exportador: Optional[ExportadorMetricas] = None,
+    todos_objetivos: bool = False,
+    num_workers_teste: int = 1,
+    seed_teste: Optional[int] = None,
+    caminho_live: Optional[str] = None,
+    intervalo_live: float = 2.0,
 ) -> None:
     """
     Executa o ciclo completo de Treino e Validação do Q-Learning no Labirinto.
     Inclui fases de treino, teste com o agente treinado e teste com agente 'baseline'.
+
+    Com `todos_objetivos`, cada transição atualiza a Q-table de todas as
+    saídas possíveis (relabelling), o que exige muito menos episódios.
+    Com `num_workers_teste` > 1 as fases de teste (políticas fixas) são
+    avaliadas em paralelo com `avaliar_paralelo`. Com `seed_teste` também
+    (mesmo com um só worker), com uma seed por episódio: os resultados dos
+    testes são reprodutíveis e não dependem do número de workers.
+    Com `caminho_live`, a política greedy é publicada nesse ficheiro a cada
+    `intervalo_live` segundos durante o treino (ver `demo_labirinto`).
     """
 
     # --- Inicialização ---
     env = LabirintoEnvironment()
+    m = env.map
     agent = QLearningLabirintoAgent(
         agent_id=1,
         alpha=0.1,
         gamma=0.9,
         epsilon=0.3,
+        objetivos=m.celulas_livres() if todos_objetivos else None,
+        dimensoes=(m.largura, m.altura),
     )
     logger = MetricsLogger()
+    limites_estado = [(0, m.largura - 1), (0, m.altura - 1)] * 2  # (x, y, sx, sy)
 
     
     # --- FASE 1: TREINO (QL) ---
@@ -33,6 +54,11 @@ def correr_treino_labirinto(
     experiencia_treino = "Labirinto_Treino"
     print(f"### {experiencia_treino} – MODO APRENDIZAGEM ###")
 
+    publicador = None
+    if caminho_live:
+        publicador = PublicadorPolitica(caminho_live, limites_estado, intervalo=intervalo_live)
+        print(f"[Live] Política publicada em {caminho_live} a cada {intervalo_live:g}s")
+
     sim_treino = Simulator(
         ambiente=env,
         agentes=[agent],
@@ -41,8 +67,32 @@ def correr_treino_labirinto(
         max_passos=max_passos,
         modo_aprendizagem=True,
         logger=logger,
+        exportador=exportador,
+        publicador=publicador,
     )
     sim_treino.executa()
+    if publicador is not None:
+        publicador.fechar()  # versão final
+
+    def avaliar(agente, experiencia: str) -> None:
+        if num_workers_teste > 1 or seed_teste is not None:
+            avaliar_paralelo(
+                LabirintoEnvironment, agente, experiencia, num_episodios_teste,
+                max_passos=max_passos, num_workers=num_workers_teste, seed=seed_teste, detetar_ciclos=True,
+                logger=logger, exportador=exportador,
+            )
+            return
+        Simulator(
+            ambiente=env,
+            agentes=[agente],
+            nome_experiencia=experiencia,
+            num_episodios=num_episodios_teste,
+            max_passos=max_passos,
+            modo_aprendizagem=False,
+            logger=logger,
+            exportador=exportador,
+            detetar_ciclos=True,  # política fixa: termina episódios presos em ciclos
+        ).executa()
 
     
     # --- FASE 2: TESTE (QL TREINADO) ---
@@ -50,39 +100,27 @@ def correr_treino_labirinto(
     experiencia_teste_ql = "Labirinto_Teste_QL"
     print(f"\n### {experiencia_teste_ql} – MODO TESTE (QL Treinado) ###")
 
-    # Política fixa: Aproveitamento Puro (sem exploração)
+    # Política fixa: Aproveitamento Puro (sem exploração), compilada numa
+    # tabela densa (argmax Q por estado) para avaliação por simples lookup
     agent.epsilon = 0.0
+    politica = agent.compilar_politica(limites_estado)
+    agent_politica = PolicyAgent(agent_id=1, politica=politica)
 
-    sim_teste_ql = Simulator(
-        ambiente=env,
-        agentes=[agent],
-        nome_experiencia=experiencia_teste_ql,
-        num_episodios=num_episodios_teste,
-        max_passos=max_passos,
-        modo_aprendizagem=False,
-        logger=logger,
-    )
-    sim_teste_ql.executa()
+    avaliar(agent_politica, experiencia_teste_ql)
 
 
     # --- FASE 3: TESTE DE CONTROLO (BASELINE / NÃO TREINADO) ---
     
     # Cria uma nova instância do agente (Q-Table vazia) para comparação.
     agent_nao_treinado = QLearningLabirintoAgent(agent_id=2, epsilon=0.0) 
+    agent_nao_treinado = PolicyAgent(
+        agent_id=2, politica=agent_nao_treinado.compilar_politica(limites_estado)
+    )
 
     experiencia_teste_nao_treinado = "Labirinto_Teste_Nao_Treinado"
     print(f"\n### {experiencia_teste_nao_treinado} – PROVA DE VALOR (Baseline) ###")
 
-    sim_teste_nao_treinado = Simulator(
-        ambiente=env,
-        agentes=[agent_nao_treinado], 
-        nome_experiencia=experiencia_teste_nao_treinado,
-        num_episodios=num_episodios_teste,
-        max_passos=max_passos,
-        modo_aprendizagem=False,
-        logger=logger,
-    )
-    sim_teste_nao_treinado.executa() 
+    avaliar(agent_nao_treinado, experiencia_teste_nao_treinado)
 
     
     # --- Gravação de Resultados ---
@@ -93,6 +131,9 @@ def correr_treino_labirinto(
     agent.save_qtable("qtable_labirinto.pkl")
     print("[Q] Q-table do labirinto guardada em qtable_labirinto.pkl")
 
+    politica.guardar("politica_labirinto.npz")
+    print("[Q] Política compilada guardada em politica_labirinto.npz")
+
 
 if __name__ == "__main__":
     correr_treino_labirinto()
\ No newline at end of file
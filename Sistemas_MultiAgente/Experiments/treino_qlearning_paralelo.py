@@ -0,0 +1,181 @@
+from __future__ import annotations
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+from contextlib import redirect_stdout
+from typing import Optional
+
+from Core import Simulator
+from Envs import LabirintoEnvironment
+from Agents import QLearningLabirintoAgent, QLearningPartilhadoAgent, TabelaQPartilhada
+from Metrics import EpisodioStats, MetricsLogger
+
+# Decaimento de epsilon por episódio concluído (igual ao de QLearningAgentBase)
+DECAIMENTO_EPSILON = 0.995
+EPSILON_MINIMO = 0.01
+
+# Episódios entre linhas de progresso no processo principal
+INTERVALO_PROGRESSO = 1000
+
+
+class _LoggerFila:
+    """Logger do worker: envia cada EpisodioStats para o processo principal."""
+
+    def __init__(self, fila: mp.Queue) -> None:
+        self.fila = fila
+
+    def registar(self, stats: EpisodioStats) -> None:
+        self.fila.put(stats)
+
+
+def _worker(
+    indice: int,
+    nome_tabela: str,
+    limites: list,
+    num_episodios: int,
+    max_passos: int,
+    alpha: float,
+    gamma: float,
+    seed: Optional[int],
+    fila: mp.Queue,
+) -> None:
+    """
+    Corre `num_episodios` de treino sobre a Q-table partilhada. Com `seed`,
+    o worker usa `seed + indice` no `random` (exploração) e no ambiente
+    (sequência de saídas).
+    """
+    seed_worker = None if seed is None else seed + indice
+    if seed_worker is not None:
+        random.seed(seed_worker)
+
+    tabela = None
+    try:
+        tabela = TabelaQPartilhada(limites, 4, nome=nome_tabela)
+        env = LabirintoEnvironment(seed=seed_worker)
+        agente = QLearningPartilhadoAgent(indice + 1, tabela, alpha=alpha, gamma=gamma)
+        sim = Simulator(
+            ambiente=env,
+            agentes=[agente],
+            nome_experiencia="Labirinto_Treino_Paralelo",
+            num_episodios=num_episodios,
+            max_passos=max_passos,
+            modo_aprendizagem=True,
+            logger=_LoggerFila(fila),
+        )
+        # O progresso é reportado pelo processo principal
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            sim.executa()
+    finally:
+        fila.put(None)  # sinal de fim deste worker
+        if tabela is not None:
+            tabela.fechar()
+
+
+def correr_treino_labirinto_paralelo(
+    num_workers: Optional[int] = None,
+    num_episodios_treino: int = 50000,
+    max_passos: int = 1000,
+    alpha: float = 0.1,
+    gamma: float = 0.9,
+    epsilon: float = 0.3,
+    seed: Optional[int] = None,
+    caminho_qtable: str = "qtable_labirinto.pkl",
+    caminho_csv: Optional[str] = "resultados_qlearning_labirinto_paralelo.csv",
+) -> QLearningLabirintoAgent:
+    """
+    Treino Q-Learning do Labirinto em vários processos (estilo Hogwild).
+
+    Cada worker corre o seu `LabirintoEnvironment` e episódios epsilon-greedy,
+    aplicando atualizações TD sem locks numa Q-table densa partilhada
+    (`TabelaQPartilhada`). O processo principal agrega os `EpisodioStats`
+    recebidos por uma fila, faz o decaimento global de epsilon (um passo por
+    episódio concluído, em qualquer worker) e, no fim, converte a tabela para
+    um `QLearningLabirintoAgent` e guarda-a com `save_qtable`.
+
+    Com `seed`, cada worker usa `seed + índice` na exploração e no ambiente
+    (mapa e sequência de saídas). O decaimento global de epsilon e a ordem
+    das atualizações dependem do escalonamento dos processos, pelo que a
+    Q-table final não é reprodutível bit a bit.
+
+    Returns:
+        O agente com a Q-table final (formato dict habitual).
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    m = LabirintoEnvironment().map
+    limites = [(0, m.largura - 1), (0, m.altura - 1)] * 2  # (x, y, sx, sy)
+
+    tabela = TabelaQPartilhada(limites, 4)
+    tabela.epsilon = epsilon
+    fila: mp.Queue = mp.Queue()
+    logger = MetricsLogger(janela=INTERVALO_PROGRESSO)
+
+    print(f"### Labirinto_Treino_Paralelo – {num_workers} workers, {num_episodios_treino} episódios ###")
+    inicio = time.perf_counter()
+
+    # Divide os episódios pelos workers
+    quotas = [num_episodios_treino // num_workers] * num_workers
+    for i in range(num_episodios_treino % num_workers):
+        quotas[i] += 1
+
+    processos = [
+        mp.Process(
+            target=_worker,
+            args=(i, tabela.nome, limites, quotas[i], max_passos, alpha, gamma, seed, fila),
+            daemon=True,
+        )
+        for i in range(num_workers) if quotas[i] > 0
+    ]
+    try:
+        for p in processos:
+            p.start()
+
+        ativos = len(processos)
+        concluidos = 0
+        while ativos:
+            try:
+                stats = fila.get(timeout=5.0)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processos):
+                    break  # worker terminou sem sinalizar (ex: morto pelo SO)
+                continue
+            if stats is None:
+                ativos -= 1
+                continue
+
+            # Renumera pela ordem de conclusão global
+            concluidos += 1
+            stats.episodio = concluidos
+            logger.registar(stats)
+
+            tabela.epsilon = max(EPSILON_MINIMO, tabela.epsilon * DECAIMENTO_EPSILON)
+
+            if concluidos % INTERVALO_PROGRESSO == 0:
+                resumo = logger.resumo()
+                print(
+                    f"  {concluidos} episódios | sucesso {resumo['taxa_sucesso']:.0%} "
+                    f"| passos {resumo['passos_medios']:.1f} | epsilon {tabela.epsilon:.3f}"
+                )
+
+        for p in processos:
+            p.join()
+
+        agente = QLearningLabirintoAgent(agent_id=1, alpha=alpha, gamma=gamma, epsilon=tabela.epsilon)
+        agente.q = tabela.para_dict(agente.acoes_possiveis())
+    finally:
+        tabela.destruir()
+
+    duracao = time.perf_counter() - inicio
+    print(f"### Treino paralelo concluído em {duracao:.1f}s ({concluidos / duracao:.0f} episódios/s) ###")
+
+    if caminho_csv:
+        logger.guardar_csv(caminho_csv)
+
+    agente.save_qtable(caminho_qtable)
+    print(f"[Q] Q-table do labirinto guardada em {caminho_qtable}")
+    return agente
+
+
+if __name__ == "__main__":
+    correr_treino_labirinto_paralelo()
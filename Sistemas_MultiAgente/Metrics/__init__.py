@@ -1,7 +1,17 @@
 from .episodio_stats import EpisodioStats
+from .estatisticas_online import EstatisticasOnline, JanelaMovel, MediaExponencial
+from .exportador import ExportadorMetricas
 from .metrics_logger import MetricsLogger
+from .trajetorias import GravadorTrajetorias, LeitorTrajetorias, Trajetoria
 
 __all__ = [
     "EpisodioStats",
+    "EstatisticasOnline",
+    "ExportadorMetricas",
+    "JanelaMovel",
+    "MediaExponencial",
     "MetricsLogger",
+    "GravadorTrajetorias",
+    "LeitorTrajetorias",
+    "Trajetoria",
 ]
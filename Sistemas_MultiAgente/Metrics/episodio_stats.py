@@ -2,10 +2,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class EpisodioStats:
     """
     Estatísticas de um episódio de uma experiência.
+    Sem __dict__ por instância (slots): o MetricsLogger guarda os valores em
+    colunas tipadas e só recria estes objetos quando pedidos.
 
     Campos:
       - experiencia: nome da experiência (ex.: "Farol_Treino")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+import math
+from array import array
+from typing import Dict, Optional
+
+from .episodio_stats import EpisodioStats
+
+
+class JanelaMovel:
+    """
+    Média e variância dos últimos `tamanho` valores, em O(1) por valor.
+
+    Buffer circular com atualização de Welford para janela deslizante: ao
+    substituir o valor mais antigo pelo novo, a média e a soma dos quadrados
+    dos desvios (M2) são corrigidas sem percorrer a janela.
+    """
+
+    __slots__ = ("tamanho", "_valores", "_pos", "n", "media", "_m2")
+
+    def __init__(self, tamanho: int) -> None:
+        if tamanho < 1:
+            raise ValueError("A janela tem de ter pelo menos 1 valor.")
+        self.tamanho = tamanho
+        self._valores = array("d", bytes(8 * tamanho))
+        self._pos = 0
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+
+    def adicionar(self, x: float) -> None:
+        if self.n < self.tamanho:
+            # Janela a encher: Welford clássico
+            self.n += 1
+            delta = x - self.media
+            self.media += delta / self.n
+            self._m2 += delta * (x - self.media)
+        else:
+            antigo = self._valores[self._pos]
+            media_antiga = self.media
+            self.media += (x - antigo) / self.n
+            self._m2 += (x - antigo) * (x - self.media + antigo - media_antiga)
+            if self._m2 < 0.0:
+                self._m2 = 0.0  # erro de arredondamento
+        self._valores[self._pos] = x
+        self._pos = (self._pos + 1) % self.tamanho
+
+    @property
+    def variancia(self) -> float:
+        """Variância amostral da janela (0.0 com menos de 2 valores)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desvio_padrao(self) -> float:
+        return math.sqrt(self.variancia)
+
+
+class MediaExponencial:
+    """Média móvel exponencial: ema <- ema + alpha * (x - ema)."""
+
+    __slots__ = ("alpha", "valor")
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self.valor: Optional[float] = None
+
+    def adicionar(self, x: float) -> None:
+        self.valor = x if self.valor is None else self.valor + self.alpha * (x - self.valor)
+
+
+class EstatisticasOnline:
+    """
+    Estatísticas incrementais de uma experiência, consultáveis a qualquer
+    momento em O(1) e sem guardar o histórico completo:
+
+      - média/desvio padrão em janela da recompensa total e dos passos;
+      - taxa de sucesso em janela;
+      - melhor recompensa até ao momento (e o episódio onde ocorreu);
+      - médias exponenciais da recompensa e do sucesso;
+      - média/desvio padrão globais (Welford).
+    """
+
+    def __init__(self, janela: int = 50, alpha_ema: float = 0.05) -> None:
+        self.episodios = 0
+        self.recompensa = JanelaMovel(janela)
+        self.passos = JanelaMovel(janela)
+        self.sucesso = JanelaMovel(janela)
+        self.ema_recompensa = MediaExponencial(alpha_ema)
+        self.ema_sucesso = MediaExponencial(alpha_ema)
+
+        self.melhor_recompensa = -math.inf
+        self.melhor_episodio: Optional[int] = None
+        self.menos_passos: Optional[int] = None  # entre episódios com sucesso
+
+        # Welford global
+        self._media = 0.0
+        self._m2 = 0.0
+
+    def atualizar(self, stats: EpisodioStats) -> None:
+        r = stats.recompensa_total
+        self.episodios += 1
+        self.recompensa.adicionar(r)
+        self.passos.adicionar(stats.passos)
+        self.sucesso.adicionar(stats.sucesso)
+        self.ema_recompensa.adicionar(r)
+        self.ema_sucesso.adicionar(stats.sucesso)
+
+        if r > self.melhor_recompensa:
+            self.melhor_recompensa = r
+            self.melhor_episodio = stats.episodio
+        if stats.sucesso and (self.menos_passos is None or stats.passos < self.menos_passos):
+            self.menos_passos = stats.passos
+
+        delta = r - self._media
+        self._media += delta / self.episodios
+        self._m2 += delta * (r - self._media)
+
+    @property
+    def media_global(self) -> float:
+        return self._media
+
+    @property
+    def desvio_global(self) -> float:
+        return math.sqrt(self._m2 / (self.episodios - 1)) if self.episodios > 1 else 0.0
+
+    def resumo(self) -> Dict[str, float]:
+        """Valores atuais num dicionário (para logs e condições de paragem)."""
+        return {
+            "episodios": self.episodios,
+            "recompensa_media": self.recompensa.media,
+            "recompensa_desvio": self.recompensa.desvio_padrao,
+            "passos_medios": self.passos.media,
+            "taxa_sucesso": self.sucesso.media,
+            "recompensa_ema": self.ema_recompensa.valor if self.ema_recompensa.valor is not None else 0.0,
+            "sucesso_ema": self.ema_sucesso.valor if self.ema_sucesso.valor is not None else 0.0,
+            "melhor_recompensa": self.melhor_recompensa,
+            "melhor_episodio": self.melhor_episodio,
+            "menos_passos": self.menos_passos,
+            "recompensa_media_global": self._media,
+            "recompensa_desvio_global": self.desvio_global,
+        }
@@ -0,0 +1,314 @@
+"""
+Exportação de métricas em tempo real (throughput e aprendizagem).
+
+O `ExportadorMetricas` recebe um registo por episódio (Simulator) ou por
+geração (algoritmos genéticos) e, a cada `intervalo` segundos, publica um
+snapshot em formato de texto Prometheus (`<caminho>.prom`) e JSON
+(`<caminho>.json`). Opcionalmente serve o último snapshot num endpoint HTTP
+local (`/metrics` e `/metrics.json`).
+
+O custo no ciclo de treino é o de uma atualização O(1) por episódio e uma
+leitura do relógio; epsilon e tamanho da Q-table só são lidos ao publicar.
+"""
+from __future__ import annotations
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .episodio_stats import EpisodioStats
+from .estatisticas_online import EstatisticasOnline
+
+PREFIXO = "sma"
+
+# nome -> (tipo Prometheus, descrição)
+METRICAS: Dict[str, Tuple[str, str]] = {
+    "episodios_total": ("counter", "Episódios concluídos."),
+    "passos_total": ("counter", "Passos de simulação executados."),
+    "episodios_por_segundo": ("gauge", "Episódios por segundo desde o último snapshot."),
+    "passos_por_segundo": ("gauge", "Passos por segundo desde o último snapshot."),
+    "epsilon": ("gauge", "Epsilon atual do primeiro agente que o tem."),
+    "qtable_tamanho": ("gauge", "Entradas da Q-table do primeiro agente que a tem."),
+    "recompensa_media_movel": ("gauge", "Média da recompensa total na janela móvel."),
+    "recompensa_desvio_movel": ("gauge", "Desvio padrão da recompensa total na janela móvel."),
+    "taxa_sucesso_movel": ("gauge", "Taxa de sucesso na janela móvel."),
+    "melhor_recompensa": ("gauge", "Melhor recompensa total até ao momento."),
+    "geracoes_total": ("counter", "Gerações concluídas (algoritmos genéticos)."),
+    "avaliacoes_total": ("counter", "Indivíduos avaliados (algoritmos genéticos)."),
+    "avaliacoes_por_segundo": ("gauge", "Indivíduos avaliados por segundo desde o último snapshot."),
+    "fitness_melhor": ("gauge", "Melhor fitness da última geração."),
+    "fitness_medio": ("gauge", "Fitness médio da última geração."),
+    "taxa_sucesso_populacao": ("gauge", "Fração da população com sucesso na última geração."),
+}
+
+
+class _Serie:
+    """Contadores e estatísticas de uma experiência."""
+
+    __slots__ = (
+        "estatisticas", "agentes", "episodios", "passos", "geracoes", "avaliacoes",
+        "fitness_melhor", "fitness_medio", "taxa_sucesso_populacao", "_anterior",
+    )
+
+    def __init__(self, janela: int) -> None:
+        self.estatisticas = EstatisticasOnline(janela)
+        self.agentes: Sequence[Any] = ()
+        self.episodios = 0
+        self.passos = 0
+        self.geracoes = 0
+        self.avaliacoes = 0
+        self.fitness_melhor: Optional[float] = None
+        self.fitness_medio: Optional[float] = None
+        self.taxa_sucesso_populacao: Optional[float] = None
+        self._anterior = (0, 0, 0)  # (episódios, passos, avaliações) no último snapshot
+
+    def valores(self, dt: float) -> Dict[str, float]:
+        ep0, passos0, aval0 = self._anterior
+        self._anterior = (self.episodios, self.passos, self.avaliacoes)
+        valores: Dict[str, float] = {
+            "episodios_total": self.episodios,
+            "passos_total": self.passos,
+            "episodios_por_segundo": (self.episodios - ep0) / dt if dt > 0 else 0.0,
+            "passos_por_segundo": (self.passos - passos0) / dt if dt > 0 else 0.0,
+        }
+
+        est = self.estatisticas
+        if est.episodios:
+            valores["recompensa_media_movel"] = est.recompensa.media
+            valores["recompensa_desvio_movel"] = est.recompensa.desvio_padrao
+            valores["taxa_sucesso_movel"] = est.sucesso.media
+            valores["melhor_recompensa"] = est.melhor_recompensa
+
+        # Lidos apenas aqui (não a cada episódio)
+        for agente in self.agentes:
+            epsilon = getattr(agente, "epsilon", None)
+            if epsilon is not None:
+                valores["epsilon"] = epsilon
+                break
+        for agente in self.agentes:
+            tamanho_q = getattr(agente, "tamanho_q", None)
+            if tamanho_q is not None:
+                valores["qtable_tamanho"] = tamanho_q()
+                break
+            q = getattr(agente, "q", None)
+            if q is not None:
+                valores["qtable_tamanho"] = len(q)
+                break
+
+        if self.geracoes:
+            valores["geracoes_total"] = self.geracoes
+            valores["avaliacoes_total"] = self.avaliacoes
+            valores["avaliacoes_por_segundo"] = (self.avaliacoes - aval0) / dt if dt > 0 else 0.0
+            valores["fitness_melhor"] = self.fitness_melhor
+            valores["fitness_medio"] = self.fitness_medio
+            valores["taxa_sucesso_populacao"] = self.taxa_sucesso_populacao
+        return {nome: v for nome, v in valores.items() if v is not None}
+
+
+def _escapar_etiqueta(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _formatar_valor(valor: float) -> str:
+    if isinstance(valor, float):
+        if math.isnan(valor):
+            return "NaN"
+        if math.isinf(valor):
+            return "+Inf" if valor > 0 else "-Inf"
+        return repr(valor)
+    return str(int(valor))
+
+
+def formatar_prometheus(snapshot: Dict[str, Any]) -> str:
+    """Converte um snapshot (ver `ExportadorMetricas.snapshot`) para o formato de texto Prometheus."""
+    linhas: List[str] = []
+    experiencias = snapshot["experiencias"]
+    for nome, (tipo, descricao) in METRICAS.items():
+        amostras = [
+            (exp, valores[nome]) for exp, valores in experiencias.items() if nome in valores
+        ]
+        if not amostras:
+            continue
+        metrica = f"{PREFIXO}_{nome}"
+        linhas.append(f"# HELP {metrica} {descricao}")
+        linhas.append(f"# TYPE {metrica} {tipo}")
+        for exp, valor in amostras:
+            linhas.append(f"{metrica}{{experiencia=\"{_escapar_etiqueta(exp)}\"}} {_formatar_valor(valor)}")
+
+    metrica = f"{PREFIXO}_snapshot_timestamp_seconds"
+    linhas.append(f"# HELP {metrica} Instante (Unix) do snapshot.")
+    linhas.append(f"# TYPE {metrica} gauge")
+    linhas.append(f"{metrica} {snapshot['timestamp']!r}")
+    return "\n".join(linhas) + "\n"
+
+
+class ExportadorMetricas:
+    """
+    Exportador periódico de métricas de treino.
+
+    Args:
+        caminho: Prefixo dos ficheiros (`<caminho>.prom` e `<caminho>.json`);
+                 None desativa a escrita em ficheiro.
+        intervalo: Segundos entre snapshots publicados.
+        porta: Porta do endpoint HTTP (None desativa; 0 escolhe uma livre).
+        host: Endereço do endpoint (por omissão apenas localhost).
+        janela: Episódios da janela móvel (recompensa e sucesso).
+    """
+
+    def __init__(
+        self,
+        caminho: Optional[str] = "metricas_live",
+        intervalo: float = 5.0,
+        porta: Optional[int] = None,
+        host: str = "127.0.0.1",
+        janela: int = 100,
+    ) -> None:
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.janela = janela
+        self._series: Dict[str, _Serie] = {}
+
+        agora = time.monotonic()
+        self._ultimo = agora
+        self._proximo = agora + intervalo
+
+        # Último snapshot publicado (lido pelo endpoint HTTP noutra thread)
+        self._lock = threading.Lock()
+        self._texto = formatar_prometheus({"timestamp": time.time(), "experiencias": {}})
+        self._json = "{}"
+
+        self._servidor: Optional[ThreadingHTTPServer] = None
+        self.porta: Optional[int] = None
+        if porta is not None:
+            self._iniciar_servidor(host, porta)
+
+    # Registo (chamado no ciclo de treino)
+
+    def _serie(self, experiencia: str) -> _Serie:
+        serie = self._series.get(experiencia)
+        if serie is None:
+            serie = self._series[experiencia] = _Serie(self.janela)
+        return serie
+
+    def episodio(self, stats: EpisodioStats, agentes: Sequence[Any] = ()) -> None:
+        """Regista um episódio concluído (os agentes são consultados só ao publicar)."""
+        serie = self._serie(stats.experiencia)
+        serie.episodios += 1
+        serie.passos += stats.passos
+        serie.estatisticas.atualizar(stats)
+        if agentes:
+            serie.agentes = agentes
+
+        if time.monotonic() >= self._proximo:
+            self.publicar()
+
+    def geracao(
+        self,
+        experiencia: str,
+        fitness: Sequence[float],
+        sucessos: int = 0,
+        avaliacoes: Optional[int] = None,
+    ) -> None:
+        """
+        Regista uma geração de um algoritmo genético.
+
+        Args:
+            fitness: Fitness de todos os indivíduos da geração.
+            sucessos: Indivíduos que atingiram o objetivo.
+            avaliacoes: Indivíduos avaliados (por omissão, toda a população).
+        """
+        serie = self._serie(experiencia)
+        n = len(fitness)
+        serie.geracoes += 1
+        serie.avaliacoes += n if avaliacoes is None else avaliacoes
+        serie.fitness_melhor = float(max(fitness)) if n else None
+        serie.fitness_medio = float(sum(fitness)) / n if n else None
+        serie.taxa_sucesso_populacao = sucessos / n if n else None
+
+        if time.monotonic() >= self._proximo:
+            self.publicar()
+
+    # Publicação
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Valores atuais de todas as experiências (as taxas são desde o último snapshot)."""
+        agora = time.monotonic()
+        dt = agora - self._ultimo
+        self._ultimo = agora
+        self._proximo = agora + self.intervalo
+        return {
+            "timestamp": time.time(),
+            "experiencias": {nome: serie.valores(dt) for nome, serie in self._series.items()},
+        }
+
+    def publicar(self) -> None:
+        """Gera um snapshot e escreve-o nos ficheiros / endpoint."""
+        snapshot = self.snapshot()
+        texto = formatar_prometheus(snapshot)
+        conteudo_json = json.dumps(snapshot, ensure_ascii=False)
+        with self._lock:
+            self._texto = texto
+            self._json = conteudo_json
+
+        if self.caminho is not None:
+            self._escrever(self.caminho + ".prom", texto)
+            self._escrever(self.caminho + ".json", conteudo_json)
+
+    @staticmethod
+    def _escrever(caminho: str, conteudo: str) -> None:
+        # Escrita atómica: quem lê nunca vê um ficheiro a meio
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
+
+    # Endpoint HTTP
+
+    def _iniciar_servidor(self, host: str, porta: int) -> None:
+        exportador = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                caminho = self.path.split("?", 1)[0]
+                with exportador._lock:
+                    if caminho in ("/", "/metrics"):
+                        corpo, tipo = exportador._texto, "text/plain; version=0.0.4; charset=utf-8"
+                    elif caminho == "/metrics.json":
+                        corpo, tipo = exportador._json, "application/json"
+                    else:
+                        corpo, tipo = None, None
+                if corpo is None:
+                    self.send_error(404)
+                    return
+                dados = corpo.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, *args: Any) -> None:
+                pass  # sem logs por pedido no stdout do treino
+
+        self._servidor = ThreadingHTTPServer((host, porta), _Handler)
+        self._servidor.daemon_threads = True
+        self.porta = self._servidor.server_address[1]
+        threading.Thread(target=self._servidor.serve_forever, name="exportador-metricas", daemon=True).start()
+        print(f"[Métricas] Endpoint em http://{host}:{self.porta}/metrics")
+
+    def fechar(self) -> None:
+        """Publica o snapshot final e para o endpoint HTTP."""
+        self.publicar()
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+    def __enter__(self) -> "ExportadorMetricas":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fechar()
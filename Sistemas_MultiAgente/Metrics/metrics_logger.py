@@ -1,30 +1,205 @@
 from __future__ import annotations
-from typing import List, Iterable
+from array import array
+from typing import Dict, List, Iterable, Iterator, Optional, Tuple
 import csv
 
+import numpy as np
+
 from .episodio_stats import EpisodioStats
+from .estatisticas_online import EstatisticasOnline
+
+# Modos de registo
+COMPLETO = "completo"    # uma linha por episódio
+AGREGADO = "agregado"    # apenas resumos por bloco de episódios
+
+# Cabeçalho do CSV no modo agregado
+COLUNAS_AGREGADAS = [
+    "experiencia",
+    "episodio_inicio",
+    "episodio_fim",
+    "episodios",
+    "passos_medio",
+    "recompensa_total_media",
+    "recompensa_descontada_media",
+    "taxa_sucesso",
+]
+
+
+class _Bloco:
+    """Somas acumuladas de um bloco (bin) de episódios ainda incompleto."""
+
+    __slots__ = ("inicio", "fim", "n", "passos", "recompensa_total", "recompensa_descontada", "sucessos")
+
+    def __init__(self, inicio: int) -> None:
+        self.inicio = inicio
+        self.fim = inicio
+        self.n = 0
+        self.passos = 0
+        self.recompensa_total = 0.0
+        self.recompensa_descontada = 0.0
+        self.sucessos = 0
+
+    def acumular(self, stats: EpisodioStats) -> None:
+        self.fim = stats.episodio
+        self.n += 1
+        self.passos += stats.passos
+        self.recompensa_total += stats.recompensa_total
+        self.recompensa_descontada += stats.recompensa_descontada
+        self.sucessos += stats.sucesso
+
+    def resumo(self, experiencia: str) -> Tuple:
+        n = self.n
+        return (
+            experiencia,
+            self.inicio,
+            self.fim,
+            n,
+            self.passos / n,
+            self.recompensa_total / n,
+            self.recompensa_descontada / n,
+            self.sucessos / n,
+        )
+
 
 class MetricsLogger:
     """
     Gestor de persistência de métricas.
     Acumula estatísticas de execução (EpisodioStats) e exporta para formato CSV.
+
+    Os episódios são guardados em colunas tipadas (`array`), não como lista de
+    objetos: cerca de 40 bytes por episódio. O nome da experiência é
+    guardado uma vez e referenciado por índice.
+
+    Em ambos os modos mantém, por experiência, estatísticas incrementais
+    (`EstatisticasOnline`: janela móvel, taxa de sucesso, melhor valor, EMA)
+    consultáveis durante o treino com `resumo()` em O(1).
+
+    Args:
+        modo (str): COMPLETO (uma linha por episódio) ou AGREGADO (apenas
+                    médias por bloco de `tamanho_bloco` episódios, por experiência).
+        tamanho_bloco (int): Episódios por bloco no modo agregado.
+        janela (int): Episódios da janela móvel das estatísticas online.
+        alpha_ema (float): Fator das médias exponenciais.
     """
 
-    def __init__(self) -> None:
-        self._episodios: List[EpisodioStats] = []
+    def __init__(
+        self,
+        modo: str = COMPLETO,
+        tamanho_bloco: int = 100,
+        janela: int = 50,
+        alpha_ema: float = 0.05,
+    ) -> None:
+        if modo not in (COMPLETO, AGREGADO):
+            raise ValueError(f"Modo desconhecido: {modo}. Opções: {COMPLETO}, {AGREGADO}")
+        self.modo = modo
+        self.tamanho_bloco = tamanho_bloco
+        self.janela = janela
+        self.alpha_ema = alpha_ema
+        self.limpar()
+
+    def limpar(self) -> None:
+        """Limpa o buffer de episódios."""
+        self._experiencias: List[str] = []
+        self._indice_experiencia: Dict[str, int] = {}
+
+        # Modo completo: uma entrada por episódio em cada coluna
+        self._exp = array("H")
+        self._episodio = array("q")
+        self._passos = array("q")
+        self._recompensa_total = array("d")
+        self._recompensa_descontada = array("d")
+        self._sucesso = array("q")  # contagem (ex: sucessos por geração no GA)
+
+        # Modo agregado: blocos fechados e bloco aberto por experiência
+        self._blocos: List[Tuple] = []
+        self._abertos: Dict[str, _Bloco] = {}
+
+        # Estatísticas online por experiência
+        self._online: Dict[str, EstatisticasOnline] = {}
+        self._ultima_experiencia: Optional[str] = None
+
+    def __len__(self) -> int:
+        """Número de episódios (modo completo) ou de blocos fechados (modo agregado)."""
+        return len(self._episodio) if self.modo == COMPLETO else len(self._blocos)
 
     def registar(self, stats: EpisodioStats) -> None:
         """Adiciona um registo de episódio ao buffer."""
-        self._episodios.append(stats)
+        online = self._online.get(stats.experiencia)
+        if online is None:
+            online = self._online[stats.experiencia] = EstatisticasOnline(self.janela, self.alpha_ema)
+        online.atualizar(stats)
+        self._ultima_experiencia = stats.experiencia
+
+        if self.modo == AGREGADO:
+            self._registar_agregado(stats)
+            return
+
+        indice = self._indice_experiencia.get(stats.experiencia)
+        if indice is None:
+            indice = self._indice_experiencia[stats.experiencia] = len(self._experiencias)
+            self._experiencias.append(stats.experiencia)
+
+        self._exp.append(indice)
+        self._episodio.append(stats.episodio)
+        self._passos.append(stats.passos)
+        self._recompensa_total.append(stats.recompensa_total)
+        self._recompensa_descontada.append(stats.recompensa_descontada)
+        self._sucesso.append(stats.sucesso)
+
+    def _registar_agregado(self, stats: EpisodioStats) -> None:
+        bloco = self._abertos.get(stats.experiencia)
+        if bloco is None:
+            bloco = self._abertos[stats.experiencia] = _Bloco(stats.episodio)
+        bloco.acumular(stats)
+        if bloco.n >= self.tamanho_bloco:
+            self._blocos.append(bloco.resumo(stats.experiencia))
+            del self._abertos[stats.experiencia]
 
     def registar_varios(self, stats_list: Iterable[EpisodioStats]) -> None:
         """Adiciona múltiplos registos ao buffer."""
         for e in stats_list:
             self.registar(e)
 
-    def limpar(self) -> None:
-        """Limpa o buffer de episódios."""
-        self._episodios.clear()
+    # Consulta
+
+    def estatisticas(self, experiencia: Optional[str] = None) -> EstatisticasOnline:
+        """Estatísticas online da experiência (por omissão, a última registada)."""
+        nome = experiencia if experiencia is not None else self._ultima_experiencia
+        if nome not in self._online:
+            raise KeyError(f"Sem episódios registados para a experiência: {nome}")
+        return self._online[nome]
+
+    def resumo(self, experiencia: Optional[str] = None) -> Dict[str, float]:
+        """Resumo atual (média/desvio em janela, sucesso, melhor, EMA) em O(1)."""
+        return self.estatisticas(experiencia).resumo()
+
+    def episodios(self) -> Iterator[EpisodioStats]:
+        """Recria os EpisodioStats registados (modo completo), um de cada vez."""
+        nomes = self._experiencias
+        for linha in zip(
+            self._exp, self._episodio, self._passos,
+            self._recompensa_total, self._recompensa_descontada, self._sucesso,
+        ):
+            yield EpisodioStats(nomes[linha[0]], *linha[1:])
+
+    def como_arrays(self) -> Dict[str, np.ndarray]:
+        """Colunas do modo completo como arrays NumPy (vistas, sem cópia)."""
+        return {
+            "experiencia": np.array(self._experiencias, dtype=object)[np.frombuffer(self._exp, dtype=np.uint16)]
+            if self._experiencias else np.empty(0, dtype=object),
+            "episodio": np.frombuffer(self._episodio, dtype=np.int64),
+            "passos": np.frombuffer(self._passos, dtype=np.int64),
+            "recompensa_total": np.frombuffer(self._recompensa_total, dtype=np.float64),
+            "recompensa_descontada": np.frombuffer(self._recompensa_descontada, dtype=np.float64),
+            "sucesso": np.frombuffer(self._sucesso, dtype=np.int64),
+        }
+
+    def blocos(self) -> List[Tuple]:
+        """Resumos do modo agregado (ver COLUNAS_AGREGADAS), incluindo blocos incompletos."""
+        abertos = [bloco.resumo(nome) for nome, bloco in self._abertos.items() if bloco.n]
+        return self._blocos + abertos
+
+    # Persistência
 
     def guardar_csv(self, caminho: str) -> None:
         """
@@ -34,6 +209,13 @@ class MetricsLogger:
         with open(caminho, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
 
+            if self.modo == AGREGADO:
+                writer.writerow(COLUNAS_AGREGADAS)
+                for exp, inicio, fim, n, passos, rt, rd, taxa in self.blocos():
+                    writer.writerow([exp, inicio, fim, n, f"{passos:.2f}", f"{rt:.2f}", f"{rd:.6f}", f"{taxa:.4f}"])
+                print(f"[CSV] Métricas guardadas em: {caminho}")
+                return
+
             # Escreve o cabeçalho
             writer.writerow([
                 "experiencia",
@@ -45,14 +227,18 @@ class MetricsLogger:
             ])
 
             # Escreve as linhas de dados
-            for e in self._episodios:
+            nomes = self._experiencias
+            for exp, episodio, passos, rt, rd, sucesso in zip(
+                self._exp, self._episodio, self._passos,
+                self._recompensa_total, self._recompensa_descontada, self._sucesso,
+            ):
                 writer.writerow([
-                    e.experiencia,
-                    e.episodio,
-                    e.passos,
-                    f"{e.recompensa_total:.2f}",
-                    f"{e.recompensa_descontada:.6f}",
-                    e.sucesso,
+                    nomes[exp],
+                    episodio,
+                    passos,
+                    f"{rt:.2f}",
+                    f"{rd:.6f}",
+                    sucesso,
                 ])
 
-        print(f"[CSV] Métricas guardadas em: {caminho}")
\ No newline at end of file
+        print(f"[CSV] Métricas guardadas em: {caminho}")
@@ -0,0 +1,273 @@
+from __future__ import annotations
+import glob
+import os
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Core.action import Accao
+from Core.observacao import Observacao
+
+# Código reservado para ações sem direção (ex: Accao(tipo="nenhuma"))
+CODIGO_SEM_DIRECAO = len(Accao.DIRECOES)
+_CODIGOS = {d: i for i, d in enumerate(Accao.DIRECOES)}
+
+
+def codificar_accao(accao: Accao) -> int:
+    """Converte uma Accao no seu código compacto (uint8)."""
+    return _CODIGOS.get(accao.direcao, CODIGO_SEM_DIRECAO)
+
+
+def descodificar_accao(codigo: int) -> Accao:
+    """Operação inversa de `codificar_accao`."""
+    if codigo < CODIGO_SEM_DIRECAO:
+        return Accao.mover(Accao.DIRECOES[codigo])
+    return Accao(tipo="nenhuma", direcao=None)
+
+
+@dataclass
+class Trajetoria:
+    """
+    Um episódio gravado.
+
+    Campos:
+      - experiencia / episodio / sucesso: identificação e resultado
+      - alvo: posição (x, y) do objetivo
+      - inicio: posições iniciais (n_agentes, 2), int16
+      - agentes: índice do agente que agiu em cada passo (N,), uint16
+      - acoes: códigos das ações (N,), uint8
+      - posicoes: posição do agente após cada ação (N, 2), int16
+      - recompensas: recompensa de cada ação (N,), float32
+    """
+    experiencia: str
+    episodio: int
+    sucesso: int
+    alvo: Tuple[int, int]
+    inicio: np.ndarray
+    agentes: np.ndarray
+    acoes: np.ndarray
+    posicoes: np.ndarray
+    recompensas: np.ndarray
+
+    @property
+    def passos(self) -> int:
+        return len(self.acoes)
+
+    def posicoes_agente(self, indice: int = 0) -> np.ndarray:
+        """Caminho completo (incluindo a posição inicial) de um agente."""
+        caminho = self.posicoes[self.agentes == indice]
+        return np.concatenate([self.inicio[indice:indice + 1], caminho])
+
+
+class GravadorTrajetorias:
+    """
+    Gravador opt-in de trajetórias, ligado ao Simulator.
+
+    Os passos são acumulados em arrays tipados (`array`) e escritos em blocos
+    (chunks) comprimidos `chunk_XXXXXX.npz`, apenas acrescentados, nunca
+    reescritos. Uma gravação pode ser continuada reabrindo a mesma pasta.
+    """
+
+    def __init__(self, pasta: str, episodios_por_chunk: int = 1000) -> None:
+        self.pasta = pasta
+        self.episodios_por_chunk = episodios_por_chunk
+        os.makedirs(pasta, exist_ok=True)
+
+        # Continua a numeração de chunks já existentes (append-only)
+        self._proximo_chunk = len(_listar_chunks(pasta))
+        self._limpar_buffers()
+        self._em_episodio = False
+
+    def _limpar_buffers(self) -> None:
+        # Cabeçalhos por episódio
+        self._experiencias: List[str] = []
+        self._episodios = array("i")
+        self._sucessos = array("B")
+        self._alvos = array("h")
+        self._inicios = array("h")
+        self._offsets_inicio = array("q", [0])
+        self._offsets = array("q", [0])
+
+        # Dados por passo
+        self._agentes = array("H")
+        self._acoes = array("B")
+        self._posicoes = array("h")
+        self._recompensas = array("f")
+
+    # Interface usada pelo Simulator
+
+    def inicio_episodio(self, experiencia: str, episodio: int, ambiente: Any, agentes: Sequence[Any]) -> None:
+        self._experiencias.append(experiencia)
+        self._episodios.append(episodio)
+        self._alvos.extend(ambiente.posicao_alvo())
+        for agente in agentes:
+            self._inicios.extend(ambiente.posicao_agente(agente))
+        self._offsets_inicio.append(len(self._inicios) // 2)
+        self._em_episodio = True
+
+    def registar_passo(self, indice_agente: int, accao: Accao, posicao: Tuple[int, int], recompensa: float) -> None:
+        self._agentes.append(indice_agente)
+        self._acoes.append(_CODIGOS.get(accao.direcao, CODIGO_SEM_DIRECAO))
+        self._posicoes.extend(posicao)
+        self._recompensas.append(recompensa)
+
+    def fim_episodio(self, sucesso: int) -> None:
+        self._sucessos.append(sucesso)
+        self._offsets.append(len(self._acoes))
+        self._em_episodio = False
+
+        if len(self._episodios) >= self.episodios_por_chunk:
+            self.descarregar()
+
+    # Persistência
+
+    def descarregar(self) -> None:
+        """Escreve os episódios completos em buffer como um novo chunk."""
+        n = len(self._sucessos)
+        if n == 0:
+            return
+        if self._em_episodio:
+            raise RuntimeError("Não é possível descarregar a meio de um episódio.")
+
+        caminho = os.path.join(self.pasta, f"chunk_{self._proximo_chunk:06d}.npz")
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as f:
+            np.savez_compressed(
+                f,
+                experiencias=np.array(self._experiencias, dtype=str),
+                episodios=np.frombuffer(self._episodios, dtype=np.int32),
+                sucessos=np.frombuffer(self._sucessos, dtype=np.uint8),
+                alvos=np.frombuffer(self._alvos, dtype=np.int16).reshape(-1, 2),
+                inicios=np.frombuffer(self._inicios, dtype=np.int16).reshape(-1, 2),
+                offsets_inicio=np.frombuffer(self._offsets_inicio, dtype=np.int64),
+                offsets=np.frombuffer(self._offsets, dtype=np.int64),
+                agentes=np.frombuffer(self._agentes, dtype=np.uint16),
+                acoes=np.frombuffer(self._acoes, dtype=np.uint8),
+                posicoes=np.frombuffer(self._posicoes, dtype=np.int16).reshape(-1, 2),
+                recompensas=np.frombuffer(self._recompensas, dtype=np.float32),
+            )
+        # Renomeação atómica: um leitor nunca vê um chunk incompleto
+        os.replace(temporario, caminho)
+
+        self._proximo_chunk += 1
+        self._limpar_buffers()
+
+    def fechar(self) -> None:
+        self.descarregar()
+
+    def __enter__(self) -> "GravadorTrajetorias":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.fechar()
+
+
+def _listar_chunks(pasta: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(pasta, "chunk_*.npz")))
+
+
+class LeitorTrajetorias:
+    """
+    Acesso aleatório aos episódios gravados por `GravadorTrajetorias`.
+    Os episódios são indexados pela ordem de gravação (0..N-1); apenas o chunk
+    necessário é descomprimido (e mantido em cache até mudar de chunk).
+    """
+
+    def __init__(self, pasta: str) -> None:
+        self.pasta = pasta
+        self._chunks = _listar_chunks(pasta)
+
+        # Índice global: (chunk, posição dentro do chunk)
+        self._indice: List[Tuple[int, int]] = []
+        self._chaves: Dict[Tuple[str, int], int] = {}
+        for c, caminho in enumerate(self._chunks):
+            with np.load(caminho) as dados:
+                experiencias = dados["experiencias"]
+                episodios = dados["episodios"]
+            for i, (exp, ep) in enumerate(zip(experiencias, episodios)):
+                self._chaves[(str(exp), int(ep))] = len(self._indice)
+                self._indice.append((c, i))
+
+        self._cache_id: Optional[int] = None
+        self._cache: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    def __iter__(self) -> Iterator[Trajetoria]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def _carregar_chunk(self, c: int) -> Dict[str, np.ndarray]:
+        if self._cache_id != c:
+            with np.load(self._chunks[c]) as dados:
+                self._cache = {k: dados[k] for k in dados.files}
+            self._cache_id = c
+        return self._cache
+
+    def __getitem__(self, indice: int) -> Trajetoria:
+        c, i = self._indice[indice]
+        d = self._carregar_chunk(c)
+        a, b = d["offsets"][i], d["offsets"][i + 1]
+        ia, ib = d["offsets_inicio"][i], d["offsets_inicio"][i + 1]
+        return Trajetoria(
+            experiencia=str(d["experiencias"][i]),
+            episodio=int(d["episodios"][i]),
+            sucesso=int(d["sucessos"][i]),
+            alvo=(int(d["alvos"][i, 0]), int(d["alvos"][i, 1])),
+            inicio=d["inicios"][ia:ib],
+            agentes=d["agentes"][a:b],
+            acoes=d["acoes"][a:b],
+            posicoes=d["posicoes"][a:b],
+            recompensas=d["recompensas"][a:b],
+        )
+
+    def procurar(self, experiencia: str, episodio: int) -> Trajetoria:
+        """Devolve o episódio `episodio` da experiência indicada."""
+        return self[self._chaves[(experiencia, episodio)]]
+
+
+# MOTOR DE REPLAY
+
+def _instantanea(obs: Any) -> Any:
+    """Cópia de observações reutilizáveis (reescritas no lugar pelo ambiente)."""
+    return obs.copia() if isinstance(obs, Observacao) else obs
+
+
+def reconstruir_observacoes(trajetoria: Trajetoria, ambiente: Any, indice_agente: int = 0) -> List[Any]:
+    """
+    Reconstrói a sequência de observações de um agente sem o executar:
+    o ambiente é colocado em cada posição gravada via `definir_estado`.
+    Inclui a observação inicial (len = passos do agente + 1).
+    """
+    observacoes = []
+    for x, y in trajetoria.posicoes_agente(indice_agente):
+        ambiente.definir_estado((int(x), int(y)), trajetoria.alvo)
+        observacoes.append(_instantanea(ambiente.observacaoPara(None)))
+    return observacoes
+
+
+def reproduzir(trajetoria: Trajetoria, ambiente: Any) -> Iterator[Tuple[Accao, float, bool, Any]]:
+    """
+    Replay determinístico: volta a aplicar as ações gravadas ao ambiente
+    (sem chamar agentes) e produz (accao, recompensa, terminou, observacao).
+    Assume um único agente por ambiente, como nos ambientes atuais.
+    """
+    x0, y0 = trajetoria.inicio[0]
+    ambiente.definir_estado((int(x0), int(y0)), trajetoria.alvo)
+    for codigo in trajetoria.acoes:
+        accao = descodificar_accao(int(codigo))
+        recompensa, terminou, _info = ambiente.agir(accao, None)
+        yield accao, recompensa, terminou, _instantanea(ambiente.observacaoPara(None))
+
+
+def verificar_replay(trajetoria: Trajetoria, ambiente: Any) -> bool:
+    """Confirma que o replay reproduz exatamente as posições e recompensas gravadas."""
+    for i, (_a, recompensa, _t, _obs) in enumerate(reproduzir(trajetoria, ambiente)):
+        if ambiente.posicao_agente(None) != tuple(int(v) for v in trajetoria.posicoes[i]):
+            return False
+        if np.float32(recompensa) != trajetoria.recompensas[i]:
+            return False
+    return True
@@ -75,7 +75,8 @@ def desenhar_grafico_genetico(caminho_csv, titulo, output_file):
     except:
         pass
 
-if __name__ == '__main__':
+def gerar_graficos():
+    """Gera os gráficos de todas as experiências a partir dos CSV na pasta atual."""
     print("--- GERANDO GRÁFICOS 'CLEAN' ---")
 
     # 1. Q-LEARNING FAROL
@@ -92,4 +93,8 @@ if __name__ == '__main__':
 
     # 3. GENÉTICOS
     desenhar_grafico_genetico("resultados_genetico_labirinto.csv", "Evolução: Labirinto", "grafico_Gen_Labirinto.png")
-    desenhar_grafico_genetico("resultados_genetico_farol.csv", "Evolução: Farol", "grafico_Gen_Farol.png")
\ No newline at end of file
+    desenhar_grafico_genetico("resultados_genetico_farol.csv", "Evolução: Farol", "grafico_Gen_Farol.png")
+
+
+if __name__ == '__main__':
+    gerar_graficos()
@@ -1,31 +1,37 @@
 from __future__ import annotations
+import argparse
 import os
 import sys
+from contextlib import nullcontext
+from typing import Any, Dict, List
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(BASE_DIR)
 
-from Experiments import (
-    correr_treino_farol,
-    correr_treino_labirinto,
-    demo_labirinto,
-    correr_treino_genetico_farol,
-    correr_treino_genetico_labirinto
-)
+# Os módulos de experiências (NumPy, tkinter, pandas...) só são importados
+# dentro de cada comando, para o arranque ser imediato.
 
 # --- FUNÇÕES AUXILIARES ---
 
 def verificar_qtable(path: str) -> bool:
     """
-    Verifica se o ficheiro da Q-Table existe antes de tentar correr a demo.
+    Verifica se o ficheiro da Q-Table (ou da política compilada) existe antes
+    de tentar correr a demo.
     """
     if not os.path.exists(path):
-        print("\n[ERRO] Q-Table não encontrada!")
+        print("\n[ERRO] Q-Table / política não encontrada!")
         print(f" -> Ficheiro esperado: {path}")
-        print(" -> Ação necessária: Execute primeiro o Treino do Labirinto (Opção 2).\n")
+        print(" -> Ação necessária: Execute primeiro o Treino do Labirinto (Opção 2 / labirinto-ql).\n")
         return False
     return True
 
+def positivo(valor: str) -> float:
+    """Tipo argparse: número real > 0."""
+    numero = float(valor)
+    if numero <= 0:
+        raise argparse.ArgumentTypeError(f"tem de ser > 0 (recebido {valor})")
+    return numero
+
 # --- INTERFACE (MENU) ---
 
 def menu():
@@ -57,30 +63,18 @@ def main():
         # Q-LEARNING
         # ==========================================
         
+        # Cada opção corre o subcomando correspondente com os valores por omissão
         if op == "1":
             # Farol (Problema Simples)
-            correr_treino_farol(
-                num_episodios_treino=250,
-                num_episodios_teste_ql=40,
-                num_episodios_teste_greedy=40,
-                max_passos=100,
-                caminho_csv="resultados_farol.csv"
-            )
+            executar(["farol-ql"])
 
         elif op == "2":
             # Labirinto (Problema Complexo)
-            correr_treino_labirinto(
-                num_episodios_treino=25000,
-                num_episodios_teste=50,
-                max_passos=500,
-                caminho_csv="resultados_labirinto.csv"
-            )
+            executar(["labirinto-ql"])
 
         elif op == "3":
             # Demo Visual Labirinto
-            if verificar_qtable("qtable_labirinto.pkl"):
-                # Executa apenas se a tabela existir
-                demo_labirinto(num_episodios=10, max_passos=500)
+            executar(["demo"])
 
         # ==========================================
         # ALGORITMOS GENÉTICOS
@@ -88,11 +82,11 @@ def main():
 
         elif op == "4":
             # Farol Genético
-            correr_treino_genetico_farol()
+            executar(["gen-farol"])
             
         elif op == "5":
             # Labirinto Genético (Novelty Search)
-            correr_treino_genetico_labirinto()
+            executar(["gen-labirinto"])
 
         # ==========================================
         # SAIR
@@ -105,5 +99,204 @@ def main():
         else:
             print("\n[!] Opção inválida. Tente novamente.")
 
+# --- COMANDOS (CLI NÃO INTERATIVA) ---
+
+def _exportador(args: argparse.Namespace):
+    """
+    Exportador de métricas em tempo real, se pedido (--metricas / --metricas-porta).
+    Usado como context manager: publica o snapshot final e fecha o endpoint.
+    """
+    caminho = getattr(args, "metricas", None)
+    porta = getattr(args, "metricas_porta", None)
+    if caminho is None and porta is None:
+        return nullcontext()
+
+    from Metrics import ExportadorMetricas
+
+    return ExportadorMetricas(
+        caminho=caminho,
+        intervalo=args.metricas_intervalo,
+        porta=porta,
+    )
+
+
+def cmd_farol_ql(args: argparse.Namespace) -> None:
+    from Experiments.treino_qlearning_farol import correr_treino_farol
+
+    with _exportador(args) as exportador:
+        correr_treino_farol(
+            num_episodios_treino=args.episodios_treino,
+            num_episodios_teste_ql=args.episodios_teste_ql,
+            num_episodios_teste_greedy=args.episodios_teste_greedy,
+            max_passos=args.max_passos,
+            caminho_csv=args.csv,
+            exportador=exportador,
+            num_workers_teste=args.workers_teste,
+            seed_teste=getattr(args, "seed_teste", None),
+        )
+
+
+def cmd_labirinto_ql(args: argparse.Namespace) -> None:
+    from Experiments.treino_qlearning_labirinto import correr_treino_labirinto
+
+    with _exportador(args) as exportador:
+        correr_treino_labirinto(
+            num_episodios_treino=args.episodios_treino,
+            num_episodios_teste=args.episodios_teste,
+            max_passos=args.max_passos,
+            caminho_csv=args.csv,
+            exportador=exportador,
+            todos_objetivos=args.todos_objetivos,
+            num_workers_teste=args.workers_teste,
+            seed_teste=getattr(args, "seed_teste", None),
+            caminho_live=getattr(args, "publicar_politica", None),
+            intervalo_live=args.publicar_intervalo,
+        )
+
+
+def cmd_demo(args: argparse.Namespace) -> None:
+    # Sem --qtable nem --politica: a política compilada se existir, senão a
+    # Q-table por omissão. Com um deles, usa apenas esse ficheiro.
+    politica = getattr(args, "politica", None)
+    qtable = getattr(args, "qtable", "qtable_labirinto.pkl")
+    if politica is None and not hasattr(args, "qtable") and os.path.exists("politica_labirinto.npz"):
+        politica = "politica_labirinto.npz"
+
+    # Executa apenas se a tabela existir (ou se segue um treino em curso)
+    live = getattr(args, "live", None)
+    if not live and not verificar_qtable(politica or qtable):
+        return
+
+    if args.headless:
+        from Experiments.render_headless import demo_headless
+
+        demo_headless(
+            num_episodios=args.episodios,
+            max_passos=args.max_passos,
+            formato=args.formato,
+            pasta=args.pasta,
+            caminho_politica=politica,
+            caminho_qtable=qtable,
+            caminho_live=live,
+        )
+    else:
+        from Experiments.demo_visual import demo_labirinto
+
+        demo_labirinto(
+            num_episodios=args.episodios,
+            max_passos=args.max_passos,
+            delay=args.delay,
+            frame_skip=args.frame_skip,
+            velocidade=args.velocidade,
+            caminho_politica=politica,
+            caminho_qtable=qtable,
+            caminho_live=live,
+        )
+
+
+def _parametros_geneticos(args: argparse.Namespace) -> Dict[str, Any]:
+    """Só passa o que foi indicado; o resto usa as constantes do módulo."""
+    parametros = {"num_geracoes": "geracoes", "tamanho_populacao": "populacao", "seed": "seed"}
+    return {k: getattr(args, v) for k, v in parametros.items() if hasattr(args, v)}
+
+
+def cmd_gen_farol(args: argparse.Namespace) -> None:
+    from Experiments.treino_genetico_farol import correr_treino_genetico_farol
+
+    with _exportador(args) as exportador:
+        correr_treino_genetico_farol(**_parametros_geneticos(args), exportador=exportador)
+
+
+def cmd_gen_labirinto(args: argparse.Namespace) -> None:
+    from Experiments.treino_genetico_labirinto import correr_treino_genetico_labirinto
+
+    with _exportador(args) as exportador:
+        correr_treino_genetico_labirinto(**_parametros_geneticos(args), exportador=exportador)
+
+
+def cmd_analise(args: argparse.Namespace) -> None:
+    from analise import gerar_graficos
+
+    gerar_graficos()
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Simulador de Sistemas Multi-Agente. Sem argumentos abre o menu interativo.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    sub = parser.add_subparsers(dest="comando", metavar="comando")
+
+    # Opções partilhadas pelos comandos de treino: telemetria em tempo real
+    metricas = argparse.ArgumentParser(add_help=False)
+    grupo = metricas.add_argument_group("métricas em tempo real")
+    grupo.add_argument("--metricas", default=argparse.SUPPRESS, metavar="PREFIXO", help="escreve PREFIXO.prom e PREFIXO.json periodicamente")
+    grupo.add_argument("--metricas-porta", type=int, default=argparse.SUPPRESS, metavar="PORTA", help="serve /metrics em 127.0.0.1:PORTA")
+    grupo.add_argument("--metricas-intervalo", type=float, default=5.0, metavar="SEG", help="segundos entre snapshots")
+
+    def comando(nome: str, ajuda: str, funcao, treino: bool = False) -> argparse.ArgumentParser:
+        p = sub.add_parser(
+            nome, help=ajuda, parents=[metricas] if treino else [],
+            formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        )
+        p.set_defaults(funcao=funcao)
+        return p
+
+    p = comando("farol-ql", "Farol: treino Q-Learning + teste + baseline Greedy", cmd_farol_ql, treino=True)
+    p.add_argument("--episodios-treino", type=int, default=250)
+    p.add_argument("--episodios-teste-ql", type=int, default=40)
+    p.add_argument("--episodios-teste-greedy", type=int, default=40)
+    p.add_argument("--max-passos", type=int, default=100)
+    p.add_argument("--csv", default="resultados_farol.csv")
+    p.add_argument("--workers-teste", type=int, default=1, metavar="N", help="processos para as fases de teste (políticas fixas)")
+    p.add_argument("--seed-teste", type=int, default=argparse.SUPPRESS, metavar="SEED", help="seed por episódio nas fases de teste (reprodutível com qualquer --workers-teste)")
+
+    p = comando("labirinto-ql", "Labirinto: treino Q-Learning + teste + baseline", cmd_labirinto_ql, treino=True)
+    p.add_argument("--episodios-treino", type=int, default=25000)
+    p.add_argument("--episodios-teste", type=int, default=50)
+    p.add_argument("--max-passos", type=int, default=500)
+    p.add_argument("--csv", default="resultados_labirinto.csv")
+    p.add_argument("--todos-objetivos", action="store_true", help="atualiza a Q-table de todas as saídas a cada transição")
+    p.add_argument("--workers-teste", type=int, default=1, metavar="N", help="processos para as fases de teste (políticas fixas)")
+    p.add_argument("--seed-teste", type=int, default=argparse.SUPPRESS, metavar="SEED", help="seed por episódio nas fases de teste (reprodutível com qualquer --workers-teste)")
+    p.add_argument("--publicar-politica", default=argparse.SUPPRESS, metavar="FICHEIRO", help="publica a política greedy durante o treino (ver demo --live)")
+    p.add_argument("--publicar-intervalo", type=float, default=2.0, metavar="SEG", help="segundos entre publicações")
+
+    p = comando("demo", "Labirinto: demo do agente treinado (janela ou headless)", cmd_demo)
+    p.add_argument("--episodios", type=int, default=10)
+    p.add_argument("--max-passos", type=int, default=500)
+    tabela = p.add_mutually_exclusive_group()
+    tabela.add_argument("--qtable", default=argparse.SUPPRESS, metavar="FICHEIRO", help="Q-table a usar (omissão: politica_labirinto.npz se existir, senão qtable_labirinto.pkl)")
+    tabela.add_argument("--politica", default=argparse.SUPPRESS, metavar="FICHEIRO", help="política compilada (.npz) a usar")
+    p.add_argument("--delay", type=float, default=0.15)
+    p.add_argument("--frame-skip", type=int, default=1)
+    p.add_argument("--velocidade", type=positivo, default=1.0)
+    p.add_argument("--headless", action="store_true", help="exporta ficheiros em vez de abrir janela")
+    p.add_argument("--live", default=argparse.SUPPRESS, metavar="FICHEIRO", help="segue a política publicada por um treino em curso (janela ou --headless)")
+    p.add_argument("--formato", choices=("gif", "png", "ascii"), default="gif")
+    p.add_argument("--pasta", default="renders")
+
+    p = comando("gen-farol", "Farol: evolução simples (rede neuronal)", cmd_gen_farol, treino=True)
+    p.add_argument("--geracoes", type=int, default=argparse.SUPPRESS, help="omissão: GERACOES do módulo (20)")
+    p.add_argument("--populacao", type=int, default=argparse.SUPPRESS, help="omissão: POPULACAO do módulo (50)")
+    p.add_argument("--seed", type=int, default=argparse.SUPPRESS, help="evolução reprodutível")
+
+    p = comando("gen-labirinto", "Labirinto: evolução deep + novelty search", cmd_gen_labirinto, treino=True)
+    p.add_argument("--geracoes", type=int, default=argparse.SUPPRESS, help="omissão: GERACOES do módulo (100)")
+    p.add_argument("--populacao", type=int, default=argparse.SUPPRESS, help="omissão: POPULACAO do módulo (150)")
+    p.add_argument("--seed", type=int, default=argparse.SUPPRESS, help="evolução reprodutível")
+
+    comando("analise", "Gera os gráficos a partir dos CSV de resultados", cmd_analise)
+    return parser
+
+
+def executar(argv: List[str]) -> None:
+    args = criar_parser().parse_args(argv)
+    args.funcao(args)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        executar(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os pacotes (Core, Envs, Agents, Metrics, Experiments) são importados a partir da raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,23 @@
+from functools import partial
+
+from Agents import GreedyFarolAgent
+from Envs import FarolEnvironment
+from Experiments.avaliacao_paralela import avaliar_paralelo
+
+
+def _resultados(num_workers: int):
+    # Os passos do Greedy dependem do início e do farol, sorteados pela seed do episódio
+    fabrica = partial(FarolEnvironment, inicio="aleatorio", farois="aleatorio")
+    stats = avaliar_paralelo(
+        fabrica, GreedyFarolAgent(agent_id=1), "Teste", 30,
+        max_passos=100, num_workers=num_workers, seed=11,
+    )
+    return [(s.episodio, s.passos, s.recompensa_total, s.sucesso) for s in stats]
+
+
+def test_seed_reprodutivel_com_qualquer_numero_de_workers():
+    um = _resultados(1)
+    assert [e for e, *_ in um] == list(range(1, 31))
+    assert len({passos for _e, passos, *_ in um}) > 1
+    assert _resultados(3) == um
+    assert _resultados(1) == um
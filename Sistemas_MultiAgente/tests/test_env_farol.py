@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from Envs import FarolEnvironment
+from Envs.env_farol_lote import FarolEnvironmentLote
+
+
+def test_tabelas_por_omissao_so_com_farois_fixos():
+    assert FarolEnvironment(tamanho=20).tabelas
+    assert not FarolEnvironment(tamanho=20, num_farois=5).tabelas
+    assert not FarolEnvironmentLote(10, tamanho=20, farois="aleatorio").tabelas
+    assert FarolEnvironment(tamanho=20, num_farois=5, tabelas=True).tabelas
+
+
+def test_lote_nao_recompila_farois_iguais():
+    env = FarolEnvironmentLote(10, inicio="aleatorio", seed=0)
+    modelo = env.modelo
+    for _ in range(3):
+        env.reset()
+    assert env.modelo is modelo
+
+
+def test_posicao_fixa_com_inteiros_numpy():
+    env = FarolEnvironment(inicio=(np.int64(1), np.int64(2)), farois=(np.int64(5), np.int64(5)))
+    assert (env.x, env.y) == (1, 2)
+    assert env.farois == [(5, 5)]
+
+
+def test_lote_rejeita_lista_de_inicios_com_tamanho_errado():
+    with pytest.raises(ValueError, match="esperava 1"):
+        FarolEnvironmentLote(3, inicio=[(0, 0), (1, 1)])
+    env = FarolEnvironmentLote(2, inicio=[(0, 0), (1, 1)])
+    assert env.posicoes.tolist() == [[0, 0], [1, 1]]
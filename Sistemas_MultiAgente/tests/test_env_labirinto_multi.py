@@ -0,0 +1,129 @@
+from typing import List
+
+import numpy as np
+
+import pytest
+
+from Core import Accao, Agent, Simulator
+from Core.modelo_mdp import PARADO
+from Envs import LabirintoEnvironmentMulti
+from Envs.mapa_labirinto import MapaLabirinto
+
+# Corredor horizontal com as células livres (1..6, 1)
+CORREDOR = [
+    [1, 1, 1, 1, 1, 1, 1, 1],
+    [1, 0, 0, 0, 0, 0, 0, 1],
+    [1, 1, 1, 1, 1, 1, 1, 1],
+]
+
+
+ESQUERDA = Accao.DIRECOES.index(Accao.ESQUERDA)
+DIREITA = Accao.DIRECOES.index(Accao.DIREITA)
+
+
+def _colocar(env: LabirintoEnvironmentMulti, xs, saidas) -> None:
+    """Posiciona os agentes nas colunas `xs` do corredor (linha 1)."""
+    w = env.largura
+    env.celulas = np.array([w + x for x in xs], dtype=np.int64)
+    env.saidas = np.array([w + x for x in saidas], dtype=np.int64)
+    env.ocupacao.fill(-1)
+    env.ocupacao[env.celulas] = np.arange(env.M)
+    env.terminados = np.zeros(env.M, dtype=bool)
+    env._restantes = env.M
+
+
+def _corredor(num_agentes: int, conflitos: str = "prioridade") -> LabirintoEnvironmentMulti:
+    return LabirintoEnvironmentMulti(num_agentes, seed=0, mapa=MapaLabirinto(grelha=CORREDOR), conflitos=conflitos)
+
+
+class AgenteDireita(Agent):
+    def __init__(self, agent_id: int) -> None:
+        super().__init__(agent_id)
+        self.recompensas: List[float] = []
+
+    def age(self) -> Accao:
+        return Accao.mover(Accao.DIREITA)
+
+    def avaliacao_estado_atual(self, recompensa: float) -> None:
+        self.recompensas.append(recompensa)
+
+
+class CorredorFixo(LabirintoEnvironmentMulti):
+    """Agente 0 em (1, 1) com saída em (2, 1); agente 1 em (3, 1) com saída em (5, 1)."""
+
+    def reset(self) -> None:
+        super().reset()
+        _colocar(self, [1, 3], [2, 5])
+
+
+def test_recompensa_final_de_todos_os_agentes_e_contada():
+    env = CorredorFixo(2, seed=0, mapa=MapaLabirinto(grelha=CORREDOR))
+    agentes = [AgenteDireita(1), AgenteDireita(2)]
+    sim = Simulator(env, agentes, num_episodios=1, max_passos=10)
+    assert sim.usar_lote
+    (stats,) = sim.executa()
+
+    # O agente 0 sai no 1.º passo; o agente 1 sai no 2.º, que termina o episódio
+    assert agentes[0].recompensas == [100.0, 0.0]
+    assert agentes[1].recompensas == [-1.0, 100.0]
+    assert stats.passos == 2
+    assert stats.sucesso == 1
+    assert stats.recompensa_total == 199.0
+
+
+@pytest.mark.parametrize("conflitos, movem", [
+    ("prioridade", [True, False]),
+    ("bloquear", [False, False]),
+])
+def test_conflito_pela_mesma_celula(conflitos, movem):
+    env = _corredor(2, conflitos)
+    _colocar(env, [1, 3], [6, 6])
+    recompensas, _saiu = env.passo(np.array([DIREITA, ESQUERDA]))
+
+    assert (env.celulas != np.array([env.largura + 1, env.largura + 3])).tolist() == movem
+    assert [r == env.recompensa_colisao for r in recompensas.tolist()] == [not m for m in movem]
+
+
+def test_conflito_aleatorio_deixa_entrar_exatamente_um():
+    env = _corredor(2, "aleatorio")
+    vencedores = set()
+    for _ in range(50):
+        _colocar(env, [1, 3], [6, 6])
+        env.passo(np.array([DIREITA, ESQUERDA]))
+        assert env.ocupacao[env.largura + 2] in (0, 1)
+        vencedores.add(int(env.ocupacao[env.largura + 2]))
+    assert vencedores == {0, 1}
+
+
+@pytest.mark.parametrize("conflitos", ["prioridade", "aleatorio", "bloquear"])
+def test_cadeias_e_trocas(conflitos):
+    env = _corredor(3, conflitos)
+
+    # Cadeia: cada agente entra na célula de quem sai no mesmo passo
+    _colocar(env, [1, 2, 3], [6, 6, 6])
+    env.passo(np.array([DIREITA, DIREITA, DIREITA]))
+    assert env.celulas.tolist() == [env.largura + x for x in (2, 3, 4)]
+
+    # Troca frontal (0 <-> 1) e célula ocupada por quem fica parado (2)
+    _colocar(env, [1, 2, 4], [6, 6, 6])
+    recompensas, _saiu = env.passo(np.array([DIREITA, ESQUERDA, PARADO]))
+    assert env.celulas.tolist() == [env.largura + x for x in (1, 2, 4)]
+    assert recompensas[:2].tolist() == [env.recompensa_colisao] * 2
+
+    # Ocupação coerente com as posições
+    assert (env.ocupacao[env.celulas] == np.arange(3)).all()
+    assert (env.ocupacao >= 0).sum() == 3
+
+
+def test_inicios_e_saidas_apenas_na_componente_ligada():
+    # (5, 3) é uma célula livre isolada do resto do labirinto
+    grelha = [linha[:] for linha in CORREDOR] + [[1, 1, 1, 1, 1, 0, 1, 1], [1] * 8]
+    grelha[2] = [1] * 8
+    grelha[3] = [1, 1, 1, 1, 1, 0, 1, 1]
+    grelha = grelha[:5]
+    env = LabirintoEnvironmentMulti(5, seed=1, mapa=MapaLabirinto(grelha=grelha))
+    isolada = 3 * env.largura + 5
+    for _ in range(30):
+        env.reset()
+        assert isolada not in env.celulas.tolist()
+        assert isolada not in env.saidas.tolist()
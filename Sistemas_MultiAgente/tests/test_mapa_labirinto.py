@@ -0,0 +1,26 @@
+import pytest
+
+from Envs.mapa_labirinto import MapaLabirinto
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_gerar_sem_celulas_isoladas(seed):
+    mapa = MapaLabirinto.gerar(41, 41, seed=seed, abertura=0.3)
+    assert mapa.celulas_ligadas(1, 1) == mapa.celulas_livres()
+
+
+def test_gerar_abertura_cria_ciclos():
+    fechado = MapaLabirinto.gerar(21, 21, seed=3, abertura=0.0)
+    aberto = MapaLabirinto.gerar(21, 21, seed=3, abertura=0.5)
+    # Uma árvore (DFS) tem exatamente livres - 1 ligações entre células vizinhas
+    def ligacoes(m):
+        return sum(
+            (not m.is_parede(x + 1, y)) + (not m.is_parede(x, y + 1)) for x, y in m.celulas_livres()
+        )
+    assert ligacoes(fechado) == len(fechado.celulas_livres()) - 1
+    assert ligacoes(aberto) > len(aberto.celulas_livres()) - 1
+
+
+def test_celulas_ligadas_origem_em_parede():
+    with pytest.raises(ValueError):
+        MapaLabirinto().celulas_ligadas(0, 0)
@@ -0,0 +1,11 @@
+from Metrics import EpisodioStats, MetricsLogger
+
+
+def test_sucesso_acima_de_127():
+    # O GA do labirinto regista o número de sucessos por geração (até POPULACAO=150)
+    logger = MetricsLogger()
+    logger.registar(EpisodioStats("Gen_Labirinto_Novelty", 1, 80, 2100.0, 0.0, 140))
+    logger.registar(EpisodioStats("Gen_Labirinto_Novelty", 2, 80, 2100.0, 0.0, 150))
+
+    assert logger.como_arrays()["sucesso"].tolist() == [140, 150]
+    assert [e.sucesso for e in logger.episodios()] == [140, 150]
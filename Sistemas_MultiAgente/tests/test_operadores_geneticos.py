@@ -0,0 +1,40 @@
+import random
+
+import numpy as np
+
+from Agents.genetic_agent import GeneticAgent
+from Agents.operadores_geneticos import reproduzir_geracao
+
+
+def _geracao(rng=None):
+    genomas = np.arange(60, dtype=np.float64).reshape(10, 6) / 10
+    fitness = np.arange(10, dtype=np.float64)
+    return reproduzir_geracao(genomas, fitness, elitismo=2, tipo_cruzamento="blend", rng=rng)
+
+
+def test_mesmo_gerador_mesma_geracao():
+    a = _geracao(np.random.default_rng(3))
+    b = _geracao(np.random.default_rng(3))
+    assert np.array_equal(a, b)
+
+
+def test_sem_rng_reprodutivel_com_random_seed():
+    random.seed(7)
+    a = _geracao()
+    random.seed(7)
+    b = _geracao()
+    assert np.array_equal(a, b)
+
+
+def test_mutar_reprodutivel():
+    genoma = [0.1] * 20
+    agentes = [GeneticAgent(1, list(genoma)) for _ in range(2)]
+    for agente in agentes:
+        agente.mutar(taxa=0.5, rng=np.random.default_rng(1))
+    assert agentes[0].genoma == agentes[1].genoma != genoma
+
+    random.seed(4)
+    agentes[0].mutar(taxa=0.5)
+    random.seed(4)
+    agentes[1].mutar(taxa=0.5)
+    assert agentes[0].genoma == agentes[1].genoma
@@ -0,0 +1,46 @@
+import random
+
+from Agents import QLearningFarolAgent
+from Core import Accao, ObservacaoFarol, Simulator
+from Envs import FarolEnvironment
+
+
+def _obs(dx, dy):
+    obs = ObservacaoFarol(N=10)
+    obs.dx, obs.dy = dx, dy
+    return obs
+
+
+def test_estado_e_chaves_sao_reutilizados():
+    agente = QLearningFarolAgent(1)
+    # Valores fora da cache de inteiros pequenos: objetos int distintos
+    a = agente.processar_estado(_obs(int("1000"), -3))
+    b = agente.processar_estado(_obs(int("1000"), -3))
+    assert a == (1000, -3) and a is b
+    assert agente._pares_estado(a) is agente._pares_estado((1000, -3))
+
+
+def test_desempate_e_atualizacao_iguais_a_regra_de_bellman():
+    agente = QLearningFarolAgent(1, alpha=0.5, gamma=0.9, epsilon=0.0)
+    s1, s2 = (2, 0), (1, 0)
+    agente.q = {(s1, Accao.CIMA): 1.0, (s1, Accao.DIREITA): 1.0, (s2, Accao.BAIXO): 4.0}
+
+    # Empate de Q: ganha a maior direção, como na ordenação (Q, direcao)
+    agente.observacao(_obs(*s1))
+    assert agente.age().direcao == max(Accao.CIMA, Accao.DIREITA)
+
+    agente.observacao(_obs(*s2))
+    agente.avaliacaoEstadoAtual(-1.0)
+    chave = (s1, agente._ultima_acao)
+    assert agente.q[chave] == 1.0 + 0.5 * (-1.0 + 0.9 * 4.0 - 1.0)
+
+
+def test_treino_semeado_reprodutivel():
+    tabelas = []
+    for _ in range(2):
+        random.seed(3)
+        env = FarolEnvironment(seed=3, inicio="aleatorio")
+        agente = QLearningFarolAgent(1)
+        Simulator(env, [agente], num_episodios=20, max_passos=100).executa()
+        tabelas.append(dict(agente.q))
+    assert tabelas[0] == tabelas[1] and len(tabelas[0]) > 0
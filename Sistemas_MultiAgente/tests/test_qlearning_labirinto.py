@@ -0,0 +1,22 @@
+from Agents import QLearningLabirintoAgent
+from Core import Simulator
+from Envs import LabirintoEnvironment
+
+
+def test_todos_objetivos_tamanho_e_tabela_durante_o_treino():
+    env = LabirintoEnvironment(seed=1)
+    m = env.map
+    agente = QLearningLabirintoAgent(1, objetivos=m.celulas_livres(), dimensoes=(m.largura, m.altura))
+    Simulator(env, [agente], num_episodios=5, max_passos=50).executa()
+
+    # Os valores vivem na Q densa: self.q só é sincronizado ao guardar/compilar
+    tabela = agente.tabela_q()
+    assert agente.tamanho_q() == len(tabela) > 0
+    assert all(valor != 0.0 for valor in tabela.values())
+
+
+def test_modo_normal_tamanho_e_o_do_dicionario():
+    env = LabirintoEnvironment(seed=1)
+    agente = QLearningLabirintoAgent(1)
+    Simulator(env, [agente], num_episodios=3, max_passos=30).executa()
+    assert agente.tamanho_q() == len(agente.q) == len(agente.tabela_q()) > 0
@@ -0,0 +1,61 @@
+from typing import Any, List
+
+from Core import Accao, Agent, Environment, Simulator
+
+
+class AgenteRoteiro(Agent):
+    """Agente que repete a mesma ação e guarda as recompensas recebidas."""
+
+    def __init__(self, agent_id: int) -> None:
+        super().__init__(agent_id)
+        self.recompensas: List[float] = []
+
+    def age(self) -> Accao:
+        return Accao.mover(Accao.DIREITA)
+
+    def avaliacao_estado_atual(self, recompensa: float) -> None:
+        self.recompensas.append(recompensa)
+
+
+class AmbienteSimultaneo(Environment):
+    """Movimento simultâneo: no 2.º passo todos os agentes chegam ao fim."""
+
+    def __init__(self) -> None:
+        super().__init__(nome="Simultaneo")
+        self.passo = 0
+
+    def reset(self) -> None:
+        self.passo = 0
+
+    def observacaoPara(self, agente: Any) -> int:
+        return self.passo
+
+    def agir(self, accao: Any, agente: Any):
+        raise AssertionError("O teste usa apenas o passo em lote.")
+
+    def observacoes_lote(self, agentes):
+        return [self.passo] * len(agentes)
+
+    def agir_lote(self, accoes, agentes):
+        self.passo += 1
+        fim = self.passo == 2
+        recompensa = 100.0 if fim else -1.0
+        return [recompensa] * len(agentes), [fim] * len(agentes), [{}] * len(agentes)
+
+    def suporta_lote(self) -> bool:
+        return True
+
+    def atualizacao(self) -> None:
+        pass
+
+
+def test_passo_em_lote_regista_todos_os_agentes_no_ultimo_passo():
+    agentes = [AgenteRoteiro(1), AgenteRoteiro(2), AgenteRoteiro(3)]
+    sim = Simulator(AmbienteSimultaneo(), agentes, num_episodios=1, max_passos=10)
+    (stats,) = sim.executa()
+
+    for agente in agentes:
+        assert agente.recompensas == [-1.0, 100.0]
+    assert stats.passos == 2
+    assert stats.sucesso == 1
+    assert stats.recompensa_total == 3 * (-1.0 + 100.0)